@@ -0,0 +1,52 @@
+"""Payload size and encode/decode time of Mesh objects with binary array encoding
+
+Usage::
+
+    python benchmarks/binary_arrays.py [vertex_count] [mesh_count]
+
+Encodes Mesh instances with :func:`speckle.base.resource.serialize_json`, with the arrays as
+JSON lists and as base64 float64 and float32 blocks, then decodes the bodies and parses them
+back to Mesh instances.
+"""
+
+import random
+import sys
+import time
+
+from speckle.base import arrays, json_codec
+from speckle.base.resource import serialize_json
+from speckle.schemas import Mesh
+
+
+def mesh(vertex_count):
+    return Mesh(
+        vertices=[random.uniform(-1000, 1000) for _ in range(vertex_count * 3)],
+        faces=[v for i in range(vertex_count - 2) for v in (0, i, i + 1, i + 2)],
+    )
+
+
+def main(vertex_count=20000, mesh_count=20):
+    meshes = [mesh(vertex_count) for _ in range(mesh_count)]
+    for m in meshes:
+        m.update_hashes()
+
+    print('{:<10} {:>10} {:>8} {:>12} {:>12}'.format('arrays', 'size (MB)', 'ratio', 'encode (ms)', 'decode (ms)'))
+    plain = None
+    for binary_arrays in (None, 'float64', 'float32'):
+        start = time.perf_counter()
+        bodies = [serialize_json(m, binary_arrays) for m in meshes]
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for body in bodies:
+            Mesh.parse_obj(arrays.decode_arrays(json_codec.loads(body)))
+        decode = time.perf_counter() - start
+
+        size = sum(len(b) for b in bodies)
+        plain = plain or size
+        print('{:<10} {:>10.1f} {:>8.2f} {:>12.1f} {:>12.1f}'.format(
+            binary_arrays or 'json', size / 1e6, size / plain, encode * 1e3, decode * 1e3))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,81 @@
+"""Write/read throughput and on-disk size of the cache for each installed blob codec
+
+Usage::
+
+    python benchmarks/blob_codec.py [object_count] [vertex_count]
+
+Stores Mesh and Brep payloads with :meth:`speckle.Cache.SpeckleCache.put_objects`, reads them
+back with :meth:`speckle.Cache.SpeckleCache.get_objects` and reports the database file size.
+"""
+
+import base64
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+from speckle.Cache import SpeckleCache
+from speckle.base import blob_codec, json_codec
+
+HOST = 'https://speckle.example/api/v1'
+
+
+def mesh_payload(vertex_count):
+    # Coordinates on a 1mm grid, as exported by most authoring tools
+    return {
+        '_id': uuid.uuid4().hex[:24],
+        'type': 'Mesh',
+        'vertices': [round(random.uniform(-100, 100), 3) for _ in range(vertex_count * 3)],
+        'faces': [v for i in range(vertex_count - 2) for v in (0, i, i + 1, i + 2)],
+        'properties': {'material': 'concrete', 'level': 3},
+    }
+
+
+def brep_payload(vertex_count):
+    brep = {
+        '_id': uuid.uuid4().hex[:24],
+        'type': 'Brep',
+        'displayValue': mesh_payload(vertex_count),
+        # Serialized native geometry, mostly doubles and some structure
+        'rawData': base64.b64encode(b''.join(
+            random.choice((b'\x00' * 8, os.urandom(8))) for _ in range(vertex_count * 4))).decode('ascii'),
+    }
+    del brep['displayValue']['_id']
+    return brep
+
+
+def main(object_count=200, vertex_count=2000):
+    directory = tempfile.mkdtemp()
+    SpeckleCache.log = lambda self, msg: None
+
+    payloads = {
+        'mesh': [mesh_payload(vertex_count) for _ in range(object_count)],
+        'brep': [brep_payload(vertex_count) for _ in range(object_count)],
+    }
+
+    print('{:<6} {:<6} {:>10} {:>14} {:>14} {:>10}'.format('codec', 'type', 'json (MB)', 'write (MB/s)', 'read (MB/s)', 'file (MB)'))
+    for codec in blob_codec.available_codecs():
+        for name, objects in payloads.items():
+            path = os.path.join(directory, '{}_{}.db'.format(codec, name))
+            cache = SpeckleCache(path, create=True, codec=codec)
+            ids = [o['_id'] for o in objects]
+            size = sum(len(json_codec.dumps(o)) for o in objects) / 1e6
+
+            start = time.perf_counter()
+            cache.put_objects(HOST, objects)
+            write = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cache.get_objects(HOST, ids)
+            read = time.perf_counter() - start
+
+            cache.try_connect().execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            cache.close()
+            print('{:<6} {:<6} {:>10.1f} {:>14.1f} {:>14.1f} {:>10.1f}'.format(
+                codec, name, size, size / write, size / read, os.path.getsize(path) / 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
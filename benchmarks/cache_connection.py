@@ -0,0 +1,61 @@
+"""Per-call latency of SpeckleCache with and without a persistent connection
+
+Usage::
+
+    python benchmarks/cache_connection.py [calls]
+
+Compares the pooled connection of :class:`speckle.Cache.SpeckleCache` with the previous
+behaviour of opening a new connection for every call, on account lookups and writes.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from speckle.Cache import SpeckleCache
+
+
+class ConnectPerCallCache(SpeckleCache):
+    """Opens (and leaks to the garbage collector) a new connection for every call"""
+
+    def try_connect(self):
+        return sqlite3.connect(self.db_uri, uri=True)
+
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(calls=2000):
+    directory = tempfile.mkdtemp()
+    SpeckleCache.log = lambda self, msg: None
+
+    print('{:<16} {:<16} {:>14}'.format('connection', 'operation', 'per call (us)'))
+    for name, cls in (('per call', ConnectPerCallCache), ('persistent', SpeckleCache)):
+        cache = cls(os.path.join(directory, name.replace(' ', '_') + '.db'))
+        cache.create_database()
+        cache.write_account('speckle.example/api/v1', 'example', 'user@example.com', 'JWT token')
+
+        def lookups():
+            for _ in range(calls):
+                cache.account_exists('speckle.example/api/v1', 'user@example.com')
+
+        def writes():
+            for i in range(calls // 10):
+                cache.write_account('speckle.example/api/v1', 'example', 'user{}@example.com'.format(i), 'JWT token')
+                cache.delete_account('speckle.example/api/v1', 'user{}@example.com'.format(i))
+
+        print('{:<16} {:<16} {:>14.1f}'.format(name, 'account_exists', best_of(lookups) / calls * 1e6))
+        print('{:<16} {:<16} {:>14.1f}'.format(name, 'write + delete', best_of(writes) / (calls // 10) * 1e6))
+        cache.close()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,100 @@
+"""Lookup latency of the cache tables before and after the index migration
+
+Usage::
+
+    python benchmarks/cache_indexes.py [row_count]
+
+Fills a database without secondary indexes with `row_count` sent and cached objects, times
+the lookups done by :class:`speckle.Cache.SpeckleCache`, then migrates the database to the
+current schema and times them again.
+"""
+
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from speckle.Cache import MIGRATIONS, SpeckleCache
+
+HOST = 'https://speckle.example/api/v1'
+
+
+def md5(value):
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+def fill(path, row_count):
+    conn = sqlite3.connect(path)
+    # Every table and column, but none of the indexes
+    for step in MIGRATIONS[0] + MIGRATIONS[1]:
+        step(conn) if callable(step) else conn.execute(step)
+    conn.execute('PRAGMA user_version=2')
+    with conn:
+        conn.executemany('INSERT INTO SentObject(RestApi,DatabaseId,Hash) VALUES(?,?,?)',
+                         ((HOST, 'id{}'.format(i), md5('sent{}'.format(i))) for i in range(row_count)))
+        conn.executemany('INSERT INTO CachedObject(CombinedHash,RestApi,DatabaseId,Hash,AddedOn,Bytes) VALUES(?,?,?,?,?,?)',
+                         ((md5('id{}{}'.format(i, HOST)), HOST, 'id{}'.format(i), md5('cached{}'.format(i)),
+                           random.randrange(10 ** 12), b'{}') for i in range(row_count)))
+    conn.close()
+
+
+def sent_lookup(conn, hashes):
+    conn.execute('SELECT Hash, DatabaseId FROM SentObject WHERE RestApi = ? AND Hash IN ({})'.format(
+        ','.join('?' * len(hashes))), [HOST] + hashes).fetchall()
+
+
+def eviction_candidates(conn, count):
+    rows = conn.execute('SELECT CombinedHash, length(Bytes) FROM CachedObject ORDER BY COALESCE(LastAccess, AddedOn)')
+    for _ in zip(range(count), rows):
+        pass
+    rows.close()
+
+
+def measure(conn, row_count):
+    hashes = [md5('sent{}'.format(random.randrange(row_count))) for _ in range(100)]
+    timings = {}
+
+    start = time.perf_counter()
+    for h in hashes[:10]:
+        sent_lookup(conn, [h])
+    timings['sent hash, 1 per query'] = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    sent_lookup(conn, hashes)
+    timings['sent hash, 100 per query'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    eviction_candidates(conn, 1000)
+    timings['1000 LRU candidates'] = time.perf_counter() - start
+    return timings
+
+
+def main(row_count=1000000):
+    path = os.path.join(tempfile.mkdtemp(), 'cache.db')
+    SpeckleCache.log = lambda self, msg: None
+
+    start = time.perf_counter()
+    fill(path, row_count)
+    print('filled {} rows per table in {:.1f}s'.format(row_count, time.perf_counter() - start))
+
+    conn = sqlite3.connect(path)
+    before = measure(conn, row_count)
+    conn.close()
+
+    cache = SpeckleCache(path)
+    start = time.perf_counter()
+    cache.try_connect()
+    print('migrated in {:.1f}s'.format(time.perf_counter() - start))
+    after = measure(cache.try_connect(), row_count)
+    cache.close()
+
+    print('{:<28} {:>14} {:>14}'.format('lookup', 'before (ms)', 'after (ms)'))
+    for name in before:
+        print('{:<28} {:>14.2f} {:>14.2f}'.format(name, before[name] * 1e3, after[name] * 1e3))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,69 @@
+"""Throughput of a cache file shared by several processes
+
+Usage::
+
+    python benchmarks/cache_processes.py [objects_per_process]
+
+Each process stores objects with :meth:`speckle.Cache.SpeckleCache.put_objects` in batches
+and reads every batch back, first on a single database file then with the objects sharded
+over one file per process.
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from speckle.Cache import SpeckleCache
+
+BATCH = 200
+
+
+def worker(path, shards, worker_id, count, start):
+    cache = SpeckleCache(path, shards=shards)
+    objects = [{'_id': '{}-{}'.format(worker_id, i), 'type': 'Mesh', 'vertices': [float(i)] * 300} for i in range(count)]
+    start.wait()
+    for i in range(0, count, BATCH):
+        batch = objects[i:i + BATCH]
+        cache.put_objects('https://speckle.example/api/v1', batch)
+        cache.get_objects('https://speckle.example/api/v1', [o['_id'] for o in batch])
+    cache.close()
+
+
+def run(processes, shards, count):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'cache.db')
+    SpeckleCache(path, create=True, shards=shards).close()
+
+    start = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=worker, args=(path, shards, w, count, start)) for w in range(processes)]
+    for w in workers:
+        w.start()
+    time.sleep(0.5)
+
+    began = time.perf_counter()
+    start.set()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - began
+
+    shutil.rmtree(directory)
+    return processes * count / elapsed
+
+
+def main(count=5000):
+    SpeckleCache.log = lambda self, msg: None
+
+    print('{:<10} {:<8} {:>16} {:>10}'.format('processes', 'shards', 'objects/s', 'speedup'))
+    for shards in (1, 8):
+        single = None
+        for processes in (1, 2, 4, 8):
+            throughput = run(processes, shards, count)
+            single = single or throughput
+            print('{:<10} {:<8} {:>16.0f} {:>10.1f}'.format(processes, shards, throughput, throughput / single))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
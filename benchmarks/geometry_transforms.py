@@ -0,0 +1,102 @@
+"""Objects per second of batch transforms against a per-object Python loop
+
+Usage::
+
+    python benchmarks/geometry_transforms.py [object_count]
+
+Moves and rotates a mixed collection of small Point, Vector, Line, Polyline, Plane, Arc and
+Mesh objects, then a collection of object_count / 100 meshes of 1000 vertices, with
+:func:`speckle.base.geometry.transform`, with a loop applying the same matrix to the values of
+each object, and scales them with :func:`speckle.base.geometry.scale`.
+
+The objects are walked one by one in both cases, so with small objects the two go about as
+fast, the batched transform only pulls ahead when objects hold many coordinates.
+"""
+
+import math
+import random
+import sys
+import time
+
+from speckle.base import geometry
+from speckle.schemas import Arc, Line, Mesh, Plane, Point, Polyline, Vector
+
+
+def xyz(count):
+    return [random.uniform(-100, 100) for _ in range(count * 3)]
+
+
+def plane():
+    return {'origin': {'value': xyz(1)}, 'normal': {'value': [0, 0, 1]}, 'xdir': {'value': [1, 0, 0]}, 'ydir': {'value': [0, 1, 0]}}
+
+
+FACTORIES = [
+    lambda: Point(value=xyz(1)),
+    lambda: Vector(value=xyz(1)),
+    lambda: Line(Value=xyz(2)),
+    lambda: Polyline(value=xyz(10)),
+    lambda: Plane.parse_obj(plane()),
+    lambda: Arc.parse_obj({'radius': 2, 'plane': plane()}),
+    lambda: Mesh(vertices=xyz(24), faces=[0, 1, 2, 3] * 6),
+]
+
+
+def apply(matrix, values, translate=True):
+    (a, b, c, tx), (d, e, f, ty), (g, h, i, tz) = matrix[:3]
+    if not translate:
+        tx = ty = tz = 0.0
+    result = []
+    for k in range(0, len(values), 3):
+        x, y, z = values[k:k + 3]
+        result.extend((a * x + b * y + c * z + tx, d * x + e * y + f * z + ty, g * x + h * y + i * z + tz))
+    return result
+
+
+def naive_transform(objects, matrix):
+    # What scripts did before: walk each object and rebuild its value lists
+    for obj in objects:
+        if isinstance(obj, (Point, Polyline)):
+            obj.value = apply(matrix, list(obj.value))
+        elif isinstance(obj, Vector):
+            obj.value = apply(matrix, obj.value, translate=False)
+        elif isinstance(obj, Line):
+            obj.Value = apply(matrix, obj.Value)
+        elif isinstance(obj, Mesh):
+            obj.vertices = apply(matrix, list(obj.vertices))
+        elif isinstance(obj, (Plane, Arc)):
+            p = obj if isinstance(obj, Plane) else obj.plane
+            p.origin.value = apply(matrix, p.origin.value)
+            for axis in (p.normal, p.xdir, p.ydir):
+                axis.value = apply(matrix, axis.value, translate=False)
+
+
+def main(object_count=100000):
+    angle = math.radians(30)
+    matrix = [
+        [math.cos(angle), -math.sin(angle), 0, 10],
+        [math.sin(angle), math.cos(angle), 0, 20],
+        [0, 0, 1, 30],
+        [0, 0, 0, 1],
+    ]
+    collections = [
+        ('mixed', lambda: [random.choice(FACTORIES)() for _ in range(object_count)]),
+        ('meshes', lambda: [Mesh(vertices=xyz(1000)) for _ in range(max(1, object_count // 100))]),
+    ]
+
+    print('{:<8} {:<12} {:>10} {:>14}'.format('objects', 'method', 'time (s)', 'objects/s'))
+    for collection, build in collections:
+        objects = build()
+        runs = [
+            ('naive loop', lambda: naive_transform(objects, matrix)),
+            ('transform', lambda: geometry.transform(objects, matrix)),
+            ('scale', lambda: geometry.scale(objects, 0.001)),
+        ]
+        for name, run in runs:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print('{:<8} {:<12} {:>10.3f} {:>14.0f}'.format(collection, name, elapsed, len(objects) / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
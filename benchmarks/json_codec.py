@@ -0,0 +1,74 @@
+"""Encode/decode throughput of each installed JSON backend
+
+Usage::
+
+    python benchmarks/json_codec.py [vertex_count] [object_count]
+
+Measures :func:`speckle.base.json_codec.dumps` and :func:`speckle.base.json_codec.loads` on a
+large Mesh payload and on a Stream payload holding many object placeholders and layers.
+"""
+
+import random
+import sys
+import time
+import uuid
+
+from speckle.base import json_codec
+
+
+def mesh_payload(vertex_count):
+    return {
+        '_id': uuid.uuid4().hex[:24],
+        'type': 'Mesh',
+        'name': 'SpeckleMesh',
+        'vertices': [random.uniform(-1000, 1000) for _ in range(vertex_count * 3)],
+        'faces': [v for i in range(vertex_count - 2) for v in (0, i, i + 1, i + 2)],
+        'properties': {'material': 'concrete', 'level': 3},
+    }
+
+
+def stream_payload(object_count):
+    return {
+        'streamId': 'HjenwS2s',
+        'name': 'benchmark stream',
+        'objects': [{'_id': uuid.uuid4().hex[:24], 'type': 'Placeholder'} for _ in range(object_count)],
+        'layers': [{
+            'guid': str(uuid.uuid4()),
+            'name': 'layer {}'.format(i),
+            'startIndex': i * 100,
+            'objectCount': 100,
+            'properties': {'color': {'a': 1, 'hex': '#ffffff'}, 'visible': True},
+        } for i in range(object_count // 100)],
+        'baseProperties': {'units': 'Meters', 'tolerance': 0.001},
+    }
+
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(vertex_count=500000, object_count=100000):
+    payloads = {
+        'mesh ({} vertices)'.format(vertex_count): mesh_payload(vertex_count),
+        'stream ({} objects)'.format(object_count): stream_payload(object_count),
+    }
+
+    print('{:<10} {:<28} {:>10} {:>14} {:>14}'.format('backend', 'payload', 'size (MB)', 'encode (MB/s)', 'decode (MB/s)'))
+    for backend in json_codec.available_backends():
+        json_codec.use_backend(backend)
+        for name, payload in payloads.items():
+            body = json_codec.dumps(payload)
+            size = len(body) / 1e6
+            encode = best_of(lambda: json_codec.dumps(payload))
+            decode = best_of(lambda: json_codec.loads(body))
+            print('{:<10} {:<28} {:>10.1f} {:>14.1f} {:>14.1f}'.format(backend, name, size, size / encode, size / decode))
+    json_codec.use_backend()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,70 @@
+"""Parse time and memory of Mesh payloads with list and array fields
+
+Usage::
+
+    python benchmarks/schema_arrays.py [vertex_count] [mesh_count]
+
+Decodes and parses Mesh payloads with validation (`parse_obj`) and without (`construct`),
+once with the coordinate and index fields typed as lists of numbers, as they were before
+:mod:`speckle.base.arrays`, and once with the array types. Memory is the size of the parsed
+meshes once the decoded payloads are released, as reported by :mod:`tracemalloc`.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
+
+from speckle.base import json_codec
+from speckle.base.resource import construct
+from speckle.resources.objects import SpeckleObject
+from speckle.schemas import Mesh
+
+
+class ListMesh(SpeckleObject):
+    type: str = 'Mesh'
+    name: Optional[str] = 'SpeckleMesh'
+    vertices: List[float] = []
+    faces: List[int] = []
+    texture_coordinates: Optional[List[float]]
+    colors: Optional[List[int]]
+
+
+def mesh_payload(vertex_count):
+    return {
+        'type': 'Mesh',
+        'vertices': [random.uniform(-1000, 1000) for _ in range(vertex_count * 3)],
+        'faces': [v for i in range(vertex_count - 2) for v in (0, i, i + 1, i + 2)],
+    }
+
+
+def measure(parse, schema, bodies):
+    start = time.perf_counter()
+    meshes = [parse(schema, json_codec.loads(b)) for b in bodies]
+    elapsed = time.perf_counter() - start
+    del meshes
+
+    tracemalloc.start()
+    meshes = [parse(schema, json_codec.loads(b)) for b in bodies]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, size
+
+
+def main(vertex_count=20000, mesh_count=20):
+    bodies = [json_codec.dumps(mesh_payload(vertex_count)) for _ in range(mesh_count)]
+    parsers = {
+        'parse_obj': lambda schema, p: schema.parse_obj(p),
+        'construct': construct,
+    }
+
+    print('{:<10} {:<8} {:>10} {:>12}'.format('parser', 'fields', 'time (ms)', 'memory (MB)'))
+    for name, parse in parsers.items():
+        for fields, schema in (('list', ListMesh), ('array', Mesh)):
+            elapsed, size = measure(parse, schema, bodies)
+            print('{:<10} {:<8} {:>10.1f} {:>12.1f}'.format(name, fields, elapsed * 1e3, size / 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,54 @@
+"""Time to convert the units of a stream of meshes
+
+Usage::
+
+    python benchmarks/stream_units.py [vertex_count] [mesh_count] [repeat]
+
+Converts a stream from meters to millimeters with a per-object Python loop, as consumers did
+before, and with :meth:`speckle.resources.streams.Stream.convert_units`, once with the meshes
+parsed as plain SpeckleObjects holding lists and once as Mesh instances holding arrays. The
+best time of `repeat` runs on fresh streams is reported.
+"""
+
+import random
+import sys
+import time
+
+from speckle.resources.streams import Stream
+from speckle.schemas import Mesh
+
+
+def stream(vertex_count, mesh_count, typed):
+    objects = []
+    for _ in range(mesh_count):
+        mesh = {'type': 'Mesh', 'vertices': [random.uniform(-1000, 1000) for _ in range(vertex_count // mesh_count * 3)]}
+        objects.append(Mesh.parse_obj(mesh) if typed else mesh)
+    return Stream.parse_obj({'baseProperties': {'units': 'Meters', 'tolerance': 0.001}, 'objects': objects})
+
+
+def naive_convert(stream, factor):
+    for obj in stream.objects:
+        obj.vertices = [v * factor for v in obj.vertices]
+    stream.baseProperties.units = 'Millimeters'
+    stream.baseProperties.tolerance *= factor
+
+
+def main(vertex_count=1000000, mesh_count=100, repeat=5):
+    runs = [
+        ('naive loop', False, lambda s: naive_convert(s, 1000)),
+        ('lists', False, lambda s: s.convert_units('Millimeters')),
+        ('arrays', True, lambda s: s.convert_units('Millimeters')),
+    ]
+    print('{:<12} {:>10}'.format('method', 'time (ms)'))
+    for name, typed, run in runs:
+        elapsed = []
+        for _ in range(repeat):
+            s = stream(vertex_count, mesh_count, typed)
+            start = time.perf_counter()
+            run(s)
+            elapsed.append(time.perf_counter() - start)
+        print('{:<12} {:>10.1f}'.format(name, min(elapsed) * 1e3))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
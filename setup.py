@@ -20,6 +20,9 @@ setuptools.setup(
     url="https://github.com/specklworks/pyspeckle",
     packages=setuptools.find_packages(exclude=["tests"]),
     install_requires=required,
+    extras_require={
+        'async': ['aiohttp'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3.6",
         "Operating System :: OS Independent"
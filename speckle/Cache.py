@@ -1,8 +1,18 @@
 import sqlite3, contextlib
+import array
+import calendar
 from urllib.request import pathname2url
+from speckle.base import blob_codec, json_codec
 
 import os
+import math
+import time
+import random
+import hashlib
 import pathlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
 
 """Speckle Cache documentation
 
@@ -23,15 +33,257 @@ Example:
         host = "foo.bar.com"
         res = cache.account_exists(host, email)
 
+Concurrency:
+    A cache file can be shared by several threads and processes, eg: the workers of a web
+    server. Each thread (and each process after a fork) gets its own connection in WAL mode,
+    so readers never block each other nor the writer. Writes are split into short
+    transactions which take the write lock up front and are retried with a random backoff
+    while another connection holds it. Reads do not take the write lock: the last access of
+    cached objects is recorded in memory and written along with the next write.
+
+    Cached objects can be spread over several files so that concurrent writers do not all
+    wait on the same lock::
+
+        cache = SpeckleCache(shards=8)
+
 
 """
+
+# SQLite's default limit on the number of variables in a statement
+MAX_VARIABLES = 999
+
+# Write transactions refused because the database is locked are retried with an
+# exponential backoff, starting at RETRY_DELAY seconds
+RETRIES = 8
+RETRY_DELAY = 0.01
+
+# Rows written per transaction, so other connections get the lock in between
+WRITE_BATCH = 500
+
+# Pending last accesses of cached objects which trigger a write
+ACCESS_FLUSH = 10000
+
+# Applied to every connection, see https://www.sqlite.org/pragma.html
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-8000',
+    'PRAGMA temp_store=MEMORY',
+)
+
+
+class BloomFilter():
+    """Probabilistic set membership
+
+    A compact in-memory filter answering "maybe present" or "certainly absent". It uses
+    about 10 bits per key for a 1% false positive rate, so millions of hashes fit in a few
+    megabytes.
+
+    Arguments:
+        capacity {int} -- Number of keys the filter is sized for
+
+    Keyword Arguments:
+        error_rate {float} -- False positive rate once `capacity` keys are added (default: {0.01})
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.size = int(math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / self.capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.md5(key.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    @property
+    def full(self):
+        return self.count > self.capacity
+
+
+def timestamp(value):
+    """Convert an ISO 8601 date, as sent by the server, to milliseconds since the epoch
+
+    Arguments:
+        value {str} -- The date, eg: '2019-06-20T09:41:14.712Z'
+
+    Returns:
+        int -- The timestamp, None if value is not a valid date
+    """
+    # strptime rather than fromisoformat, which needs Python 3.7
+    for date_format in ('%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ'):
+        try:
+            date = datetime.strptime(value, date_format)
+        except (TypeError, ValueError):
+            continue
+        return calendar.timegm(date.timetuple()) * 1000 + date.microsecond // 1000
+    return None
+
+
+def estimate_size(value):
+    """Rough memory footprint of a parsed object, in bytes
+
+    Dominated by coordinate and index arrays: a list element costs a pointer and a boxed
+    number. Arrays exposing `nbytes` (eg: numpy) and :class:`array.array` are counted as is.
+
+    Arguments:
+        value {object} -- A schema instance, or any value it holds
+
+    Returns:
+        int -- The estimated size
+    """
+    if hasattr(value, 'nbytes'):
+        return 100 + value.nbytes
+    if isinstance(value, array.array):
+        return 64 + value.itemsize * len(value)
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (int, float)):
+            return 56 + 32 * len(value)
+        return 56 + sum(8 + estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return 232 + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, str):
+        return 49 + len(value)
+    if hasattr(value, '__dict__'):
+        return 100 + estimate_size(value.__dict__)
+    return 32
+
+
+class MemoryCache():
+    """Least recently used cache of parsed objects, bounded by their estimated size
+
+    Objects are returned as is, not copied: they should be treated as read-only.
+
+    Arguments:
+        max_bytes {int} -- Size budget, see :func:`estimate_size`
+
+    Attributes:
+        hits {int} -- Number of lookups served
+        misses {int} -- Number of lookups not found
+        evictions {int} -- Number of objects dropped to stay within budget
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, size=None):
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > self.max_bytes:
+                return
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is not None:
+                self.size -= item[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+
+def _is_busy(error):
+    message = str(error)
+    return 'locked' in message or 'busy' in message
+
+
+def _retry(fn):
+    """Call fn, retrying with a random exponential backoff while the database is locked"""
+    delay = RETRY_DELAY
+    for attempt in range(RETRIES + 1):
+        try:
+            return fn()
+        except sqlite3.OperationalError as e:
+            if attempt == RETRIES or not _is_busy(e):
+                raise
+            time.sleep(random.uniform(0.5, 1.5) * delay)
+            delay *= 2
+
+
+def _add_last_access(conn):
+    # Databases created by the first version of `put_objects` already have it
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(CachedObject)')]
+    if 'LastAccess' not in columns:
+        conn.execute('ALTER TABLE CachedObject ADD COLUMN LastAccess bigint')
+
+
+# Schema changes, in order. Databases store the number of migrations applied in their
+# user_version, a step is either a SQL statement or a function called with the connection.
+MIGRATIONS = (
+    # 1: Tables of the original layout, shared with the .NET clients
+    ('''CREATE TABLE IF NOT EXISTS Account
+        ([AccountId] integer NOT NULL PRIMARY KEY AUTOINCREMENT,[ServerName] varchar, [RestApi] varchar, [Email] varchar, [Token] varchar, [IsDefault] integer,
+        UNIQUE(RestApi,Email))''',
+     '''CREATE TABLE IF NOT EXISTS CachedObject
+        ([CombinedHash] varchar NOT NULL PRIMARY KEY,[RestApi] varchar, [DatabaseId] varchar, [Hash] varchar, [AddedOn] bigint, [Bytes] blob)''',
+     '''CREATE TABLE IF NOT EXISTS CachedStream
+        ([CombinedHash] varchar NOT NULL PRIMARY KEY,[RestApi] varchar, [StreamId] varchar, [AddedOn] bigint, [UpdatedOn] bigint, [Bytes] blob)''',
+     '''CREATE TABLE IF NOT EXISTS SentObject
+        ([RestApi] varchar, [DatabaseId] varchar, [Hash] varchar)'''),
+    # 2: Last access of cached objects, for LRU eviction
+    (_add_last_access,),
+    # 3: Indexes of the hash and eviction lookups (Account lookups use its UNIQUE constraint)
+    ('CREATE INDEX IF NOT EXISTS SentObjectHash ON SentObject(RestApi, Hash)',
+     'CREATE INDEX IF NOT EXISTS CachedObjectAccess ON CachedObject(COALESCE(LastAccess, AddedOn))'),
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
 class SpeckleCache():
     """Class for speckle cache.
 
     """
     initialized = False
 
-    def __init__(self, filepath=None, create=False):
+    def __init__(self, filepath=None, create=False, timeout=5.0, max_bytes=None, memory_bytes=None, codec=None, shards=1):
         """Initialize cache object
 
         This creates a SpeckleCache object using either the default database 
@@ -39,8 +291,16 @@ class SpeckleCache():
         specified database file.
 
 
+        Connections are opened lazily, one per thread, and kept open until :meth:`close`.
+
         Keyword Arguments:
             filepath {str} -- Optional database filepath (default: {None})
+            create {bool} -- Create the database tables (default: {False})
+            timeout {float} -- Seconds to wait for a lock held by another connection (default: {5.0})
+            max_bytes {int} -- Size budget of the cached objects, None for no limit (default: {None})
+            memory_bytes {int} -- Size budget of the in-memory tier of parsed objects, None to disable it (default: {None})
+            codec {str} -- Compression of the stored payloads, see :mod:`speckle.base.blob_codec` (default: {None})
+            shards {int} -- Number of files the cached objects are spread over, next to filepath (default: {1})
         """
         if filepath is None:
 
@@ -62,9 +322,39 @@ class SpeckleCache():
         self.log(self.db_path)
 
         self.db_uri = 'file:{}?mode=rw'.format(pathname2url(self.db_path))
+        self.timeout = timeout
+
+        self._local = threading.local()
+        # (thread, connection) of every thread which connected
+        self._connections = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        # Membership filters of the SentObject hashes, per RestApi
+        self._sent_filters = {}
+
+        # Estimated size of the CachedObject blobs, computed on first eviction check
+        self.max_bytes = max_bytes
+        self._cached_bytes = None
+
+        # CachedObject keys read since the last write, with the time they were read
+        self._accessed = {}
+
+        # Caches holding the CachedObject rows when they are sharded, see `_object_stores`
+        self.shards = shards
+        self._shards = None
+
+        # Whether the database schema was checked by this instance, see `migrate`
+        self._migrated = False
+
+        # Codec of the written blobs, rows written with any codec are readable
+        self.codec = codec
+
+        # Parsed objects, consulted before the database, see `MemoryCache`
+        self.memory = MemoryCache(memory_bytes) if memory_bytes else None
 
         if create:
-            self.create_database(db_path)
+            self.create_database()
 
         #if self.try_connect():
         #    self.initialized = True
@@ -79,53 +369,147 @@ class SpeckleCache():
         """            
         print('SpeckleCache: {}'.format(msg))   
 
-    def create_database(self):
-        """Create a database
+    def _connect(self, uri):
+        conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, cached_statements=256, check_same_thread=False)
+        try:
+            # Switching to WAL needs a lock, even when another process already did it
+            _retry(lambda: [conn.execute(pragma) for pragma in PRAGMAS])
+        except:
+            conn.close()
+            raise
+        conn.execute('PRAGMA busy_timeout={}'.format(int(self.timeout * 1000)))
 
-        Creates a .db database at the location specified by self.db_path.
-        
-        """        
+        self._local.conn = conn
+        current = threading.current_thread()
+        with self._lock:
+            # Close the connections of the threads which finished, eg: the workers of a batch
+            finished = [c for thread, c in self._connections if not thread.is_alive()]
+            self._connections = [(thread, c) for thread, c in self._connections if thread.is_alive()]
+            self._connections.append((current, conn))
+        for c in finished:
+            c.close()
+        if not self._migrated:
+            self.migrate(conn)
+        return conn
+
+    def migrate(self, conn=None):
+        """Bring the database schema up to date
+
+        Applies the MIGRATIONS the database has not seen yet, as recorded by its user_version.
+        This runs automatically on the first connection of each SpeckleCache instance. Every
+        step is applied in its own transaction, holding the write lock so that concurrent
+        processes do not apply it twice.
+
+        Keyword Arguments:
+            conn {Connection} -- The connection to use, defaults to this thread's (default: {None})
+
+        Returns:
+            int -- The schema version of the database
+        """
+        conn = conn or self.try_connect()
+        version = _retry(lambda: conn.execute('PRAGMA user_version').fetchone()[0])
+        while version < SCHEMA_VERSION:
+            version = self._transaction(conn, self._migrate_step)
+            self.log("Migrated database to version {}.".format(version))
+        self._migrated = True
+        return version
+
+    @staticmethod
+    def _migrate_step(conn):
+        # Another process may have migrated since the version was read
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < SCHEMA_VERSION:
+            for step in MIGRATIONS[version]:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            version += 1
+            conn.execute('PRAGMA user_version={}'.format(version))
+        return version
+
+    def _local_connection(self):
+        if self._pid != os.getpid():
+            # Connections must not be used across a fork, leave the parent's ones alone
+            self._local = threading.local()
+            self._connections = []
+            self._pid = os.getpid()
+        return getattr(self._local, 'conn', None)
+
+    def _transaction(self, conn, fn):
+        """Run fn(conn) in a write transaction, retrying while the database is locked
+
+        Returns:
+            object -- The result of fn
+        """
+        _retry(lambda: conn.execute('BEGIN IMMEDIATE'))
         try:
-            conn = sqlite3.connect(self.db_path)
+            result = fn(conn)
+            conn.commit()
+            return result
         except:
-            self.log("Could not create database.")
-            return None
+            conn.rollback()
+            raise
 
-        self.log("Creating database...")
+    def close(self):
+        """Close the database connections of every thread"""
+        if self._accessed:
+            self._flush_accessed()
+        for shard in self._shards or ():
+            shard.close()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            conn.close()
+        self._local = threading.local()
 
-        with conn:
-            c = conn.cursor()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def create_database(self):
+        """Create a database
+
+        Creates a .db database at the location specified by self.db_path, or
+        updates the schema of an existing one, see :meth:`migrate`.
+
+        Returns:
+            Connection -- Connection to database or None
+        
+        """        
+        conn = self._local_connection()
+        if conn is None:
             try:
-                c.execute('''CREATE TABLE Account
-                             ([AccountId] integer NOT NULL PRIMARY KEY AUTOINCREMENT,[ServerName] varchar, [RestApi] varchar, [Email] varchar, [Token] varchar, [IsDefault] integer,
-                             UNIQUE(RestApi,Email))''')
-                c.execute('''CREATE TABLE CachedObject
-                             ([CombinedHash] varchar NOT NULL PRIMARY KEY,[RestApi] varchar, [DatabaseId] varchar, [Hash] varchar, [AddedOn] bigint, [Bytes] blob)''')
-                c.execute('''CREATE TABLE CachedStream
-                             ([CombinedHash] varchar NOT NULL PRIMARY KEY,[RestApi] varchar, [StreamId] varchar, [AddedOn] bigint, [UpdatedOn] bigint, [Bytes] blob)''')
-                c.execute('''CREATE TABLE SentObject
-                             ([RestApi] varchar, [DatabaseId] varchar, [Hash] varchar)''')
-                conn.commit()
-                self.log("Created database.")
-                return conn          
-            except sqlite3.OperationalError:
-                self.log("Tables already exist.")
+                conn = self._connect('file:{}?mode=rwc'.format(pathname2url(self.db_path)))
+            except sqlite3.Error:
+                self.log("Could not create database.")
                 return None
+        else:
+            self.migrate(conn)
+
+        return conn
 
     def try_connect(self):
         """Tries to connect to the database
 
         Attempts to connect with the database specified by self.db_path.
-        Returns either a connection to the database or None.
+        Returns either a connection to the database or None. The connection is
+        opened once per thread and reused by later calls, it must not be closed.
 
         Returns:
             Connection -- Connection to database or None          
         
         """    
-        try:
-            conn = sqlite3.connect(self.db_uri, uri=True)
+        conn = self._local_connection()
+        if conn is not None:
             return conn
-        except sqlite3.OperationalError:
+        try:
+            return self._connect(self.db_uri)
+        except sqlite3.OperationalError as e:
+            if _is_busy(e):
+                raise
             self.log("Database does not exist.")            
             return None
 
@@ -220,6 +604,7 @@ class SpeckleCache():
         """Deletes all objects from table in database
 
         Deletes all objects from specified table in the database specified by self.db_path.
+        Clearing CachedObject also clears the shards and the memory tier.
         
         Keyword Arguments:
             table {str} -- Table in database to delete all entries from {default: {"CachedObject"}}
@@ -237,6 +622,17 @@ class SpeckleCache():
             except sqlite3.IntegrityError as e:
                 self.log("Failed to clear table{}.".format(table))
 
+        if table == "CachedObject":
+            # Objects are also held by the shards and the memory tier
+            for store in self._object_stores():
+                if store is not self:
+                    store.delete_all(table)
+            if self.memory is not None:
+                self.memory.clear()
+            with self._lock:
+                self._accessed.clear()
+            self._cached_bytes = None
+
     def get_all_accounts(self):
         """Get all accounts in database
 
@@ -290,3 +686,363 @@ class SpeckleCache():
 
             except sqlite3.IntegrityError as e:
                 raise
+
+    def sent_filter(self, host):
+        """Get the membership filter of the objects sent to a server
+
+        The filter is loaded from the SentObject table on first use and kept up to date by
+        :meth:`write_sent_objects`. It is rebuilt once it holds more hashes than it was sized for.
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+
+        Returns:
+            BloomFilter -- The filter of sent object hashes, None if the database is not available
+        """
+        sent = self._sent_filters.get(host)
+        if sent is not None and not sent.full:
+            return sent
+
+        conn = self.try_connect()
+        if conn == None:
+            self.log("Failed to access database.")
+            return None
+
+        with conn:
+            c = conn.cursor()
+            c.execute(""" SELECT COUNT(*) FROM SentObject WHERE RestApi = ?""", (host,))
+            count = c.fetchone()[0]
+            sent = BloomFilter(max(2 * count, 100000))
+            for (object_hash,) in c.execute(""" SELECT Hash FROM SentObject WHERE RestApi = ?""", (host,)):
+                sent.add(object_hash)
+
+        self._sent_filters[host] = sent
+        return sent
+
+    def get_sent_objects(self, host, hashes):
+        """Get the ids of the objects already sent to a server
+
+        Hashes rejected by the membership filter are not looked up in the database.
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            hashes {list} -- Content hashes of the objects
+
+        Returns:
+            dict -- The DatabaseId of each hash found in the SentObject table
+        """
+        sent = self.sent_filter(host)
+        if sent is None:
+            return {}
+
+        candidates = [h for h in hashes if h in sent]
+        if not candidates:
+            return {}
+
+        conn = self.try_connect()
+        if conn == None:
+            self.log("Failed to access database.")
+            return {}
+
+        found = {}
+        with conn:
+            c = conn.cursor()
+            step = MAX_VARIABLES - 1
+            for i in range(0, len(candidates), step):
+                chunk = candidates[i:i + step]
+                c.execute(""" SELECT Hash, DatabaseId FROM SentObject WHERE RestApi = ? AND Hash IN ({})""".format(
+                    ','.join('?' * len(chunk))), [host] + chunk)
+                found.update(c.fetchall())
+        return found
+
+    def write_sent_objects(self, host, objects):
+        """Record objects sent to a server
+
+        A failure to write is logged but not raised, the objects are already on the server.
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            objects {list} -- (Hash, DatabaseId) tuples
+        """
+        objects = list(objects)
+        if not objects:
+            return
+
+        conn = self.try_connect()
+        if conn == None:
+            self.log("Failed to access database.")
+            return
+
+        try:
+            for i in range(0, len(objects), WRITE_BATCH):
+                rows = [(host, h, id) for h, id in objects[i:i + WRITE_BATCH]]
+                self._transaction(conn, lambda c: c.executemany(
+                    """ INSERT INTO SentObject(RestApi,Hash,DatabaseId) VALUES(?,?,?)""", rows))
+        except sqlite3.DatabaseError as e:
+            self.log("Failed to record sent objects: {}".format(e))
+            return
+
+        sent = self._sent_filters.get(host)
+        if sent is not None:
+            for h, _ in objects:
+                sent.add(h)
+
+    @staticmethod
+    def combined_hash(host, id):
+        """Key of an object in the CachedObject table
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            id {str} -- The object's DatabaseId
+
+        Returns:
+            str -- The CombinedHash of the object
+        """
+        return hashlib.md5((id + host).encode('utf-8')).hexdigest()
+
+    def _object_stores(self):
+        """The caches holding the CachedObject rows: this one, or one per shard"""
+        if self.shards <= 1:
+            return [self]
+        with self._lock:
+            if self._shards is None:
+                root, ext = os.path.splitext(self.db_path)
+                self._shards = [SpeckleCache('{}.{}{}'.format(root, i, ext), create=True, timeout=self.timeout)
+                                for i in range(self.shards)]
+        return self._shards
+
+    def _by_store(self, keys):
+        """Group CachedObject keys by the cache holding them"""
+        stores = self._object_stores()
+        if len(stores) == 1:
+            return [(self, list(keys))]
+        groups = {}
+        for key in keys:
+            groups.setdefault(int(key[:4], 16) % len(stores), []).append(key)
+        return [(stores[i], group) for i, group in groups.items()]
+
+    def put_objects(self, host, objects):
+        """Store objects in the cache
+
+        Objects already cached are replaced. When the cache has a `max_bytes` budget, the least
+        recently used objects are evicted to make room, see :meth:`evict`.
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            objects {list} -- Decoded objects, each with an `_id`
+        """
+        now = int(time.time() * 1000)
+        rows = {}
+        for o in objects:
+            blob = blob_codec.compress(json_codec.dumps(o), self.codec)
+            key = self.combined_hash(host, o['_id'])
+            rows[key] = (key, host, o['_id'], o.get('hash'), now, blob, now)
+        if not rows:
+            return
+
+        stores = self._by_store(rows)
+        budget = None if self.max_bytes is None else self.max_bytes // len(self._object_stores())
+        for store, keys in stores:
+            store._put_object_rows([rows[k] for k in keys], budget)
+
+        if self.memory is not None:
+            for r in rows.values():
+                self.memory.pop((host, r[2]))
+
+    def _put_object_rows(self, rows, max_bytes):
+        conn = self.try_connect()
+        if conn == None:
+            raise Exception("Failed to connect to database.")
+
+        for i in range(0, len(rows), WRITE_BATCH):
+            chunk = rows[i:i + WRITE_BATCH]
+            self._transaction(conn, lambda c: c.executemany(
+                """ INSERT OR REPLACE INTO CachedObject(CombinedHash,RestApi,DatabaseId,Hash,AddedOn,Bytes,LastAccess)
+                VALUES(?,?,?,?,?,?,?) """, chunk))
+
+        if self._cached_bytes is not None:
+            self._cached_bytes += sum(len(r[5]) for r in rows)
+        if max_bytes is not None:
+            self.evict(max_bytes)
+
+    def get_objects(self, host, ids):
+        """Get cached objects
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            ids {list} -- DatabaseIds of the objects
+
+        Returns:
+            dict -- The decoded objects found in the cache, keyed by id
+        """
+        found = {}
+        for store, keys in self._by_store([self.combined_hash(host, i) for i in ids]):
+            for id, blob in store._get_object_rows(keys):
+                found[id] = json_codec.loads(blob_codec.decompress(blob))
+        return found
+
+    def _get_object_rows(self, keys):
+        conn = self.try_connect()
+        if conn == None:
+            self.log("Failed to access database.")
+            return []
+
+        now = int(time.time() * 1000)
+        rows = []
+        for i in range(0, len(keys), MAX_VARIABLES):
+            chunk = keys[i:i + MAX_VARIABLES]
+            rows += conn.execute(""" SELECT CombinedHash, DatabaseId, Bytes FROM CachedObject WHERE CombinedHash IN ({})""".format(
+                ','.join('?' * len(chunk))), chunk).fetchall()
+
+        with self._lock:
+            self._accessed.update((key, now) for key, _, _ in rows)
+            flush = len(self._accessed) >= ACCESS_FLUSH
+        if flush:
+            self._flush_accessed()
+        return [(id, blob) for _, id, blob in rows]
+
+    def _flush_accessed(self):
+        """Write the last access of the objects read since the last write"""
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if not accessed:
+            return
+
+        conn = self.try_connect()
+        if conn == None:
+            return
+
+        rows = [(t, key) for key, t in accessed.items()]
+        for i in range(0, len(rows), WRITE_BATCH):
+            chunk = rows[i:i + WRITE_BATCH]
+            self._transaction(conn, lambda c: c.executemany(
+                """ UPDATE CachedObject SET LastAccess = MAX(COALESCE(LastAccess, 0), ?) WHERE CombinedHash = ?""", chunk))
+
+    def delete_objects(self, host, ids):
+        """Remove objects from the cache
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            ids {list} -- DatabaseIds of the objects
+        """
+        for store, keys in self._by_store([self.combined_hash(host, i) for i in ids]):
+            store._delete_object_rows(keys)
+
+        if self.memory is not None:
+            for i in ids:
+                self.memory.pop((host, i))
+
+    def _delete_object_rows(self, keys):
+        conn = self.try_connect()
+        if conn == None:
+            raise Exception("Failed to connect to database.")
+
+        for i in range(0, len(keys), MAX_VARIABLES):
+            chunk = keys[i:i + MAX_VARIABLES]
+            self._transaction(conn, lambda c: c.execute(
+                """ DELETE FROM CachedObject WHERE CombinedHash IN ({})""".format(','.join('?' * len(chunk))), chunk))
+        with self._lock:
+            for key in keys:
+                self._accessed.pop(key, None)
+        self._cached_bytes = None
+
+    def evict(self, max_bytes=None):
+        """Evict the least recently used objects until the cache fits its budget
+
+        Objects are ordered by their last access, or by when they were added if they were
+        never read. With shards, each shard gets an equal part of the budget.
+
+        Keyword Arguments:
+            max_bytes {int} -- Size budget, defaults to self.max_bytes (default: {None})
+
+        Returns:
+            int -- The number of evicted objects
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return 0
+
+        stores = self._object_stores()
+        if len(stores) > 1:
+            return sum(store.evict(max_bytes // len(stores)) for store in stores)
+
+        conn = self.try_connect()
+        if conn == None:
+            self.log("Failed to access database.")
+            return 0
+
+        if self._cached_bytes is not None and self._cached_bytes <= max_bytes:
+            return 0
+
+        # The estimate is over budget, other connections may have evicted in between
+        self._flush_accessed()
+        total = conn.execute('SELECT COALESCE(SUM(length(Bytes)), 0) FROM CachedObject').fetchone()[0]
+        evicted = []
+        if total > max_bytes:
+            rows = conn.execute(""" SELECT CombinedHash, length(Bytes) FROM CachedObject
+                                ORDER BY COALESCE(LastAccess, AddedOn)""")
+            for key, size in rows:
+                if total <= max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size or 0
+            rows.close()
+            for i in range(0, len(evicted), WRITE_BATCH):
+                chunk = evicted[i:i + WRITE_BATCH]
+                self._transaction(conn, lambda c: c.executemany('DELETE FROM CachedObject WHERE CombinedHash = ?', chunk))
+
+        self._cached_bytes = total
+        return len(evicted)
+
+    def put_stream(self, host, stream):
+        """Store a stream snapshot in the cache
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            stream {dict} -- The decoded stream, with its `streamId` and `updatedAt`
+        """
+        conn = self.try_connect()
+        if conn == None:
+            raise Exception("Failed to connect to database.")
+
+        stream_id = stream['streamId']
+        blob = blob_codec.compress(json_codec.dumps(stream), self.codec)
+        row = (self.combined_hash(host, stream_id), host, stream_id, int(time.time() * 1000), timestamp(stream.get('updatedAt')), blob)
+        self._transaction(conn, lambda c: c.execute(
+            """ INSERT OR REPLACE INTO CachedStream(CombinedHash,RestApi,StreamId,AddedOn,UpdatedOn,Bytes)
+            VALUES(?,?,?,?,?,?) """, row))
+
+    def get_stream(self, host, stream_id):
+        """Get a cached stream snapshot
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            stream_id {str} -- The StreamId of the stream
+
+        Returns:
+            tuple -- The snapshot's UpdatedOn timestamp and decoded stream, None if not cached
+        """
+        conn = self.try_connect()
+        if conn == None:
+            self.log("Failed to access database.")
+            return None
+
+        row = conn.execute(""" SELECT UpdatedOn, Bytes FROM CachedStream WHERE CombinedHash = ?""",
+                           (self.combined_hash(host, stream_id),)).fetchone()
+        if row is None:
+            return None
+        return row[0], json_codec.loads(blob_codec.decompress(row[1]))
+
+    def delete_stream(self, host, stream_id):
+        """Remove a stream snapshot from the cache
+
+        Arguments:
+            host {str} -- Speckle server RestApi
+            stream_id {str} -- The StreamId of the stream
+        """
+        conn = self.try_connect()
+        if conn == None:
+            raise Exception("Failed to connect to database.")
+
+        key = self.combined_hash(host, stream_id)
+        self._transaction(conn, lambda c: c.execute(""" DELETE FROM CachedStream WHERE CombinedHash = ?""", (key,)))
@@ -2,6 +2,8 @@ import requests, json, os
 import sqlite3, contextlib
 import struct, base64
 from speckle.base.client import ClientBase
+from speckle.base import batch, json_codec
+from speckle.base.async_client import AsyncClientBase
 
 def jdumps(msg):
     return json.dumps(msg, indent=4, sort_keys=True)
@@ -94,10 +96,10 @@ class SpeckleApiClient(ClientBase):
         Create client
         '''
         url = self.server + "/clients"
-        r = self.s.post(url, json.dumps(client))
+        r = self.s.post(url, json_codec.dumps(client))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ClientDeleteAsync(self, client):
@@ -111,7 +113,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ClientGetAsync(self, client):
@@ -122,10 +124,10 @@ class SpeckleApiClient(ClientBase):
         Update client
         '''
         url = self.server + "/clients/{}".format(clientId)
-        r = self.s.put(url, json.dumps(client))
+        r = self.s.put(url, json_codec.dumps(client))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def CommentCreateAsync(self, resourceType, str, comment):
@@ -153,9 +155,10 @@ class SpeckleApiClient(ClientBase):
         raise NotImplementedError
     '''
 
-    def ObjectCreateAsync(self, objectList):
+    def ObjectCreateAsync(self, objectList, max_bytes=None):
         '''
         Create objects
+        max_bytes - optional request size budget, larger lists are sent in several batches
         '''
         payload = []
         for o in objectList:
@@ -167,11 +170,31 @@ class SpeckleApiClient(ClientBase):
             payload.append(o)
 
         url = self.server + "/objects"
-        r = self.s.post(url, json.dumps(payload))
 
-        if self.check_response_status_code(r):
-            return r.json()
-        return None
+        if max_bytes is None:
+            r = self.s.post(url, json_codec.dumps(payload))
+
+            if self.check_response_status_code(r):
+                return json_codec.loads(r.content)
+            return None
+
+        encoded = [json_codec.dumps(o) for o in payload]
+
+        def post_shard(start, stop):
+            r = self.s.post(url, b'[' + b','.join(encoded[start:stop]) + b']')
+            if not self.check_response_status_code(r):
+                raise Exception('Failed to create objects {} to {}'.format(start, stop))
+            return json_codec.loads(r.content)
+
+        try:
+            responses = batch.run_shards(post_shard, batch.shard([len(e) for e in encoded], max_bytes=max_bytes))
+        except batch.ShardError as e:
+            self.log(str(e))
+            return None
+
+        response = responses[0] if responses else {'success': True, 'resources': []}
+        response['resources'] = [o for r in responses for o in r['resources']]
+        return response
 
     def ObjectDeleteAsync(self, objectId):
         '''
@@ -181,7 +204,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.delete(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ObjectGetAsync(self, objectId, query=""):
@@ -192,7 +215,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ObjectGetBulkAsync(self, objectIds, query=""):
@@ -200,10 +223,10 @@ class SpeckleApiClient(ClientBase):
         Get a list of objects at once
         '''
         url = self.server + "/objects/getbulk?{}".format(query)
-        r = self.s.post(url, data=json.dumps(objectIds))
+        r = self.s.post(url, data=json_codec.dumps(objectIds))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ObjectUpdateAsync(self, objectId, speckle_object):
@@ -212,14 +235,14 @@ class SpeckleApiClient(ClientBase):
         '''
         assert objectId is not None
         url = self.server + "/objects/{}".format(objectId)
-        r = self.s.put(url, json.dumps(speckle_object))
+        r = self.s.put(url, json_codec.dumps(speckle_object))
 
     def ObjectUpdatePropertiesAsync(self, objectId, prop):
         url = self.server + "/objects/{}/properties".format(objectId)
-        r = self.s.put(url, json.dumps(prop))
+        r = self.s.put(url, json_codec.dumps(prop))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ProjectCreateAsync(self, project):
@@ -227,10 +250,10 @@ class SpeckleApiClient(ClientBase):
         Create project
         '''
         url = self.server + "/projects"
-        r = self.s.post(url, json.dumps(project))
+        r = self.s.post(url, json_codec.dumps(project))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ProjectDeleteAsync(self, projectId):
@@ -241,7 +264,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.delete(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ProjectGetAllAsync(self, query=""):
@@ -254,7 +277,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ProjectGetAsync(self, projectId):
@@ -265,7 +288,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def ProjectUpdateAsync(self, projectId, project):
@@ -273,10 +296,10 @@ class SpeckleApiClient(ClientBase):
         Update an existing project
         '''
         url = self.server + "/projects/{}".format(projectId)
-        r = self.s.put(url, json.dumps(project))
+        r = self.s.put(url, json_codec.dumps(project))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamCloneAsync(self, streamId):
@@ -287,7 +310,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.post(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamCreateAsync(self, stream):
@@ -295,10 +318,10 @@ class SpeckleApiClient(ClientBase):
         Create new stream
         '''
         url = self.server + "/streams"
-        r = self.s.post(url, data=json.dumps(stream))
+        r = self.s.post(url, data=json_codec.dumps(stream))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamDeleteAsync(self, streamId):
@@ -310,7 +333,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.delete(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamDiffAsync(self, streamId1, streamId2):
@@ -321,7 +344,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamGetAsync(self, streamId, query=""):
@@ -332,7 +355,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamGetObjectsAsync(self, streamId, query=""):
@@ -343,7 +366,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamsGetAllAsync(self, query=""):
@@ -354,7 +377,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def StreamUpdateAsync(self, streamId, stream):
@@ -363,10 +386,10 @@ class SpeckleApiClient(ClientBase):
         '''
         assert streamId is not None
         url = self.server + "/streams/{}".format(streamId)
-        r = self.s.put(url, json.dumps(stream))
+        r = self.s.put(url, json_codec.dumps(stream))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def UserGetAsync(self):
@@ -374,7 +397,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def UserGetProfileByIdAsync(self, userId):
@@ -385,7 +408,7 @@ class SpeckleApiClient(ClientBase):
         r = self.s.get(url)
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def UserLoginAsync(self, user):
@@ -401,10 +424,10 @@ class SpeckleApiClient(ClientBase):
         if self.verbose:
             print(url)
 
-        r = self.s.post(url, data=json.dumps(user))
+        r = self.s.post(url, data=json_codec.dumps(user))
 
         if self.check_response_status_code(r):
-            login_response = r.json()
+            login_response = json_codec.loads(r.content)
             self.s.headers.update(
                 {'Authorization': login_response['resource']['apitoken']})
 
@@ -419,10 +442,10 @@ class SpeckleApiClient(ClientBase):
         assert ("surname" in user.keys())
 
         url = self.server + "/accounts/register"
-        r = self.s.post(url, data=json.dumps(user))
+        r = self.s.post(url, data=json_codec.dumps(user))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
 
     def UserSearchAsync(self, user):
@@ -437,8 +460,19 @@ class SpeckleApiClient(ClientBase):
         assert ("surname" in user.keys())
 
         url = self.server + "/accounts/register"
-        r = self.s.put(url, data=json.dumps(user))
+        r = self.s.put(url, data=json_codec.dumps(user))
 
         if self.check_response_status_code(r):
-            return r.json()
+            return json_codec.loads(r.content)
         return None
+
+
+class AsyncSpeckleApiClient(AsyncClientBase):
+
+    '''
+    Asyncio client exposing the same resources as SpeckleApiClient,
+    every resource method returns a coroutine.
+    '''
+
+    def log(self, msg):
+        print ('SpeckleClient: {}'.format(msg))
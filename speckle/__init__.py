@@ -1,2 +1,2 @@
-from .SpeckleClient import SpeckleApiClient, jdumps
+from .SpeckleClient import SpeckleApiClient, AsyncSpeckleApiClient, jdumps
 from .Cache import SpeckleCache
@@ -0,0 +1,278 @@
+"""Contiguous numeric arrays for the coordinate and index fields of schemas
+
+Fields typed :class:`FloatArray` or :class:`IntArray` hold a NumPy array when NumPy is
+installed, an :class:`array.array` otherwise, instead of a list of boxed Python numbers.
+Lists are converted in a single call without per-element validation, arrays of the right
+type are kept as is. Both encode to the same JSON as a list.
+
+Arrays can also be sent as base64 strings of their little-endian binary data, see
+:func:`encode_array`. The strings are decoded back to arrays by the array fields and by
+:func:`decode_arrays`.
+
+Example:
+    Work on the vertices of a mesh as an (N, 3) array::
+
+        from speckle.base.arrays import as_points
+        from speckle.schemas import Mesh
+
+        mesh = Mesh(vertices=[0, 0, 0, 1, 0, 0, 1, 1, 0])
+        points = as_points(mesh.vertices)
+        points[:, 2] += 10  # changes mesh.vertices, call mesh.invalidate_hashes() after
+
+    Encode the vertices as float32 and decode them::
+
+        from speckle.base.arrays import decode_array, encode_array
+
+        text = encode_array(mesh.vertices, 'float32')
+        vertices = decode_array(text)
+
+"""
+
+import array
+import base64
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Magic, item type, padding and item count of encoded arrays. The magic is 6 bytes long so
+# that encoded strings start with a fixed base64 prefix.
+_HEADER = struct.Struct('<6sc1xQ')
+_MAGIC = b'SPKARR'
+PREFIX = base64.b64encode(_MAGIC).decode('ascii')
+_ENCODED_PREFIX = PREFIX.encode('ascii')
+
+# Item type code: little-endian NumPy dtype, array.array typecode, value type
+_ITEM_TYPES = {
+    b'd': ('<f8', 'd', float),
+    b'f': ('<f4', 'f', float),
+    b'i': ('<i4', 'i', int),
+}
+FLOAT_TYPES = {'float64': b'd', 'float32': b'f'}
+
+# Shorter arrays are left as JSON lists, the header would outweigh the savings
+MIN_ENCODED_LENGTH = 8
+
+_INT32_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+
+def to_array(values, dtype, typecode):
+    """Convert a sequence of numbers to a contiguous one dimensional array
+
+    Arguments:
+        values {iterable} -- The numbers, eg: a list or an array
+        dtype {str} -- The NumPy dtype of the result
+        typecode {str} -- The array.array typecode of the result, without NumPy
+
+    Raises:
+        TypeError / ValueError -- If values are not numbers
+
+    Returns:
+        ndarray / array.array -- The array, values itself if it already has the right type
+    """
+    if isinstance(values, str) and values.startswith(PREFIX):
+        return decode_array(values, dtype, typecode)
+    if isinstance(values, (str, bytes, dict)):
+        raise TypeError('expected a sequence of numbers, got {}'.format(type(values).__name__))
+    if np is not None:
+        result = np.ascontiguousarray(values, dtype=dtype)
+        if result.ndim != 1:
+            result = result.reshape(-1)
+        # NumPy converts None to NaN, pydantic's List[float] rejects it
+        if result.dtype.kind == 'f' and result.size and np.isnan(result.min()) and any(v is None for v in values):
+            raise TypeError('expected numbers, got None')
+        return result
+    if isinstance(values, array.array) and values.typecode == typecode:
+        return values
+    if typecode == 'd':
+        return array.array(typecode, values)
+    return array.array(typecode, map(int, values))
+
+
+def encode_array(values, float_type='float64'):
+    """Encode an array as a base64 string of its little-endian binary data
+
+    Floats are written as `float_type`, integers as int32. Arrays which are too short,
+    hold integers outside of the int32 range or are not numeric are returned unchanged.
+
+    Arguments:
+        values {ndarray / array.array / list} -- The numbers to encode
+
+    Keyword Arguments:
+        float_type {str} -- 'float64', or 'float32' which halves the size but is lossy (default: {'float64'})
+
+    Raises:
+        ValueError -- If float_type is not one of FLOAT_TYPES
+
+    Returns:
+        str / object -- The encoded string, or values itself
+    """
+    if float_type not in FLOAT_TYPES:
+        raise ValueError('float_type must be one of {}, got {!r}'.format(sorted(FLOAT_TYPES), float_type))
+    if len(values) < MIN_ENCODED_LENGTH or isinstance(values, (str, bytes)):
+        return values
+
+    if np is not None:
+        values = np.asarray(values)
+        if values.dtype.kind == 'f':
+            code = FLOAT_TYPES[float_type]
+        elif values.dtype.kind in 'iu' and _INT32_RANGE[0] <= values.min() and values.max() <= _INT32_RANGE[1]:
+            code = b'i'
+        else:
+            return values
+        data = values.astype(_ITEM_TYPES[code][0], copy=False).tobytes()
+    else:
+        if (isinstance(values, array.array) and values.typecode in 'fd') or all(type(v) is float for v in values):
+            code = FLOAT_TYPES[float_type]
+        elif all(type(v) is int for v in values) and _INT32_RANGE[0] <= min(values) and max(values) <= _INT32_RANGE[1]:
+            code = b'i'
+        else:
+            return values
+        items = array.array(_ITEM_TYPES[code][1], values)
+        if sys.byteorder == 'big':
+            items.byteswap()
+        data = items.tobytes()
+
+    return base64.b64encode(_HEADER.pack(_MAGIC, code, len(values)) + data).decode('ascii')
+
+
+def decode_array(text, dtype=None, typecode=None):
+    """Decode a string written by :func:`encode_array`
+
+    Arguments:
+        text {str} -- The encoded string
+
+    Keyword Arguments:
+        dtype {str} -- The NumPy dtype of the result, defaults to float64 or int64 (default: {None})
+        typecode {str} -- The array.array typecode of the result without NumPy, defaults to 'd' or 'q' (default: {None})
+
+    Raises:
+        ValueError -- If text is not a valid encoded array
+
+    Returns:
+        ndarray / array.array -- The decoded array
+    """
+    raw = base64.b64decode(text)
+    if len(raw) < _HEADER.size:
+        raise ValueError('not an encoded array')
+    magic, code, count = _HEADER.unpack_from(raw)
+    if magic != _MAGIC or code not in _ITEM_TYPES:
+        raise ValueError('not an encoded array')
+    source_dtype, source_typecode, kind = _ITEM_TYPES[code]
+    if len(raw) != _HEADER.size + count * int(source_dtype[-1]):
+        raise ValueError('encoded array is truncated')
+
+    if np is not None:
+        items = np.frombuffer(raw, dtype=source_dtype, count=count, offset=_HEADER.size)
+        return items.astype(dtype or ('float64' if kind is float else 'int64'))
+
+    items = array.array(source_typecode, raw[_HEADER.size:])
+    if sys.byteorder == 'big':
+        items.byteswap()
+    return array.array(typecode or ('d' if kind is float else 'q'), items)
+
+
+def decode_arrays(data):
+    """Decode, in place, the encoded arrays held by a decoded JSON object
+
+    Nested objects, alone or in lists, are decoded too. Strings which start like an encoded
+    array but do not decode, eg: user text, are kept as they are.
+
+    Arguments:
+        data {dict} -- The decoded JSON object
+
+    Returns:
+        dict -- data itself
+    """
+    for k, v in data.items():
+        if type(v) is str:
+            if v.startswith(PREFIX):
+                try:
+                    data[k] = decode_array(v)
+                except ValueError:
+                    pass
+        elif type(v) is dict:
+            decode_arrays(v)
+        elif type(v) is list and v and type(v[0]) is dict:
+            for item in v:
+                if type(item) is dict:
+                    decode_arrays(item)
+    return data
+
+
+def may_hold_arrays(raw):
+    """Whether a raw JSON body may hold encoded arrays, see :func:`decode_arrays`
+
+    The body is only searched for the prefix of encoded arrays, which is much faster than
+    walking the decoded objects, so bodies without any are not walked at all.
+
+    Arguments:
+        raw {bytes / str} -- The JSON body, or part of it
+
+    Returns:
+        bool -- False if raw holds no encoded array
+    """
+    return (PREFIX if isinstance(raw, str) else _ENCODED_PREFIX) in raw
+
+
+def is_array(value):
+    """Whether value is an array produced by :func:`to_array`"""
+    return isinstance(value, array.array) or (np is not None and isinstance(value, np.ndarray))
+
+
+def as_points(values, size=3):
+    """Zero-copy (N, size) view of a flat coordinate array
+
+    Arguments:
+        values {ndarray / array.array} -- The flat coordinates, eg: Mesh.vertices
+
+    Keyword Arguments:
+        size {int} -- Number of coordinates per point (default: {3})
+
+    Returns:
+        ndarray / memoryview -- A two dimensional view sharing the memory of values
+    """
+    if np is not None:
+        return np.asarray(values).reshape(-1, size)
+    if not isinstance(values, array.array):
+        values = array.array('d', values)
+    return memoryview(values).cast('B').cast(values.typecode, (len(values) // size, size))
+
+
+class NumberArray(object):
+    """Base of the array field types, see :class:`FloatArray` and :class:`IntArray`"""
+
+    dtype = None
+    typecode = None
+    item_type = None
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        field_schema.update(type='array', items={'type': cls.item_type})
+
+    @classmethod
+    def validate(cls, value):
+        return to_array(value, cls.dtype, cls.typecode)
+
+
+class FloatArray(NumberArray):
+    """Array of float64, eg: vertices, weights or knots"""
+
+    dtype = 'float64'
+    typecode = 'd'
+    item_type = 'number'
+
+
+class IntArray(NumberArray):
+    """Array of int64, eg: faces or colors"""
+
+    dtype = 'int64'
+    typecode = 'q'
+    item_type = 'integer'
@@ -0,0 +1,416 @@
+"""Speckle Async Client documentation
+
+The AsyncClientBase class mirrors :class:`ClientBase` for asyncio applications. Every
+resource exposes the same methods as its synchronous counterpart, but they return
+coroutines which are sent over a pooled `aiohttp <https://docs.aiohttp.org>`_ connector,
+so a single process can keep many requests in flight.
+
+Example:
+    Log in and fetch a batch of objects concurrently::
+
+        import asyncio
+        from speckle import AsyncSpeckleApiClient
+
+        async def main():
+            async with AsyncSpeckleApiClient('myspeckle.speckle.works') as client:
+                await client.login(email='test@test.com', password='Speckle<3Python')
+
+                stream = await client.streams.get('HjenwS2s')
+                ids = [o.id for o in stream.objects]
+                chunks = [ids[i:i + 100] for i in range(0, len(ids), 100)]
+
+                results = await asyncio.gather(*[client.objects.get_bulk(c) for c in chunks])
+
+        asyncio.run(main())
+
+"""
+
+import asyncio
+import json
+import requests
+from requests import Request
+from speckle import resources
+from speckle.Cache import timestamp
+from speckle.base import arrays, batch, json_codec
+from speckle.base.client import ClientBase
+
+
+class AsyncSession(requests.Session):
+    """Session sending prepared requests through a pooled aiohttp connector
+
+    The session keeps the header handling and request preparation of :class:`requests.Session`
+    so resources can keep using :meth:`ResourceBase._prep_request` unchanged. Only the
+    transport is swapped for an asynchronous one, which is created lazily inside the running
+    event loop.
+    """
+
+    DEFAULT_MAX_CONNECTIONS = 100
+
+    def __init__(self, max_connections=DEFAULT_MAX_CONNECTIONS):
+        super().__init__()
+        self.max_connections = max_connections
+        self._http = None
+
+    def _get_http(self):
+        if self._http is None or self._http.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError('The async client requires aiohttp, install it with `pip install speckle[async]`')
+
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._http = aiohttp.ClientSession(connector=connector)
+        return self._http
+
+    async def send_async(self, prepared, raw=False):
+        """Send a prepared request and return its decoded JSON body
+
+        Arguments:
+            prepared {PreparedRequest} -- A request prepared by this session
+
+        Keyword Arguments:
+            raw {bool} -- Return the body as bytes, without decoding it (default: {False})
+
+        Returns:
+            dict -- The decoded response payload, bytes with `raw`
+        """
+        headers = {k: v for k, v in prepared.headers.items() if k.lower() != 'content-length'}
+        async with self._get_http().request(prepared.method, prepared.url, data=prepared.body, headers=headers) as resp:
+            resp.raise_for_status()
+            content = await resp.read()
+        return content if raw else json_codec.loads(content)
+
+    async def request_async(self, method, url, json=None, params=None):
+        return await self.send_async(self.prepare_request(Request(
+            method, url, data=json_codec.dumps(json), params=params, headers={'Content-Type': 'application/json'})))
+
+    async def close_async(self):
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self.close()
+
+
+class AsyncResourceBase(object):
+    """Mixin turning a :class:`ResourceBase` subclass into its awaitable counterpart"""
+
+    async def make_request(self, method, path, data=None, comment=False, schema=None, params=None, stream=False, trusted=None):
+        # Responses are not streamed, `stream` is accepted for signature compatibility only
+        r = self._prep_request(method, path, comment, data, params)
+        content = await self.s.send_async(r, raw=True)
+        return self._parse_payload(json_codec.loads(content), comment, schema, trusted, arrays.may_hold_arrays(content))
+
+    async def _request_payload_async(self, method, path, data=None, comment=False, params=None):
+        r = self._prep_request(method, path, comment, data, params)
+        response_payload = await self.s.send_async(r)
+        assert response_payload['success'] == True, json.dumps(response_payload)
+        return response_payload
+
+    async def _write(self, method, path, id, data=None):
+        # Cached copies are dropped once the request is done, whether it succeeded or not
+        try:
+            return await self.make_request(method, path, data)
+        finally:
+            self._invalidate(id)
+
+
+class AsyncObjectsResource(AsyncResourceBase):
+
+    async def get(self, id, query=None):
+        """Get a specific Speckle object, see :meth:`speckle.resources.objects.Resource.get`"""
+        if self.cache is None or query:
+            return await self.make_request('get', '/' + id, params=query)
+
+        instances, found, missing = self._get_cached([id])
+        if missing:
+            self._put_downloaded(found, [[(await self._request_payload_async('get', '/' + id))['resource']]])
+        return self._parse_cached([id], instances, found)[0]
+
+    async def update(self, id, data):
+        return await self._write('update', '/' + id, id, data)
+
+    async def delete(self, id):
+        return await self._write('delete', '/' + id, id)
+
+    async def set_properties(self, id, data):
+        return await self._write('set_properties', '/' + id + '/properties', id, data)
+
+    async def get_bulk(self, object_ids, query=None, shard_size=None, max_workers=4, retries=2, stream=False):
+        """Retrieve a list of Speckle objects, see :meth:`speckle.resources.objects.Resource.get_bulk`
+
+        Shards are downloaded concurrently on the event loop, `stream` is ignored.
+        """
+        if self.cache is not None and not query:
+            return await self._get_bulk_cached(object_ids, shard_size, max_workers, retries)
+
+        if not shard_size:
+            return await self.make_request('get_bulk', '/getbulk', object_ids, params=query)
+
+        async def get_shard(start, stop):
+            ids = object_ids[start:stop]
+            return resources.objects._in_order(ids, await self.make_request('get_bulk', '/getbulk', ids, params=query))
+
+        shards = self._bulk_shards(object_ids, shard_size)
+        return [o for objects in await batch.run_shards_async(get_shard, shards, max_workers, retries) for o in objects]
+
+    async def _get_bulk_cached(self, object_ids, shard_size, max_workers, retries):
+        instances, found, missing = self._get_cached(object_ids)
+        if missing:
+            async def get_shard(start, stop):
+                return (await self._request_payload_async('get_bulk', '/getbulk', missing[start:stop]))['resources']
+
+            try:
+                downloaded = await batch.run_shards_async(get_shard, self._bulk_shards(missing, shard_size), max_workers, retries)
+            except batch.ShardError as e:
+                self._put_downloaded(found, e.results)
+                raise
+            self._put_downloaded(found, downloaded)
+        return self._parse_cached(object_ids, instances, found)
+
+    async def create_batched(self, data, max_bytes=None, max_workers=4, retries=2, dedupe=True, cache=None, tolerance=None):
+        """Create a large list of Speckle objects in size-bounded batches, see
+        :meth:`speckle.resources.objects.Resource.create_batched`
+
+        Batches are uploaded concurrently on the event loop, `max_workers` at once.
+        """
+        shards, body, finish = self._prep_batches(data, max_bytes, dedupe, cache or self.cache, tolerance)
+
+        async def create_shard(start, stop):
+            return [o.id for o in await self.make_request('create', '/', body(start, stop))]
+
+        try:
+            shard_ids = await batch.run_shards_async(create_shard, shards, max_workers, retries)
+        except batch.ShardError as e:
+            finish(e.results)
+            raise
+        return finish(shard_ids)
+
+
+class AsyncStreamsResource(AsyncResourceBase):
+
+    async def create(self, data):
+        """Create a stream from a data dictionary, see :meth:`speckle.resources.streams.Resource.create`"""
+        if not self.quantize:
+            return await self.make_request('create', '/', data)
+
+        data, report = self._quantize(data)
+        stream = await self.make_request('create', '/', data)
+        self._record(stream.streamId, report)
+        return stream
+
+    async def get(self, id, query=None):
+        """Get a specific stream, see :meth:`speckle.resources.streams.Resource.get`"""
+        if self.cache is None or query:
+            return await self.make_request('get', '/' + id, params=query)
+
+        cached = self.cache.get_stream(self.basepath, id)
+        if cached is not None and cached[0] is not None:
+            head = (await self._request_payload_async('get', '/' + id, params={'fields': 'updatedAt'}))['resource']
+            if timestamp(head.get('updatedAt')) == cached[0]:
+                return self._parse_response(cached[1])
+
+        resource = (await self._request_payload_async('get', '/' + id))['resource']
+        self.cache.put_stream(self.basepath, resource)
+        return self._parse_response(resource)
+
+    async def update(self, id, data):
+        """Update a specific stream, see :meth:`speckle.resources.streams.Resource.update`"""
+        report = None
+        if self.quantize:
+            tolerance = await self._stream_tolerance(id) if resources.streams._inherits_tolerance(data) else None
+            data, report = self._quantize(data, tolerance)
+        try:
+            result = await self.make_request('update', '/' + id, data)
+        finally:
+            self._invalidate(id)
+        self._record(id, report)
+        return result
+
+    async def delete(self, id):
+        return await self._write('delete', '/' + id, id)
+
+    async def _stream_tolerance(self, id):
+        head = (await self._request_payload_async('get', '/' + id, params={'fields': 'baseProperties'}))['resource']
+        return (head.get('baseProperties') or {}).get('tolerance')
+
+    async def clone(self, id, name=None):
+        response = await self.make_request('clone', '/' + id + '/clone', {'name': name})
+        clone = self._parse_response(response['clone'])
+        parent = self._parse_response(response['parent'])
+        return clone, parent
+
+    async def iter_objects(self, id, batch_size=100, query=None, prefetch=True):
+        """Iterate over the objects of a stream, see :meth:`speckle.resources.streams.Resource.iter_objects`
+
+        Use with `async for`, the next batch is downloaded while the current one is consumed.
+        """
+        stream = await self.make_request('get', '/' + id, params={'fields': 'objects'})
+        ids = [o.id for o in stream.objects]
+        del stream
+
+        objects_resource = self._objects_resource()
+        batches = (ids[i:i + batch_size] for i in range(0, len(ids), batch_size))
+
+        async def fetch(batch):
+            return await objects_resource.get_bulk(batch, query=query) if batch else None
+
+        if not prefetch:
+            for batch in batches:
+                for o in await fetch(batch):
+                    yield o
+            return
+
+        pending = asyncio.ensure_future(fetch(next(batches, None)))
+        try:
+            while True:
+                current = await pending
+                if current is None:
+                    break
+                pending = asyncio.ensure_future(fetch(next(batches, None)))
+                for o in current:
+                    yield o
+                del current
+        finally:
+            pending.cancel()
+
+    def _objects_resource(self):
+        objects_resource = async_resource('objects')(self.s, self.basepath, self.me)
+        objects_resource.trusted = self.trusted
+        objects_resource.cache = self.cache
+        return objects_resource
+
+
+# Methods which post-process the result of make_request need an awaiting override
+ASYNC_MIXINS = {
+    'objects': AsyncObjectsResource,
+    'streams': AsyncStreamsResource,
+}
+
+_async_resources = {}
+
+
+def async_resource(name):
+    """Build (once) the awaitable version of the resource module `name`
+
+    Arguments:
+        name {str} -- The resource module name, eg: 'objects'
+
+    Returns:
+        type -- A Resource class whose API methods return coroutines
+    """
+    if name not in _async_resources:
+        module = getattr(resources, name)
+        mixin = ASYNC_MIXINS.get(name, AsyncResourceBase)
+        _async_resources[name] = type('AsyncResource', (mixin, module.Resource), {'__module__': module.__name__})
+    return _async_resources[name]
+
+
+class AsyncClientBase(ClientBase):
+    """Base class for the asyncio speckle client
+
+    Arguments and credentials handling are identical to :class:`ClientBase`. The client should
+    be closed with :meth:`close` (or used as an async context manager) to release the pooled
+    connections.
+
+    With a `cache`, reads and writes of the SQLite cache run on the event loop's thread, only
+    the requests to the server are awaited.
+
+    Keyword Arguments:
+        max_connections {int} -- Maximum number of simultaneous connections (default: {100})
+    """
+
+    def __init__(self, host=ClientBase.DEFAULT_HOST, version=ClientBase.DEFAULT_VERSION, use_ssl=ClientBase.USE_SSL,
+                 verbose=False, trusted=False, max_connections=AsyncSession.DEFAULT_MAX_CONNECTIONS, binary_arrays=None,
+                 quantize=False, cache=None):
+        super().__init__(host, version, use_ssl, verbose, trusted, cache=cache, binary_arrays=binary_arrays, quantize=quantize)
+        self.s = AsyncSession(max_connections)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections held by the client"""
+        await self.s.close_async()
+
+    async def register(self, email, password, company, name=None, surname=None):
+        """Register a new user to the speckle server, see :meth:`ClientBase.register`"""
+        response = await self.s.request_async(
+            'POST',
+            self.server + '/accounts/register',
+            json={
+                'name': name,
+                'surname': surname,
+                'email': email,
+                'password': password,
+                'company': company
+            })
+
+        assert response['success'], response['message']
+
+        await self.login(email, password)
+
+    async def login(self, email, password):
+        """Login user to speckle server, see :meth:`ClientBase.login`"""
+        response = await self.s.request_async(
+            'POST',
+            self.server + '/accounts/login',
+            json={
+                'email': email,
+                'password': password
+            })
+
+        if self.verbose:
+            print(response)
+        assert response['success'], response['message']
+
+        self.me = response['resource']
+        self.s.headers.update({
+            'content-type': 'application/json',
+            'Authorization': self.me['token'],
+        })
+
+    async def login_with_token(self, token):
+        """Login user to the speckle server using an API token, see :meth:`ClientBase.login_with_token`"""
+        if type(token) is not str:
+            raise ValueError("Token must be a string")
+
+        if (token[0:3] != 'JWT'):
+            raise ValueError("Token must begin with 'JWT'")
+
+        self.s.headers.update({
+            'content-type': 'application/json',
+            'Authorization': token,
+        })
+
+        full_profile = await self.accounts.get_profile()
+        self.me = {k: full_profile.get(k, None) for k in ('id', 'email', 'name', 'surname', 'company', 'avatar', 'role', 'apitoken')}
+        self.me['token'] = token
+
+    async def websockets(self, stream_id, client_id=None, **kwargs):
+        """Connect to a specific stream on the host server through websockets, see :meth:`ClientBase.websockets`
+
+        Only the creation of the api client is awaited, the returned WebSocketApp is the
+        regular (threaded) websocket-client instance.
+        """
+        if not client_id:
+            api_client = await self.api_clients.create({
+                'streamId': stream_id
+            })
+
+            client_id = api_client.id
+
+        return super().websockets(stream_id, client_id=client_id, **kwargs)
+
+    def __getattr__(self, name):
+        try:
+            resource = async_resource(name)(self.s, self.server, self.me)
+            resource.trusted = self.trusted
+            resource.cache = self.cache
+            resource.binary_arrays = self.binary_arrays
+            resource.quantize = self.quantize
+            return resource
+        except:
+            raise Exception('Method {} is not supported by AsyncSpeckleApiClient class'.format(name))
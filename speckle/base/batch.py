@@ -0,0 +1,148 @@
+"""Helpers to split large requests into shards and send them on a worker pool
+
+Shards are contiguous slices of the input so results can be stitched back together in
+the original order. Failed shards are retried on their own, the shards that succeeded
+are never sent twice.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ShardError(Exception):
+    """Raised when some shards of a batched request still fail after all retries
+
+    Attributes:
+        shards {list} -- The (start, stop) slice of the input covered by each shard
+        results {list} -- The result of each shard, None for the ones that failed
+        failures {dict} -- The last exception raised by each failed shard, keyed by shard index
+    """
+
+    def __init__(self, shards, results, failures):
+        self.shards = shards
+        self.results = results
+        self.failures = failures
+        super().__init__('{} of {} shards failed: {}'.format(
+            len(failures), len(shards),
+            ', '.join('shard {} {} ({})'.format(i, shards[i], repr(e)) for i, e in sorted(failures.items()))))
+
+
+def shard(sizes, max_items=None, max_bytes=None, overhead=2, separator=1):
+    """Split a list of item sizes into contiguous shards
+
+    A shard is closed as soon as adding the next item would exceed either limit. An item
+    larger than `max_bytes` on its own still gets a shard of its own.
+
+    Arguments:
+        sizes {list} -- The encoded size of each item, in bytes
+
+    Keyword Arguments:
+        max_items {int} -- Maximum number of items per shard (default: {None})
+        max_bytes {int} -- Maximum encoded size of a shard (default: {None})
+        overhead {int} -- Bytes added once per shard, eg: the enclosing brackets (default: {2})
+        separator {int} -- Bytes added between two items, eg: a comma (default: {1})
+
+    Returns:
+        list -- A list of (start, stop) tuples
+    """
+    shards = []
+    start = 0
+    total = overhead
+    for i, size in enumerate(sizes):
+        count = i - start
+        if count and ((max_items and count >= max_items) or
+                      (max_bytes and total + separator + size > max_bytes)):
+            shards.append((start, i))
+            start = i
+            total = overhead
+            count = 0
+        total += size + (separator if count else 0)
+    if start < len(sizes):
+        shards.append((start, len(sizes)))
+    return shards
+
+
+def run_shards(fn, shards, max_workers=4, retries=2):
+    """Call `fn` for each shard on a thread pool, retrying the shards that fail
+
+    Arguments:
+        fn {callable} -- Called with (start, stop) for each shard
+        shards {list} -- The shards to run, as returned by :func:`shard`
+
+    Keyword Arguments:
+        max_workers {int} -- Number of shards in flight at once (default: {4})
+        retries {int} -- How many extra attempts a failing shard gets (default: {2})
+
+    Raises:
+        ShardError -- If at least one shard failed on every attempt
+
+    Returns:
+        list -- The result of each shard, in shard order
+    """
+    results = [None] * len(shards)
+    pending = list(range(len(shards)))
+    failures = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(shards) or 1))) as pool:
+        for _ in range(retries + 1):
+            if not pending:
+                break
+            futures = {i: pool.submit(fn, *shards[i]) for i in pending}
+            pending = []
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                    failures.pop(i, None)
+                except Exception as e:
+                    failures[i] = e
+                    pending.append(i)
+
+    if failures:
+        raise ShardError(shards, results, failures)
+    return results
+
+
+async def run_shards_async(fn, shards, max_workers=4, retries=2):
+    """Await `fn` for each shard, at most `max_workers` at once, retrying the shards that fail
+
+    The asyncio counterpart of :func:`run_shards`.
+
+    Arguments:
+        fn {callable} -- Coroutine function called with (start, stop) for each shard
+        shards {list} -- The shards to run, as returned by :func:`shard`
+
+    Keyword Arguments:
+        max_workers {int} -- Number of shards in flight at once (default: {4})
+        retries {int} -- How many extra attempts a failing shard gets (default: {2})
+
+    Raises:
+        ShardError -- If at least one shard failed on every attempt
+
+    Returns:
+        list -- The result of each shard, in shard order
+    """
+    results = [None] * len(shards)
+    pending = list(range(len(shards)))
+    failures = {}
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def run(i):
+        async with semaphore:
+            return await fn(*shards[i])
+
+    for _ in range(retries + 1):
+        if not pending:
+            break
+        outcomes = await asyncio.gather(*[run(i) for i in pending], return_exceptions=True)
+        attempted, pending = pending, []
+        for i, outcome in zip(attempted, outcomes):
+            if isinstance(outcome, Exception):
+                failures[i] = outcome
+                pending.append(i)
+            else:
+                results[i] = outcome
+                failures.pop(i, None)
+
+    if failures:
+        raise ShardError(shards, results, failures)
+    return results
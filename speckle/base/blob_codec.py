@@ -0,0 +1,173 @@
+"""Compression of the payloads stored in the cache database
+
+Blobs are tagged with the codec they were written with, so a cache can switch codec (or
+be shared by clients with different codecs installed) and still read all of its rows.
+Untagged blobs are plain JSON, as written by previous versions.
+
+The preferred installed codec is used by default, in order `zstandard
+<https://github.com/indygreg/python-zstandard>`_, `lz4 <https://github.com/python-lz4/python-lz4>`_
+and the standard library :mod:`zlib`.
+
+Example:
+    Compress with a given codec, decompress whatever the codec::
+
+        from speckle.base import blob_codec
+
+        blob = blob_codec.compress(b'{"type":"Mesh"}', 'zlib')
+        data = blob_codec.decompress(blob)
+
+"""
+
+import zlib
+
+CODECS = ('zstd', 'lz4', 'zlib')
+
+# JSON never starts with a NUL byte
+_MARKER = b'\x00'
+
+CODEC = None
+
+
+def _zlib_codec():
+    def compress(data):
+        return zlib.compress(data, 1)
+
+    return b'z', compress, zlib.decompress
+
+
+def _lz4_codec():
+    import lz4.frame
+
+    return b'l', lz4.frame.compress, lz4.frame.decompress
+
+
+def _zstd_codec():
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=3)
+    decompressor = zstandard.ZstdDecompressor()
+
+    def compress(data):
+        return compressor.compress(data)
+
+    def decompress(data):
+        return decompressor.decompress(data)
+
+    return b's', compress, decompress
+
+
+def _raw_codec():
+    def passthrough(data):
+        return bytes(data)
+
+    return b'', passthrough, passthrough
+
+
+_FACTORIES = {
+    'zstd': _zstd_codec,
+    'lz4': _lz4_codec,
+    'zlib': _zlib_codec,
+    'raw': _raw_codec,
+}
+
+_loaded = {}
+_decoders = {}
+
+
+def _load(name):
+    if name not in _loaded:
+        tag, compress, decompress = _FACTORIES[name]()
+        _loaded[name] = (tag, compress)
+        _decoders[tag] = decompress
+    return _loaded[name]
+
+
+def available_codecs():
+    """List the codecs which can be imported
+
+    Returns:
+        list -- Codec names, preferred first
+    """
+    names = []
+    for name in CODECS + ('raw',):
+        try:
+            _load(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def use_codec(name=None):
+    """Select the codec used by :func:`compress` by default
+
+    Keyword Arguments:
+        name {str} -- One of CODECS or 'raw', None picks the preferred installed one (default: {None})
+
+    Raises:
+        ImportError -- If the requested codec is not installed
+
+    Returns:
+        str -- The name of the selected codec
+    """
+    global CODEC
+
+    names = [name] if name else CODECS
+    for n in names:
+        try:
+            _load(n)
+            CODEC = n
+            return n
+        except ImportError:
+            if name:
+                raise
+    raise ImportError('No blob codec available')
+
+
+def compress(data, codec=None):
+    """Compress and tag a blob
+
+    Arguments:
+        data {bytes} -- The data to compress, usually encoded JSON
+
+    Keyword Arguments:
+        codec {str} -- The codec to use, defaults to the selected one (default: {None})
+
+    Returns:
+        bytes -- The tagged blob, `data` itself for the 'raw' codec
+    """
+    tag, encode = _load(codec or CODEC)
+    if not tag:
+        return encode(data)
+    return _MARKER + tag + encode(data)
+
+
+def decompress(blob):
+    """Decompress a blob written by :func:`compress` or an untagged one
+
+    Arguments:
+        blob {bytes} -- The stored blob
+
+    Raises:
+        ValueError -- If the blob was written with a codec which is not installed
+
+    Returns:
+        bytes -- The original data
+    """
+    if not blob or blob[:1] != _MARKER:
+        return blob
+    tag = bytes(blob[1:2])
+    decode = _decoders.get(tag)
+    if decode is None:
+        for name in CODECS:
+            try:
+                _load(name)
+            except ImportError:
+                pass
+        decode = _decoders.get(tag)
+        if decode is None:
+            raise ValueError('Blob compressed with an unavailable codec (tag {!r})'.format(tag))
+    return decode(memoryview(blob)[2:])
+
+
+use_codec()
@@ -26,6 +26,7 @@ For more detailed documentation on the inidividual resources available go  :doc:
 
 import requests
 from speckle import resources
+from speckle.base import json_codec
 from websocket import WebSocketApp
 import urllib
 
@@ -35,13 +36,31 @@ class ClientBase():
     This class contains the basic properties required to register, authenticate and hold authentication
     credentials.
 
+    Responses from the server are validated against their schema, unless the client is created with
+    `trusted=True`, in which case instances are built without validation (see
+    :func:`speckle.base.resource.construct`). This can also be toggled per resource through its
+    `trusted` attribute.
+
+    Passing a :class:`~speckle.Cache.SpeckleCache` as `cache` enables read-through caching of
+    objects: they are served from the cache when possible and only the missing ones are
+    downloaded.
+
+    With `binary_arrays='float64'` (or `'float32'`, lossy but half the size) the coordinate and
+    index arrays of the objects sent are encoded as base64 binary blocks instead of lists of
+    numbers (see :func:`speckle.base.arrays.encode_array`). Encoded arrays received are always
+    decoded. This can also be set per resource through its `binary_arrays` attribute.
+
+    With `quantize=True`, the coordinates of the objects sent with a stream are snapped to the
+    stream's tolerance before upload, see :class:`speckle.resources.streams.Resource`. Objects
+    uploaded on their own carry no tolerance, pass it to `objects.create_batched` instead.
+
     """
     
     DEFAULT_HOST = 'hestia.speckle.works'
     DEFAULT_VERSION = 'v1'
     USE_SSL = True
 
-    def __init__(self, host=DEFAULT_HOST, version=DEFAULT_VERSION, use_ssl=USE_SSL, verbose=False):
+    def __init__(self, host=DEFAULT_HOST, version=DEFAULT_VERSION, use_ssl=USE_SSL, verbose=False, trusted=False, cache=None, binary_arrays=None, quantize=False):
 
         ws_protocol = 'ws'
         http_protocol = 'http'
@@ -55,6 +74,10 @@ class ClientBase():
         self.me = None
         self.s = requests.Session()
         self.verbose = verbose
+        self.trusted = trusted
+        self.cache = cache
+        self.binary_arrays = binary_arrays
+        self.quantize = quantize
 
     @property
     def token(self):
@@ -82,15 +105,16 @@ class ClientBase():
 
         r = self.s.post(
             self.server + '/accounts/register',
-            json={
+            headers={'content-type': 'application/json'},
+            data=json_codec.dumps({
                 'name': name,
                 'surname': surname,
                 'email': email,
                 'password': password,
                 'company': company
-            })
+            }))
 
-        response = r.json()
+        response = json_codec.loads(r.content)
         assert response['success'], response['message']
 
         self.login(email, password)
@@ -109,17 +133,18 @@ class ClientBase():
 
         r = self.s.post(
             self.server + '/accounts/login',
-            json={
+            headers={'content-type': 'application/json'},
+            data=json_codec.dumps({
                 'email': email,
                 'password': password
-            })
+            }))
 
-        response = r.json()
+        response = json_codec.loads(r.content)
         if self.verbose:
             print(response)
         assert response['success'], response['message']
         
-        self.me = r.json()['resource']
+        self.me = response['resource']
         self.s.headers.update({
             'content-type': 'application/json',
             'Authorization': self.me['token'],
@@ -272,7 +297,12 @@ class ClientBase():
     def __getattr__(self, name):
         try:
             attr = getattr(resources, name)
-            return attr.Resource(self.s, self.server, self.me)
+            resource = attr.Resource(self.s, self.server, self.me)
+            resource.trusted = self.trusted
+            resource.cache = self.cache
+            resource.binary_arrays = self.binary_arrays
+            resource.quantize = self.quantize
+            return resource
         except:
             raise Exception('Method {} is not supported by SpeckleClient class'.format(name))
 
@@ -0,0 +1,673 @@
+"""Vectorized operations on the coordinates of Speckle objects
+
+The geometry fields of a schema are listed in class attributes, see FIELD_KINDS, eg:
+`coordinate_fields = ('vertices',)` for Mesh. Objects which are not instances of a geometry
+schema, such as the SpeckleObjects of a parsed stream, use the fields of the schema
+registered for their type.
+
+The coordinates of many objects are gathered into one flat array (:func:`gather`), processed
+in a single NumPy call and written back to the objects (:func:`scatter`). Objects are modified
+in place and their cached hashes are invalidated.
+
+Example:
+    Move objects up by 10 units and snap their coordinates to a 1mm grid::
+
+        from speckle.base import geometry
+
+        geometry.transform(objects, [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 10], [0, 0, 0, 1]])
+        report = geometry.quantize(objects, 0.001)
+        print(report.reduction)
+
+"""
+
+import array
+import copy
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from speckle.base import arrays, json_codec
+from speckle.base.resource import SCHEMAS
+
+
+class QuantizeReport(object):
+    """Size of the coordinates snapped by :func:`quantize`, written as JSON
+
+    Attributes:
+        objects {int} -- Number of objects holding coordinates
+        values {int} -- Number of coordinates
+        changed {int} -- Number of coordinates moved by the snapping
+        bytes_before {int} -- Size of the coordinates before snapping
+        bytes_after {int} -- Size of the coordinates after snapping
+    """
+
+    def __init__(self, objects=0, values=0, changed=0, bytes_before=0, bytes_after=0):
+        self.objects = objects
+        self.values = values
+        self.changed = changed
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+
+    @property
+    def reduction(self):
+        """Fraction of the coordinates' size saved, eg: 0.4 for 40%"""
+        if not self.bytes_before:
+            return 0.0
+        return 1 - self.bytes_after / self.bytes_before
+
+    def __repr__(self):
+        return 'QuantizeReport(objects={}, values={}, changed={}, bytes_before={}, bytes_after={}, reduction={:.1%})'.format(
+            self.objects, self.values, self.changed, self.bytes_before, self.bytes_after, self.reduction)
+
+
+# Class attributes of the schemas listing their geometry fields:
+# - coordinate_fields: flat xyz positions, eg: Mesh.vertices
+# - direction_fields: flat xyz vectors, not translated by transforms, eg: Vector.value
+# - length_fields: lengths, single or in lists, eg: Arc.radius, Line.domain.start
+# Names with dots are paths into nested models or dicts, eg: 'domain.start'.
+# - normalized_fields: nested Vectors kept of unit length by transforms, eg: the axes of a Plane
+# - normal_fields: nested Vectors perpendicular to a surface, transformed by the inverse transpose
+#   of the matrix and kept of unit length, eg: the normal of a Plane
+FIELD_KINDS = ('coordinate_fields', 'direction_fields', 'length_fields', 'normalized_fields', 'normal_fields')
+
+_NUMBERS = frozenset((int, float))
+# Lists from this length on are converted on their own, rather than checked value by value
+_LARGE_LIST = 1024
+
+_declares_fields = {}
+_plans = {}
+
+
+def _declares(schema):
+    declares = _declares_fields.get(schema)
+    if declares is None:
+        declares = _declares_fields[schema] = any(getattr(schema, kind, ()) for kind in FIELD_KINDS)
+    return declares
+
+
+def _field_schema(obj, hint=None):
+    schema = type(obj)
+    if schema is not dict and _declares(schema):
+        return schema
+
+    # Registers the geometry schemas, importing it at module level would be circular
+    import speckle.schemas
+
+    object_type = (obj if schema is dict else obj.__dict__).get('type')
+    resolved = SCHEMAS.resolve(object_type) if isinstance(object_type, str) else None
+    return resolved or hint
+
+
+def coordinate_fields(obj, kind='coordinate_fields'):
+    """Names of the geometry fields of obj
+
+    Arguments:
+        obj {SpeckleObject} -- A Speckle object
+
+    Keyword Arguments:
+        kind {str} -- One of FIELD_KINDS (default: {'coordinate_fields'})
+
+    Returns:
+        tuple -- The field names, empty if the object's type has no registered schema
+    """
+    return getattr(_field_schema(obj), kind, ())
+
+
+def _plan(obj, hint=None):
+    """The (kind, name) geometry fields, nested fields, and normalized and normal fields of obj
+
+    Nested fields are the fields typed as models, or as dicts, other than those of
+    SpeckleObject, paired with their model type: the schema of nested dicts without a type.
+    """
+    schema = type(obj)
+    if schema is dict:
+        key = (schema, obj.get('type'), hint)
+    elif _declares(schema):
+        key = schema
+    else:
+        key = (schema, obj.__dict__.get('type'))
+    plan = _plans.get(key)
+    if plan is None:
+        from speckle.resources.objects import SpeckleObject
+
+        field_schema = _field_schema(obj, hint)
+        fields = tuple((kind, tuple(name.split('.')) if '.' in name else name)
+                       for kind in FIELD_KINDS[:3] for name in getattr(field_schema, kind, ()))
+        nested = {}
+        for model in (schema, field_schema):
+            for name, field in getattr(model, '__fields__', {}).items():
+                field_type = field.type_
+                if name in SpeckleObject.__fields__ or not isinstance(field_type, type):
+                    continue
+                if issubclass(field_type, BaseModel):
+                    nested[name] = field_type
+                elif issubclass(field_type, dict):
+                    nested.setdefault(name, None)
+        # Whether each normalized nested vector is a normal
+        normalized = tuple((name, False) for name in getattr(field_schema, 'normalized_fields', ())) + \
+            tuple((name, True) for name in getattr(field_schema, 'normal_fields', ()))
+        plan = _plans[key] = (fields, tuple(nested.items()), normalized)
+    return plan
+
+
+def _locate(obj, name):
+    """The values holding the field of a slot and the field's name
+
+    Fields of nested values which are not Speckle objects, eg: the domain of a Line or the
+    plane of an Arc parsed as a dict, are named by their path from the object.
+    """
+    if type(name) is not tuple:
+        return obj.__dict__, name
+    container = obj
+    for key in name[:-1]:
+        container = container.__dict__[key] if isinstance(container, BaseModel) else container[key]
+    return (container.__dict__ if isinstance(container, BaseModel) else container), name[-1]
+
+
+def _lookup(values, path):
+    """The value at a path of field names in nested models or dicts, None if there is none"""
+    for key in path:
+        if isinstance(values, BaseModel):
+            values = values.__dict__
+        elif type(values) is not dict:
+            return None
+        values = values.get(key)
+    return values
+
+
+def _to_coordinates(chunks):
+    np = arrays.np
+    if np is not None:
+        chunks = [np.array(c, dtype=np.float64) if isinstance(c, list) else c for c in chunks]
+        return np.concatenate(chunks) if chunks else np.empty(0)
+    coordinates = array.array('d')
+    for chunk in chunks:
+        coordinates.extend(chunk)
+    return coordinates
+
+
+def _collect(objects, groups, strides):
+    """Walk objects and their nested objects once, gathering the fields of each group
+
+    Arguments:
+        objects {list} -- Speckle objects
+        groups {dict} -- Group index of each field kind collected
+        strides {list} -- Stride of each group, values whose length is not a multiple are skipped
+
+    Returns:
+        tuple -- The (coordinates, slots) of each group, and whether the normalized vectors are
+        normals by the id of their values
+    """
+    np = arrays.np
+    ndarray = np.ndarray if np is not None else None
+    float64 = np.float64 if np is not None else None
+    array_types = (ndarray, array.array) if np is not None else (array.array,)
+
+    slots = [[] for _ in strides]
+    chunks = [[] for _ in strides]
+    # Consecutive lists of numbers are converted in one call
+    pending = [[] for _ in strides]
+    sizes = [0 for _ in strides]
+    normalized = {}
+
+    from speckle.resources.objects import SpeckleObject
+
+    # Fields of each schema in this call's groups: (group, stride, name)
+    schema_plans = {}
+    seen = set()
+    # Whether values of each type are Speckle objects (True), other models or dicts (False)
+    nested_kinds = {}
+    # Speckle objects, or (values, Speckle object owning them, path from the owner, schema hint)
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if type(obj) is tuple:
+            obj, owner, path, hint = obj
+        else:
+            owner, path, hint = obj, None, None
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        schema = type(obj)
+        values = obj if schema is dict else obj.__dict__
+
+        plan = schema_plans.get(schema)
+        if plan is None or plan[3]:
+            fields, nested, normalized_fields = _plan(obj, hint)
+            plan = ([(groups[kind], strides[groups[kind]], name) for kind, name in fields if kind in groups],
+                    nested, normalized_fields, schema is dict or not _declares(schema))
+            if not plan[3]:
+                schema_plans[schema] = plan
+        fields, nested, normalized_fields, _ = plan
+
+        for group, stride, name in fields:
+            value = values.get(name) if type(name) is str else _lookup(values, name)
+            value_type = type(value)
+            if value_type is list:
+                length = len(value)
+                if not length or length % stride:
+                    continue
+                if length < _LARGE_LIST or np is None:
+                    if not _NUMBERS.issuperset(map(type, value)):
+                        continue
+                    pending[group].extend(value)
+                else:
+                    # Faster than np.array, and strings, None or nested lists are rejected
+                    try:
+                        value = np.frombuffer(array.array('d', value), dtype=float64)
+                    except (TypeError, OverflowError):
+                        continue
+                    if pending[group]:
+                        chunks[group].append(pending[group])
+                        pending[group] = []
+                    chunks[group].append(value)
+            elif value_type in _NUMBERS:
+                pending[group].append(value)
+                length = 1
+            elif isinstance(value, array_types):
+                length = len(value)
+                if not length or length % stride:
+                    continue
+                if pending[group]:
+                    chunks[group].append(pending[group])
+                    pending[group] = []
+                if value_type is not ndarray or value.dtype != float64:
+                    value = arrays.to_array(value, 'float64', 'd')
+                chunks[group].append(value)
+            else:
+                # Missing, or left unvalidated by `construct`
+                continue
+            if path is not None:
+                name = path + (name if type(name) is tuple else (name,))
+            slots[group].append((owner, name, sizes[group], sizes[group] + length))
+            sizes[group] += length
+
+        for name, model in nested:
+            value = values.get(name)
+            if value is None:
+                continue
+            for index, item in (enumerate(value) if type(value) is list else ((None, value),)):
+                item_type = type(item)
+                kind = nested_kinds.get(item_type)
+                if kind is None:
+                    kind = nested_kinds[item_type] = (
+                        issubclass(item_type, SpeckleObject) if issubclass(item_type, (BaseModel, dict)) else 0)
+                if kind is True:
+                    stack.append(item)
+                elif kind is False:
+                    item_path = (path or ()) + ((name,) if index is None else (name, index))
+                    stack.append((item, owner, item_path, model))
+        for name, normal in normalized_fields:
+            value = values.get(name)
+            if value is not None:
+                normalized[id(value if type(value) is dict else value.__dict__)] = normal
+
+    gathered = []
+    for group in range(len(strides)):
+        if pending[group]:
+            chunks[group].append(pending[group])
+        gathered.append((_to_coordinates(chunks[group]), slots[group]))
+    return gathered, normalized
+
+
+def gather(objects, kinds=('coordinate_fields', 'direction_fields'), stride=1):
+    """Collect the geometry fields of objects, and of their nested objects, in one array
+
+    Arguments:
+        objects {list} -- Speckle objects
+
+    Keyword Arguments:
+        kinds {tuple} -- The kinds of fields to collect, see FIELD_KINDS (default: {('coordinate_fields', 'direction_fields')})
+        stride {int} -- Skip the values whose length is not a multiple of stride, eg: 3 for xyz (default: {1})
+
+    Returns:
+        tuple -- The flat float64 values (ndarray, or array.array without NumPy) and the
+        slots to pass to :func:`scatter`
+    """
+    gathered, _ = _collect(objects, dict.fromkeys(kinds, 0), [stride])
+    return gathered[0]
+
+
+def scatter(coordinates, slots):
+    """Write values collected by :func:`gather` back to their objects
+
+    Float arrays are updated in place, so views such as `Mesh.vertex_points` stay valid,
+    other values are replaced. The hashes of the objects are invalidated.
+
+    Arguments:
+        coordinates {ndarray / array.array} -- The flat values, as many as gathered
+        slots {list} -- The slots returned by :func:`gather`
+    """
+    np = arrays.np
+    ndarray = np.ndarray if np is not None else None
+    float64 = np.float64 if np is not None else None
+    values = None
+    for obj, name, start, stop in slots:
+        if type(name) is str:
+            fields = obj.__dict__
+        else:
+            fields, name = _locate(obj, name)
+        value = fields[name]
+        value_type = type(value)
+        if value_type is list:
+            if stop - start >= _LARGE_LIST:
+                fields[name] = coordinates[start:stop].tolist()
+            else:
+                if values is None:
+                    values = coordinates.tolist()
+                fields[name] = values[start:stop]
+        elif value_type in _NUMBERS:
+            fields[name] = float(coordinates[start])
+        elif value_type is ndarray and value.dtype == float64:
+            value[:] = coordinates[start:stop]
+        elif value_type is array.array and value.typecode == 'd':
+            value[:] = array.array('d', coordinates[start:stop])
+        else:
+            fields[name] = arrays.to_array(coordinates[start:stop], 'float64', 'd')
+        obj.invalidate_hashes()
+
+
+
+def to_arrays(objects):
+    """Store the long plain lists of the geometry fields of objects as float64 arrays, in place
+
+    Objects parsed as plain SpeckleObjects, such as the objects of a downloaded stream, hold
+    lists where geometry schemas hold arrays. Converting them once lets :func:`transform` and
+    :func:`quantize` update them in place instead of converting them back to lists. Lists of
+    less than 1024 values are left alone, as are all lists without NumPy.
+
+    Arguments:
+        objects {list} -- Speckle objects
+
+    Returns:
+        int -- The number of lists converted
+    """
+    if arrays.np is None:
+        return 0
+    gathered, _ = _collect(objects, _TRANSFORM_GROUPS, [3, 3, 1])
+    count = 0
+    for coordinates, slots in gathered:
+        for obj, name, start, stop in slots:
+            if stop - start < _LARGE_LIST:
+                continue
+            fields, name = (obj.__dict__, name) if type(name) is str else _locate(obj, name)
+            if type(fields[name]) is list:
+                fields[name] = coordinates[start:stop].copy()
+                count += 1
+    return count
+
+
+def _affine(matrix):
+    np = arrays.np
+    if np is not None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape != (4, 4):
+            raise ValueError('expected a 4x4 matrix, got shape {}'.format(matrix.shape))
+        return matrix[:3, :3], matrix[:3, 3]
+    rows = [[float(v) for v in row] for row in matrix]
+    if len(rows) != 4 or any(len(row) != 4 for row in rows):
+        raise ValueError('expected a 4x4 matrix')
+    return [row[:3] for row in rows[:3]], [row[3] for row in rows[:3]]
+
+
+def _apply(coordinates, linear, translation=None, normalize=None):
+    """Multiply xyz triples by linear, add translation and normalize the rows flagged"""
+    np = arrays.np
+    if np is not None:
+        factor = linear[0, 0]
+        if (linear == np.diag([factor] * 3)).all():
+            # Uniform scales, eg: unit conversions, are a single product by a scalar
+            points = (coordinates * factor).reshape(-1, 3)
+        else:
+            points = coordinates.reshape(-1, 3) @ linear.T
+        if translation is not None:
+            points += translation
+        if normalize is not None and normalize.any():
+            lengths = np.linalg.norm(points[normalize], axis=1, keepdims=True)
+            points[normalize] /= np.where(lengths > 0, lengths, 1.0)
+        return points.reshape(-1)
+
+    result = array.array('d', bytes(len(coordinates) * 8))
+    (a, b, c), (d, e, f), (g, h, i) = linear
+    tx, ty, tz = translation if translation is not None else (0.0, 0.0, 0.0)
+    for row in range(len(coordinates) // 3):
+        x, y, z = coordinates[row * 3:row * 3 + 3]
+        x, y, z = a * x + b * y + c * z + tx, d * x + e * y + f * z + ty, g * x + h * y + i * z + tz
+        if normalize is not None and normalize[row]:
+            length = (x * x + y * y + z * z) ** 0.5 or 1.0
+            x, y, z = x / length, y / length, z / length
+        result[row * 3:row * 3 + 3] = array.array('d', (x, y, z))
+    return result
+
+
+_TRANSFORM_GROUPS = {'coordinate_fields': 0, 'direction_fields': 1, 'length_fields': 2}
+
+
+def transform(objects, matrix):
+    """Apply an affine transform to objects and their nested objects, in place
+
+    All the coordinates of each kind are gathered, transformed in one pass and scattered
+    back: positions (eg: Mesh vertices) are transformed, vectors (eg: Vector values) only get
+    the linear part of the matrix, normals (eg: Plane normal) get its inverse transpose, so
+    they stay perpendicular under non-uniform scales and shears. The axes and normals of planes
+    are normalized again. Lengths (eg: Arc radius) are multiplied by the mean scale of the
+    matrix, the cube root of its determinant, they are therefore only exact for transforms which
+    scale uniformly.
+
+    The values are processed in a single NumPy call per kind, but the objects are still walked
+    one by one: collections of small objects (points, lines) go about as fast as a Python loop
+    over them, the gain grows with the number of coordinates per object (eg: meshes).
+
+    Arguments:
+        objects {list} -- Speckle objects
+        matrix {array-like} -- 4x4 row-major matrix applied to [x, y, z, 1] column vectors
+
+    Raises:
+        ValueError -- If matrix is not 4x4
+
+    Returns:
+        int -- The number of values transformed
+    """
+    linear, translation = _affine(matrix)
+    gathered, normalized = _collect(objects, _TRANSFORM_GROUPS, [3, 3, 1])
+    (points, point_slots), (directions, direction_slots), (lengths, length_slots) = gathered
+    np = arrays.np
+
+    if len(points):
+        scatter(_apply(points, linear, translation), point_slots)
+
+    if len(directions):
+        rows = len(directions) // 3
+        normalize = [False] * rows
+        normal = [False] * rows
+        for obj, name, start, stop in direction_slots:
+            kind = normalized.get(id(obj.__dict__ if type(name) is str else _locate(obj, name)[0]))
+            if kind is not None:
+                normalize[start // 3:stop // 3] = [True] * ((stop - start) // 3)
+                normal[start // 3:stop // 3] = [kind] * ((stop - start) // 3)
+        if np is not None:
+            normalize = np.array(normalize, dtype=bool)
+        transformed = _apply(directions, linear, normalize=normalize)
+        if any(normal):
+            normals = _apply(directions, _normal_linear(linear), normalize=normalize)
+            if np is not None:
+                normal = np.array(normal, dtype=bool)
+                transformed.reshape(-1, 3)[normal] = normals.reshape(-1, 3)[normal]
+            else:
+                for row in range(rows):
+                    if normal[row]:
+                        transformed[row * 3:row * 3 + 3] = normals[row * 3:row * 3 + 3]
+        scatter(transformed, direction_slots)
+
+    scale = _mean_scale(linear) if len(lengths) else 1.0
+    # Rotations and moves leave lengths unchanged
+    if scale != 1.0:
+        if np is not None:
+            lengths = lengths * scale
+        else:
+            lengths = array.array('d', (v * scale for v in lengths))
+        scatter(lengths, length_slots)
+
+    return len(points) + len(directions) + len(lengths)
+
+
+def _normal_linear(linear):
+    """The inverse transpose of a 3x3 matrix, from its cofactors so singular ones still give directions"""
+    (a, b, c), (d, e, f), (g, h, i) = [[float(v) for v in row] for row in linear]
+    cofactors = [
+        [e * i - f * h, f * g - d * i, d * h - e * g],
+        [c * h - b * i, a * i - c * g, b * g - a * h],
+        [b * f - c * e, c * d - a * f, a * e - b * d],
+    ]
+    determinant = a * cofactors[0][0] + b * cofactors[0][1] + c * cofactors[0][2]
+    if determinant:
+        cofactors = [[v / determinant for v in row] for row in cofactors]
+    np = arrays.np
+    return np.array(cofactors, dtype=np.float64) if np is not None else cofactors
+
+
+def _mean_scale(linear):
+    """Cube root of the absolute determinant of a 3x3 matrix, exact for uniform scales"""
+    (a, b, c), (d, e, f), (g, h, i) = [[float(v) for v in row] for row in linear]
+    determinant = abs(a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g))
+    if not determinant:
+        return 0.0
+    scale = determinant ** (1 / 3)
+    # One Newton step removes the rounding error of the power
+    return scale - (scale ** 3 - determinant) / (3 * scale ** 2)
+
+
+def scale(objects, factor):
+    """Scale objects and their nested objects about the origin, in place
+
+    Eg: `scale(objects, 0.001)` converts millimeters to meters. See :func:`transform`.
+
+    Arguments:
+        objects {list} -- Speckle objects
+        factor {float} -- The scale factor
+
+    Returns:
+        int -- The number of values scaled
+    """
+    return transform(objects, [[factor, 0, 0, 0], [0, factor, 0, 0], [0, 0, factor, 0], [0, 0, 0, 1]])
+
+
+# Length of each unit in meters, as decimal strings so conversion factors are exact, keyed by
+# lowercase name, see :func:`unit_scale`
+UNITS = {
+    'micrometers': '0.000001',
+    'microns': '0.000001',
+    'millimeters': '0.001',
+    'centimeters': '0.01',
+    'decimeters': '0.1',
+    'meters': '1',
+    'kilometers': '1000',
+    'inches': '0.0254',
+    'feet': '0.3048',
+    'yards': '0.9144',
+    'miles': '1609.344',
+}
+
+
+def unit_scale(from_units, to_units):
+    """The factor converting lengths from one unit to another, eg: 1000 from meters to millimeters
+
+    Arguments:
+        from_units {str} -- A unit of UNITS, case insensitive, eg: 'Meters'
+        to_units {str} -- A unit of UNITS, case insensitive
+
+    Raises:
+        ValueError -- If a unit is unknown
+
+    Returns:
+        Decimal -- The exact factor
+    """
+    lengths = []
+    for units in (from_units, to_units):
+        length = UNITS.get(units.lower()) if isinstance(units, str) else None
+        if length is None:
+            raise ValueError('unknown units {!r}, expected one of {}'.format(units, ', '.join(UNITS)))
+        lengths.append(Decimal(length))
+    return lengths[0] / lengths[1]
+
+
+def convert_units(objects, from_units, to_units):
+    """Convert the geometry of objects and of their nested objects to other units, in place
+
+    All the lengths are scaled in one pass, see :func:`scale`: coordinates, arc radii and the
+    domains of lines, which are parametrized by length. Angles (eg: the domain of an arc) and
+    the parameters of curves (knots and domain) are left unchanged.
+
+    Arguments:
+        objects {list} -- Speckle objects
+        from_units {str} -- The current units of the objects, see :func:`unit_scale`
+        to_units {str} -- The units to convert to
+
+    Raises:
+        ValueError -- If a unit is unknown
+
+    Returns:
+        int -- The number of values scaled
+    """
+    factor = unit_scale(from_units, to_units)
+    if factor == 1:
+        return 0
+    return scale(objects, float(factor))
+
+
+def quantize(objects, tolerance):
+    """Snap the coordinates of objects to a grid of `tolerance`, in place
+
+    Snapped values are rounded to the decimals of tolerance, so they are written with as few
+    digits as it allows (eg: 0.1 + 0.2 snapped to 0.001 is written 0.3). Objects whose
+    coordinates only differ by less than half the tolerance end up with the same content hash.
+
+    Arguments:
+        objects {list} -- Speckle objects, see :func:`gather`
+        tolerance {float} -- The grid step, in the units of the coordinates
+
+    Raises:
+        ValueError -- If tolerance is not positive
+
+    Returns:
+        QuantizeReport -- The number of coordinates and their JSON size before and after
+    """
+    if not tolerance or tolerance <= 0:
+        raise ValueError('tolerance must be positive, got {!r}'.format(tolerance))
+
+    coordinates, slots = gather(objects)
+    report = QuantizeReport(objects=len({id(slot[0]) for slot in slots}), values=len(coordinates))
+    if not len(coordinates):
+        return report
+
+    decimals = max(0, -Decimal(repr(float(tolerance))).normalize().as_tuple().exponent)
+    np = arrays.np
+    if np is not None:
+        # Adding 0.0 turns -0.0 into 0.0
+        snapped = np.round(np.round(coordinates / tolerance) * tolerance, decimals) + 0.0
+        report.changed = int(np.count_nonzero(snapped != coordinates))
+    else:
+        snapped = array.array('d', (round(round(v / tolerance) * tolerance, decimals) + 0.0 for v in coordinates))
+        report.changed = sum(a != b for a, b in zip(snapped, coordinates))
+
+    report.bytes_before = len(json_codec.dumps(coordinates))
+    report.bytes_after = len(json_codec.dumps(snapped))
+    scatter(snapped, slots)
+    return report
+
+
+def quantized(objects, tolerance):
+    """Snapped copies of objects, see :func:`quantize`, the objects themselves are left unchanged
+
+    Arguments:
+        objects {list} -- Speckle objects
+        tolerance {float} -- The grid step, in the units of the coordinates
+
+    Raises:
+        ValueError -- If tolerance is not positive
+
+    Returns:
+        tuple -- The snapped copies and the QuantizeReport
+    """
+    copies = copy.deepcopy(objects)
+    return copies, quantize(copies, tolerance)
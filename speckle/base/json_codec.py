@@ -0,0 +1,137 @@
+"""JSON encoding and decoding for every request and response
+
+The fastest installed backend is used, in order of preference `orjson
+<https://github.com/ijl/orjson>`_, `ujson <https://github.com/ultrajson/ultrajson>`_ and the
+standard library :mod:`json`. All backends produce compact UTF-8 encoded JSON.
+
+Hashes must not depend on the backend, so :func:`stable_dumps` always goes through the
+standard library.
+
+Example:
+    Force a given backend, eg: to compare results::
+
+        from speckle.base import json_codec
+
+        json_codec.use_backend('json')
+        body = json_codec.dumps({'type': 'Point', 'value': [0, 0, 0]})
+        obj = json_codec.loads(body)
+
+"""
+
+import json
+from datetime import date, datetime
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+BACKEND = None
+dumps = None
+loads = None
+
+
+def _default(obj):
+    # numpy arrays, array.array and friends
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+
+
+def _json_backend():
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, allow_nan=False, default=_default).encode('utf-8')
+
+    def json_loads(data):
+        return json.loads(data)
+
+    return json_dumps, json_loads
+
+
+def _orjson_backend():
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def orjson_dumps(obj):
+        return orjson.dumps(obj, default=_default, option=option)
+
+    return orjson_dumps, orjson.loads
+
+
+def _ujson_backend():
+    import ujson
+
+    def ujson_dumps(obj):
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=_default).encode('utf-8')
+
+    def ujson_loads(data):
+        return ujson.loads(bytes(data) if isinstance(data, (bytearray, memoryview)) else data)
+
+    return ujson_dumps, ujson_loads
+
+
+_FACTORIES = {
+    'orjson': _orjson_backend,
+    'ujson': _ujson_backend,
+    'json': _json_backend,
+}
+
+
+def available_backends():
+    """List the JSON backends which can be imported
+
+    Returns:
+        list -- Backend names, fastest first
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            _FACTORIES[name]()
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def use_backend(name=None):
+    """Select the JSON backend used by :func:`dumps` and :func:`loads`
+
+    Keyword Arguments:
+        name {str} -- One of BACKENDS, None picks the fastest installed one (default: {None})
+
+    Raises:
+        ImportError -- If the requested backend is not installed
+
+    Returns:
+        str -- The name of the selected backend
+    """
+    global BACKEND, dumps, loads
+
+    names = [name] if name else BACKENDS
+    for n in names:
+        try:
+            dumps, loads = _FACTORIES[n]()
+            BACKEND = n
+            return n
+        except ImportError:
+            if name:
+                raise
+    raise ImportError('No JSON backend available')
+
+
+def stable_dumps(obj, sort_keys=False):
+    """Encode with the standard library whatever the backend, for hashing
+
+    Arguments:
+        obj {object} -- The value to encode
+
+    Keyword Arguments:
+        sort_keys {bool} -- Sort dictionary keys (default: {False})
+
+    Returns:
+        bytes -- The UTF-8 encoded JSON
+    """
+    return json.dumps(obj, sort_keys=sort_keys, default=_default).encode('utf-8')
+
+
+use_backend()
@@ -1,13 +1,108 @@
 import json
+from collections import Counter
 from requests import Request
-from pydantic import BaseModel
+from copy import deepcopy
+from pydantic import BaseModel, Extra
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
 from pydoc import locate
 from typing import List, Optional
 import dataclasses
 from dataclasses import dataclass
 from datetime import datetime
+from speckle.base import json_codec, streaming
+from speckle.base.arrays import PREFIX, NumberArray, decode_arrays, encode_array, is_array, may_hold_arrays
 
-SCHEMAS = {}
+class SchemaRegistry(dict):
+    """Registry of the schemas used to parse objects, keyed by type name
+
+    Full type strings such as 'Brep/Mesh' are resolved by looking up their pieces from the
+    most specific one (the last) to the least specific one. Resolutions are memoized per full
+    type string and the memo is cleared whenever the registry changes.
+
+    Example:
+        Register a custom schema and inspect the types which had no schema::
+
+            from speckle.base.resource import SCHEMAS
+
+            SCHEMAS.register('Wall', WallSchema)
+            SCHEMAS.resolve('Brep/Wall') # WallSchema
+
+            SCHEMAS.unknown_types.most_common(10)
+
+    Attributes:
+        unknown_types {Counter} -- How many objects of each type string could not be resolved
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolved = {}
+        self.unknown_types = Counter()
+
+    def register(self, name, schema):
+        """Register a schema for a type name, replacing any previous one
+
+        Arguments:
+            name {str} -- A type name, eg: 'Mesh'
+            schema {BaseModel} -- The schema class objects of that type are parsed with
+
+        Returns:
+            BaseModel -- The registered schema
+        """
+        self[name] = schema
+        return schema
+
+    def resolve(self, type_string):
+        """Find the schema for a full type string
+
+        Arguments:
+            type_string {str} -- An object type, eg: 'Brep/Mesh'
+
+        Returns:
+            BaseModel -- The schema of the most specific known type, None if no type is known
+        """
+        try:
+            schema = self._resolved[type_string]
+        except KeyError:
+            schema = None
+            for t in reversed(type_string.split('/')):
+                if t in self:
+                    schema = self[t]
+                    break
+            self._resolved[type_string] = schema
+        if schema is None:
+            self.unknown_types[type_string] += 1
+        return schema
+
+    def _invalidate(self):
+        self._resolved.clear()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._invalidate()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+SCHEMAS = SchemaRegistry()
 
 class ResourceBaseSchema(BaseModel):
     id: Optional[str]
@@ -47,6 +142,80 @@ class Comment(BaseModel):
         fields = {'id': '_id'}
 
 
+def _construct_plan(schema):
+    plan = _construct_plans.get(schema)
+    if plan is None:
+        plan = []
+        for name, field in schema.__fields__.items():
+            model = field.type_ if isinstance(field.type_, type) and issubclass(field.type_, (BaseModel, NumberArray)) else None
+            plan.append((name, field.alias, model, field.shape, field.default))
+        aliases = {field.alias for field in schema.__fields__.values()}
+        plan = _construct_plans[schema] = (plan, aliases, schema.__config__.extra == Extra.allow)
+    return plan
+
+_construct_plans = {}
+
+def construct(schema, data):
+    """Build a schema instance from trusted data without validating it
+
+    Aliases, defaults, extra fields and nested models (single or in lists) are handled like
+    :meth:`BaseModel.parse_obj` does, but values are neither checked nor coerced, eg: a string
+    given for a list field is kept as is. Lists of numbers are still stored as arrays in the
+    fields typed with :mod:`speckle.base.arrays`. Use :func:`validate` to check the result on demand.
+
+    Arguments:
+        schema {BaseModel} -- The schema class to instantiate
+        data {dict} -- The (trusted) decoded JSON data
+
+    Returns:
+        BaseModel -- An instance of schema
+    """
+    plan, aliases, allow_extra = _construct_plan(schema)
+    values = {}
+    fields_set = set()
+    for name, alias, model, shape, default in plan:
+        if alias in data:
+            value = data[alias]
+            if model is not None and value is not None:
+                if issubclass(model, NumberArray):
+                    if isinstance(value, (list, str)):
+                        try:
+                            value = model.validate(value)
+                        except (TypeError, ValueError):
+                            pass
+                elif shape == SHAPE_SINGLETON and isinstance(value, dict):
+                    value = construct(model, value)
+                elif shape == SHAPE_LIST and isinstance(value, list):
+                    value = [construct(model, v) if isinstance(v, dict) else v for v in value]
+            values[name] = value
+            fields_set.add(name)
+        else:
+            values[name] = deepcopy(default)
+    if allow_extra:
+        for k, v in data.items():
+            if k not in aliases:
+                values[k] = v
+                fields_set.add(k)
+
+    instance = schema.__new__(schema)
+    object.__setattr__(instance, '__dict__', values)
+    object.__setattr__(instance, '__fields_set__', fields_set)
+    return instance
+
+def validate(instance):
+    """Validate a schema instance built with :func:`construct`
+
+    Arguments:
+        instance {BaseModel} -- The instance to validate
+
+    Raises:
+        ValidationError -- If the instance does not match its schema
+
+    Returns:
+        BaseModel -- A validated copy of the instance
+    """
+    return type(instance).parse_obj(instance.dict(by_alias=True))
+
 def clean_empty(d):
     if not isinstance(d, (dict, list)):
         return d
@@ -54,10 +223,96 @@ def clean_empty(d):
         return [v for v in (clean_empty(v) for v in d) if v is not None]
     return {k: v for k, v in ((k, clean_empty(v)) for k, v in d.items()) if v is not None}
 
+def to_plain(value):
+    """Convert the models nested in a value to dicts, like `BaseModel.dict` does for field values"""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, set, tuple)):
+        return value.__class__(to_plain(v) for v in value)
+    return value
+
+_PRIMITIVES = frozenset((int, float, str, bool))
+
+def serialize(value, binary_arrays=None):
+    """Convert a schema instance to JSON ready values in a single pass
+
+    The result is the same as `clean_empty(instance.dict(by_alias=True))`: aliases are applied,
+    None values are dropped from dicts and lists, and the hashes of Speckle objects are
+    computed. But the object tree is only walked (and copied) once.
+
+    Arguments:
+        value {BaseModel} -- The instance (or any value holding instances) to convert
+
+    Keyword Arguments:
+        binary_arrays {str} -- Encode the array fields as base64 'float64' or 'float32' blocks,
+        see :func:`speckle.base.arrays.encode_array` (default: {None})
+
+    Returns:
+        dict -- The JSON ready representation of value
+    """
+    if isinstance(value, BaseModel):
+        update_hashes = getattr(value, 'update_hashes', None)
+        if update_hashes is not None:
+            update_hashes()
+        fields = value.__fields__
+        result = {}
+        for k, v in value.__dict__.items():
+            if binary_arrays and is_array(v):
+                v = encode_array(v, binary_arrays)
+            else:
+                v = serialize(v, binary_arrays)
+            if v is not None:
+                field = fields.get(k)
+                result[field.alias if field is not None else k] = v
+        return result
+    if isinstance(value, dict):
+        result = {}
+        for k, v in value.items():
+            v = serialize(v, binary_arrays)
+            if v is not None:
+                result[k] = v
+        return result
+    if isinstance(value, list):
+        if _PRIMITIVES.issuperset(map(type, value)):
+            # Fast path for coordinate and index arrays
+            return list(value)
+        return [v for v in (serialize(v, binary_arrays) for v in value) if v is not None]
+    if isinstance(value, (set, tuple)):
+        # clean_empty leaves those untouched
+        return to_plain(value)
+    return value
+
+def serialize_json(value, binary_arrays=None):
+    """Encode a schema instance as JSON, see :func:`serialize`
+
+    Arguments:
+        value {BaseModel} -- The instance to encode
+
+    Keyword Arguments:
+        binary_arrays {str} -- Encode the array fields as base64 blocks, see :func:`serialize` (default: {None})
+
+    Returns:
+        bytes -- The encoded JSON
+    """
+    return json_codec.dumps(serialize(value, binary_arrays))
+
+def _watch_arrays(chunks, found):
+    """Pass chunks through, setting found[0] once the prefix of an encoded array went by"""
+    tail = b''
+    for chunk in chunks:
+        if not found[0] and (may_hold_arrays(chunk) or may_hold_arrays(tail + chunk[:len(PREFIX) - 1])):
+            found[0] = True
+        tail = (tail + chunk[1 - len(PREFIX):])[1 - len(PREFIX):]
+        yield chunk
+
+
 class ResourceBase(object):
 
     def __init__(self, session, basepath, me, name, methods):
         self.s = session
+        self.basepath = basepath
         self._path = basepath + '/' + name
         self.me = me
         self._comment_path = basepath + '/comments/' + name
@@ -94,73 +349,175 @@ class ResourceBase(object):
         self.schema = None
         self.comment_schema = Comment
 
-    def _prep_request(self, method, path, comment, data, params):
-        assert method in self.methods, 'method {} not supported for {} calls'.format(method, self.name)
+        # Build response instances without validation, see `construct`
+        self.trusted = False
+
+        # Optional SpeckleCache serving reads, for the resources supporting it
+        self.cache = None
+
+        # Send array fields as base64 'float64' or 'float32' blocks, see `serialize`
+        self.binary_arrays = None
 
+        # Snap coordinates to the stream tolerance on upload, for the resources supporting it
+        self.quantize = False
+
+    def _prep_data(self, data, comment=False):
+        """Validate outgoing data against the resource (or comment) schema
+
+        Arguments:
+            data {dict / list / Schema} -- The data to send
+            comment {bool} -- Whether or not the data is a comment
+
+        Returns:
+            dict / list -- The data as JSON serializable values, with empty fields removed
+        """
+        binary_arrays = self.binary_arrays
         if comment:
-            url = self._comment_path + path
             if data:
                 dataclass_instance = self.comment_schema.parse_obj(data)
-                data = clean_empty(dataclass_instance.dict(by_alias=True))
-        else:
-            url = self._path + path
-            if data:
-                if isinstance(data, list):
-                    data_list = []
-                    if self.schema:
-                        for d in data:
-                            if isinstance(d, dict):
-                                dataclass_instance = self.schema.parse_obj(d)
-                                data_list.append(clean_empty(dataclass_instance.dict(by_alias=True)))
-                            elif isinstance(d, str):
-                                data_list.append(d)
-                        data = data_list
-                elif self.schema:
-                    if isinstance(data, dict):
-                        dataclass_instance = self.schema.parse_obj(data)
-                    else:
-                        dataclass_instance = data
-                    data = clean_empty(dataclass_instance.dict(by_alias=True))
-        return self.s.prepare_request(Request(self.method_dict[method]['method'], url, json=data, params=params))
-
-    def _parse_response(self, response, comment=False, schema=None):
+                data = serialize(dataclass_instance, binary_arrays)
+        elif data:
+            if isinstance(data, list):
+                data_list = []
+                if self.schema:
+                    for d in data:
+                        if isinstance(d, dict):
+                            dataclass_instance = self.schema.parse_obj(d)
+                            data_list.append(serialize(dataclass_instance, binary_arrays))
+                        elif isinstance(d, BaseModel):
+                            data_list.append(serialize(d, binary_arrays))
+                        elif isinstance(d, str):
+                            data_list.append(d)
+                    data = data_list
+            elif self.schema:
+                if isinstance(data, dict):
+                    dataclass_instance = self.schema.parse_obj(data)
+                else:
+                    dataclass_instance = data
+                data = serialize(dataclass_instance, binary_arrays)
+        return data
+
+    def _prep_request(self, method, path, comment, data, params):
+        assert method in self.methods, 'method {} not supported for {} calls'.format(method, self.name)
+
+        url = (self._comment_path if comment else self._path) + path
+        if not isinstance(data, bytes):
+            # Bytes are already encoded by the caller, eg: a batch of objects
+            data = self._prep_data(data, comment)
+            if data is not None:
+                data = json_codec.dumps(data)
+
+        headers = {'Content-Type': 'application/json'} if data is not None else None
+        return self.s.prepare_request(Request(self.method_dict[method]['method'], url, data=data, params=params, headers=headers))
+
+    def _build(self, schema, response, trusted=None):
+        if self.trusted if trusted is None else trusted:
+            return construct(schema, response)
+        return schema.parse_obj(response)
+
+    def _parse_response(self, response, comment=False, schema=None, trusted=None, encoded=True):
         """Parse the request response
 
         Arguments:
             response {Response} -- A response from the server
             comment {bool} -- Whether or not the response is a comment
             schema {Schema} -- Optional schema to parse the response with
+            trusted {bool} -- Skip validation, defaults to the resource's `trusted` attribute
+            encoded {bool} -- Whether the response may hold encoded arrays, see :func:`~speckle.base.arrays.may_hold_arrays`
 
         Returns:
             Schema / dict -- An object derived from SpeckleObject if possible, otherwise 
             a dict of the response resource
         """
+        if encoded and type(response) is dict:
+            # Arrays sent as base64 blocks, see `serialize`
+            decode_arrays(response)
         if schema:
             # If a schema is defined, then try to parse it with that
-            return schema.parse_obj(response)
+            return self._build(schema, response, trusted)
         elif comment:
-            return self.comment_schema.parse_obj(response)
+            return self._build(self.comment_schema, response, trusted)
         elif 'type' in response:
             # Otherwise, check if the incoming type is within the dict of loaded schemas
-            types = response['type'].split('/')
-            for t in reversed(types):
-                if t in SCHEMAS:
-                    return SCHEMAS[t].parse_obj(response)
+            type_schema = SCHEMAS.resolve(response['type'])
+            if type_schema:
+                return self._build(type_schema, response, trusted)
         if self.schema:
-            return self.schema.parse_obj(response)
+            return self._build(self.schema, response, trusted)
         return response
 
 
-    def make_request(self, method, path, data=None, comment=False, schema=None, params=None):
-        r = self._prep_request(method, path, comment, data, params)
-        resp = self.s.send(r)
-        resp.raise_for_status()
-        response_payload = resp.json()
+    def _parse_payload(self, response_payload, comment=False, schema=None, trusted=None, encoded=True):
+        """Parse a decoded response payload into resources
+
+        Arguments:
+            response_payload {dict} -- The decoded JSON body returned by the server
+            comment {bool} -- Whether or not the payload holds comments
+            schema {Schema} -- Optional schema to parse the resources with
+            trusted {bool} -- Skip validation, defaults to the resource's `trusted` attribute
+            encoded {bool} -- Whether the payload may hold encoded arrays
+
+        Returns:
+            list / Schema / dict -- The parsed resource(s), or the raw payload if it holds none
+        """
         assert response_payload['success'] == True, json.dumps(response_payload)
 
         if 'resources' in response_payload:
-            return [self._parse_response(resource, comment, schema) for resource in response_payload['resources']]
+            return [self._parse_response(resource, comment, schema, trusted, encoded) for resource in response_payload['resources']]
         elif 'resource' in response_payload:
-            return self._parse_response(response_payload['resource'], comment, schema)
+            return self._parse_response(response_payload['resource'], comment, schema, trusted, encoded)
         else:
-            return response_payload # Not sure what to do in this scenario or when it might occur
\ No newline at end of file
+            return response_payload # Not sure what to do in this scenario or when it might occur
+
+
+    def _iter_payload(self, resp, comment=False, schema=None, trusted=None):
+        """Parse a streamed response, yielding resources as soon as they are downloaded
+
+        Arguments:
+            resp {Response} -- A response sent with stream=True
+            comment {bool} -- Whether or not the payload holds comments
+            schema {Schema} -- Optional schema to parse the resources with
+            trusted {bool} -- Skip validation, defaults to the resource's `trusted` attribute
+
+        Yields:
+            Schema / dict -- The parsed resources
+        """
+        meta = {}
+        # Set once the prefix of an encoded array has been downloaded
+        encoded = [False]
+        try:
+            chunks = _watch_arrays(resp.iter_content(streaming.CHUNK_SIZE), encoded)
+            for resource in streaming.iter_resources(chunks, meta=meta):
+                assert meta.get('success', True) == True, json.dumps(meta)
+                yield self._parse_response(resource, comment, schema, trusted, encoded[0])
+        finally:
+            resp.close()
+
+        assert meta.get('success') == True, json.dumps(meta)
+        if 'resource' in meta:
+            yield self._parse_response(meta['resource'], comment, schema, trusted, encoded[0])
+
+    def _request_payload(self, method, path, data=None, comment=False, params=None):
+        """Send a request and return the decoded response payload without parsing it
+
+        Raises:
+            AssertionError -- If the server did not report a success
+
+        Returns:
+            dict -- The decoded JSON body returned by the server
+        """
+        r = self._prep_request(method, path, comment, data, params)
+        resp = self.s.send(r)
+        resp.raise_for_status()
+        response_payload = json_codec.loads(resp.content)
+        assert response_payload['success'] == True, json.dumps(response_payload)
+        return response_payload
+
+    def make_request(self, method, path, data=None, comment=False, schema=None, params=None, stream=False, trusted=None):
+        r = self._prep_request(method, path, comment, data, params)
+        resp = self.s.send(r, stream=stream)
+        resp.raise_for_status()
+        if stream:
+            return self._iter_payload(resp, comment, schema, trusted)
+        content = resp.content
+        return self._parse_payload(json_codec.loads(content), comment, schema, trusted, may_hold_arrays(content))
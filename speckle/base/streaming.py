@@ -0,0 +1,204 @@
+"""Incremental parsing of Speckle server payloads
+
+The server wraps lists of resources as ``{"success": true, "message": "...", "resources": [...]}``.
+:func:`iter_resources` reads such a payload chunk by chunk and yields each element of the
+resources array as soon as it is complete, so the whole body never has to be held in memory
+as raw bytes and decoded objects at the same time.
+
+Example:
+    Stream the objects of a large stream::
+
+        resp = session.get(url, stream=True)
+        meta = {}
+        for resource in iter_resources(resp.iter_content(CHUNK_SIZE), meta=meta):
+            print(resource['_id'])
+
+        assert meta['success']
+
+"""
+
+import re
+from speckle.base import json_codec
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = b' \t\r\n'
+_STRUCTURE = re.compile(rb'[\[\]{}"]')
+_STRING_END = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+_QUOTE, _BACKSLASH = ord('"'), ord('\\')
+_OPENING, _CLOSING = b'[{', b']}'
+
+# Parser states
+_START, _KEY, _COLON, _VALUE, _AFTER_VALUE, _FIRST_ELEMENT, _ELEMENT, _AFTER_ELEMENT, _END = range(9)
+
+
+class _ValueScanner(object):
+    """Finds the end of a JSON value which may be split over several chunks
+
+    The scanner only looks at quotes, escapes and brackets, and keeps its state between
+    calls so a value spanning many chunks is never scanned twice.
+    """
+
+    def __init__(self):
+        self.reset(0)
+
+    def reset(self, start):
+        self.start = start
+        self.pos = start
+        self.depth = 0
+        self.in_string = False
+        self.kind = None
+
+    def rebase(self, offset):
+        self.start -= offset
+        self.pos -= offset
+
+    def scan(self, buf, final=False):
+        """Return the index right after the value starting at self.start, None if incomplete"""
+        if self.kind is None:
+            first = buf[self.start]
+            if first == _QUOTE:
+                self.kind = 'string'
+                self.in_string = True
+                self.pos = self.start + 1
+            elif first in _OPENING:
+                self.kind = 'container'
+            else:
+                self.kind = 'scalar'
+
+        if self.kind == 'scalar':
+            m = _SCALAR_END.search(buf, self.pos)
+            if m:
+                return m.start()
+            self.pos = len(buf)
+            return len(buf) if final else None
+
+        while True:
+            if self.in_string:
+                m = _STRING_END.search(buf, self.pos)
+                if m is None:
+                    self.pos = len(buf)
+                    return None
+                if buf[m.start()] == _BACKSLASH:
+                    if m.start() + 1 >= len(buf):
+                        self.pos = m.start()
+                        return None
+                    self.pos = m.start() + 2
+                    continue
+                self.in_string = False
+                self.pos = m.end()
+                if self.depth == 0:
+                    return self.pos
+                continue
+
+            m = _STRUCTURE.search(buf, self.pos)
+            if m is None:
+                self.pos = len(buf)
+                return None
+            c = buf[m.start()]
+            self.pos = m.end()
+            if c == _QUOTE:
+                self.in_string = True
+            elif c in _OPENING:
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.pos
+
+
+def iter_resources(chunks, key='resources', meta=None):
+    """Yield the elements of a payload's array as soon as each one is complete
+
+    Arguments:
+        chunks {iterable} -- The payload as an iterable of bytes chunks
+
+    Keyword Arguments:
+        key {str} -- The top level key holding the array to stream (default: {'resources'})
+        meta {dict} -- Filled with every other top level key of the payload (default: {None})
+
+    Raises:
+        ValueError -- If the payload is not a well formed JSON object
+
+    Yields:
+        dict -- The decoded elements of payload[key]
+    """
+    if meta is None:
+        meta = {}
+
+    chunks = iter(chunks)
+    buf = bytearray()
+    pos = 0
+    final = False
+    stuck = False
+    state = _START
+    current_key = None
+    scanner = _ValueScanner()
+
+    while state != _END:
+        if stuck or pos >= len(buf):
+            if final:
+                raise ValueError('Truncated JSON payload')
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+            else:
+                del buf[:pos]
+                scanner.rebase(pos)
+                pos = 0
+                buf += chunk
+            stuck = False
+            continue
+
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            continue
+        c = buf[pos]
+
+        if state in (_KEY, _VALUE, _ELEMENT) or (state == _FIRST_ELEMENT and c != _CLOSING[0]):
+            if state == _VALUE and current_key == key and c == _OPENING[0]:
+                pos += 1
+                state = _FIRST_ELEMENT
+                continue
+            if state == _KEY and c == _CLOSING[1]:
+                pos += 1
+                state = _END
+                continue
+            if scanner.kind is None:
+                scanner.reset(pos)
+            end = scanner.scan(buf, final)
+            if end is None:
+                stuck = True
+                continue
+            value = json_codec.loads(buf[pos:end])
+            scanner.reset(end)
+            pos = end
+            if state == _KEY:
+                current_key = value
+                state = _COLON
+            elif state == _VALUE:
+                meta[current_key] = value
+                state = _AFTER_VALUE
+            else:
+                yield value
+                state = _AFTER_ELEMENT
+        elif state == _START and c == ord('{'):
+            pos += 1
+            state = _KEY
+        elif state == _COLON and c == ord(':'):
+            pos += 1
+            state = _VALUE
+        elif state == _AFTER_VALUE and c in b',}':
+            pos += 1
+            state = _KEY if c == ord(',') else _END
+        elif state == _AFTER_ELEMENT and c == ord(','):
+            pos += 1
+            state = _ELEMENT
+        elif state in (_FIRST_ELEMENT, _AFTER_ELEMENT) and c == _CLOSING[0]:
+            pos += 1
+            state = _AFTER_VALUE
+        else:
+            raise ValueError('Unexpected {!r} at offset {} of JSON payload'.format(chr(c), pos))
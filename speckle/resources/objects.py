@@ -1,9 +1,12 @@
 import json
+import time
 import hashlib
 from speckle.base.resource import ResourceBase
 from pydantic import BaseModel, validator
-from typing import List, Optional
-from speckle.base.resource import ResourceBase, ResourceBaseSchema
+from typing import ClassVar, List, Optional, Tuple
+from speckle.base.resource import ResourceBase, ResourceBaseSchema, serialize, to_plain
+from speckle.base import batch, geometry, json_codec
+from speckle.base.arrays import is_array
 
 NAME = 'objects'
 METHODS = ['list', 'get', 'update', 'create',
@@ -11,6 +14,98 @@ METHODS = ['list', 'get', 'update', 'create',
            'get_bulk', 'set_properties']
 
 
+class HashStats(object):
+    """Counters measuring how much time goes into hashing objects
+
+    Attributes:
+        computed {int} -- Number of hashes actually computed
+        reused {int} -- Number of hashes served from an object's cache
+        seconds {float} -- Time spent computing hashes
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.computed = 0
+        self.reused = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return 'HashStats(computed={}, reused={}, seconds={:.6f})'.format(self.computed, self.reused, self.seconds)
+
+geometry_hash_stats = HashStats()
+content_hash_stats = HashStats()
+
+# Fields set by the server, they are not part of an object's content
+HASH_EXCLUDE = frozenset(('id', 'hash', 'geometryHash', 'owner', 'private', 'canRead', 'canWrite',
+                          'anonymousComments', 'comments', 'createdAt', 'updatedAt'))
+
+def _integral_floats(value):
+    """Copy of a JSON ready value with integral floats as integers, so 2 and 2.0 hash the same
+
+    Floats from 1e16 on are kept, JSON writes them with an exponent.
+    """
+    value_type = type(value)
+    if value_type is float:
+        return int(value) if value.is_integer() and -1e16 < value < 1e16 else value
+    if value_type is dict:
+        return {k: _integral_floats(v) for k, v in value.items()}
+    if value_type is list or value_type is tuple:
+        return [_integral_floats(v) for v in value]
+    if is_array(value):
+        return _integral_floats(value.tolist())
+    return value
+
+
+class TrackedDict(dict):
+    """dict telling the SpeckleObject owning it when its content changes
+
+    Only top level changes are tracked, call `SpeckleObject.invalidate_hashes` after mutating
+    nested values in place.
+    """
+    __slots__ = ('owner',)
+
+    def __init__(self, data, owner):
+        super().__init__(data)
+        self.owner = owner
+
+    def __reduce__(self):
+        # Copies and pickles are plain dicts, they are not owned by anyone
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.owner.invalidate_hashes()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.owner.invalidate_hashes()
+
+    def clear(self):
+        super().clear()
+        self.owner.invalidate_hashes()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.owner.invalidate_hashes()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.owner.invalidate_hashes()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self.owner.invalidate_hashes()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.owner.invalidate_hashes()
+
+
 class SpeckleObject(ResourceBaseSchema):
     type: Optional[str]
     name: Optional[str] # Name is often null
@@ -23,24 +118,171 @@ class SpeckleObject(ResourceBaseSchema):
     children: Optional[List[str]]
     ancestors: Optional[List[str]]
 
-    
-    def dict(self, include=None, exclude=None, by_alias=True, exclude_unset=False, exclude_defaults=False, exclude_none=False):
-        json_string = json.dumps(super(SpeckleObject, self).dict()['properties'])
+    # Geometry fields, see speckle.base.geometry.FIELD_KINDS
+    coordinate_fields: ClassVar[Tuple[str, ...]] = ()
+    direction_fields: ClassVar[Tuple[str, ...]] = ()
+    length_fields: ClassVar[Tuple[str, ...]] = ()
+    normalized_fields: ClassVar[Tuple[str, ...]] = ()
+    normal_fields: ClassVar[Tuple[str, ...]] = ()
+
+    # Cached hashes, kept out of the model fields
+    __slots__ = ('_geometry_hash', '_hash')
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._track_properties()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == 'properties':
+            self._track_properties()
+        elif name not in ('hash', 'geometryHash'):
+            object.__setattr__(self, '_hash', None)
+
+    def _track_properties(self):
+        properties = self.__dict__.get('properties')
+        if isinstance(properties, dict) and not (type(properties) is TrackedDict and properties.owner is self):
+            self.__dict__['properties'] = TrackedDict(properties, self)
+        self.invalidate_hashes()
+
+    def invalidate_hashes(self):
+        """Forget the cached hashes of the object
+
+        Changes to the object's fields and to the top level of its properties are detected
+        automatically, this is only needed after mutating nested values in place, eg:
+        `obj.properties['layer']['name'] = 'Walls'` or `mesh.vertices[0] = 1.0`.
+        """
+        object.__setattr__(self, '_geometry_hash', None)
+        object.__setattr__(self, '_hash', None)
+
+    def update_geometry_hash(self):
+        """Compute the geometryHash of the object from its properties
+
+        The hash is cached until the properties change, see `geometry_hash_stats` for the
+        number of hashes computed and the time it took.
+        """
+        geometry_hash = getattr(self, '_geometry_hash', None)
+        if geometry_hash is None or type(self.__dict__.get('properties')) is dict:
+            # Objects built with `construct` only start tracking their properties now
+            self._track_properties()
+
+            start = time.perf_counter()
+            json_string = json_codec.stable_dumps(to_plain(self.properties))
+            geometry_hash = hashlib.md5(json_string).hexdigest()
+            object.__setattr__(self, '_geometry_hash', geometry_hash)
+
+            geometry_hash_stats.computed += 1
+            geometry_hash_stats.seconds += time.perf_counter() - start
+        else:
+            geometry_hash_stats.reused += 1
 
-        self.geometryHash = hashlib.md5(json_string.encode('utf-8')).hexdigest()
+        self.geometryHash = geometry_hash
 
-        #self.hash = hashlib.md5('{}.{}'.format(self.type, json_string).encode('utf-8')).hexdigest()
+    def _nested_objects(self):
+        """The Speckle objects held by the fields of this object, eg: the plane of an Arc"""
+        for name in _nested_fields(type(self)):
+            value = self.__dict__.get(name)
+            if isinstance(value, SpeckleObject):
+                yield value
+            elif isinstance(value, list):
+                for v in value:
+                    if isinstance(v, SpeckleObject):
+                        yield v
 
-        return super(SpeckleObject, self).dict(include=include, by_alias=True, exclude=exclude)
+    def update_hash(self):
+        """Compute the content hash of the object
+
+        The hash is the MD5 of the object's canonical JSON: sorted keys, integral floats written
+        as integers, None values and server managed fields (HASH_EXCLUDE) left out, and nested
+        Speckle objects replaced by their own content hash. Identical objects therefore get the same hash on any machine.
+        The hash is cached until the object or one of its nested objects changes, see
+        `content_hash_stats` for the number of hashes computed and the time it took.
+
+        Returns:
+            str -- The content hash, also stored in `hash`
+        """
+        nested = {id(o): o.update_hash() for o in self._nested_objects()}
+        # Other nested models, eg: the domain of an Arc, do not cache a hash, compare their values
+        models = tuple(serialize(self.__dict__.get(name)) for name in _nested_fields(type(self), models=True))
+        cached = getattr(self, '_hash', None)
+
+        if cached is not None and cached[1] == tuple(nested.values()) and cached[2] == models:
+            content_hash = cached[0]
+            content_hash_stats.reused += 1
+        else:
+            start = time.perf_counter()
+            canonical = {}
+            for k, v in self.__dict__.items():
+                if k in HASH_EXCLUDE or v is None:
+                    continue
+                if id(v) in nested:
+                    v = nested[id(v)]
+                elif isinstance(v, list) and nested and any(id(o) in nested for o in v):
+                    v = [nested.get(id(o)) or serialize(o) for o in v]
+                else:
+                    v = serialize(v)
+                canonical[k] = v
+            content_hash = hashlib.md5(json_codec.stable_dumps(_integral_floats(canonical), sort_keys=True)).hexdigest()
+            object.__setattr__(self, '_hash', (content_hash, tuple(nested.values()), models))
+
+            content_hash_stats.computed += 1
+            content_hash_stats.seconds += time.perf_counter() - start
+
+        self.hash = content_hash
+        return content_hash
+
+    def update_hashes(self):
+        """Compute both the geometryHash and the content hash of the object"""
+        self.update_geometry_hash()
+        self.update_hash()
+
+    def dict(self, include=None, exclude=None, by_alias=True, exclude_unset=False, exclude_defaults=False, exclude_none=False):
+        self.update_hashes()
+
+        result = super(SpeckleObject, self).dict(include=include, by_alias=True, exclude=exclude)
+        for k, v in result.items():
+            if is_array(v):
+                result[k] = v.tolist()
+        return result
     
     class Config():
         extra = 'allow'
 
+
+_nested_field_names = {}
+
+
+def _nested_fields(schema, models=False):
+    """Names of the fields of schema typed as Speckle objects, memoized per schema
+
+    Keyword Arguments:
+        models {bool} -- Names of the fields typed as other models instead (default: {False})
+    """
+    names = _nested_field_names.get((schema, models))
+    if names is None:
+        names = _nested_field_names[schema, models] = tuple(
+            name for name, field in schema.__fields__.items()
+            if isinstance(field.type_, type) and issubclass(field.type_, BaseModel)
+            and issubclass(field.type_, SpeckleObject) != models)
+    return names
+
+
+def _in_order(ids, objects):
+    """The objects returned for ids, in the order of ids"""
+    by_id = {}
+    for o in objects:
+        by_id[o.id if isinstance(o, BaseModel) else o.get('_id')] = o
+    return [by_id[i] for i in ids if i in by_id]
+
+
 class Resource(ResourceBase):
     """API Access class for Speckle Objects
 
     """
-    
+
+    # Stay under the server's default REQ_SIZE limit (10mb)
+    MAX_REQUEST_BYTES = 9 * 1024 * 1024
+
     def __init__(self, session, basepath, me):
         super().__init__(session, basepath, me, NAME, METHODS)
 
@@ -75,8 +317,113 @@ class Resource(ResourceBase):
         """
         return self.make_request('create', '/', data)
 
+    def create_batched(self, data, max_bytes=None, max_workers=4, retries=2, dedupe=True, cache=None, tolerance=None):
+        """Create a large list of Speckle objects in size-bounded batches
+
+        Every object is encoded once, then objects are grouped into request bodies that stay
+        under `max_bytes` and the batches are uploaded concurrently. A batch that fails is
+        retried on its own, if some still fail a :class:`~speckle.base.batch.ShardError` is
+        raised holding the ids of the batches that went through.
+
+        Objects with the same content hash (see :meth:`SpeckleObject.update_hash`) are only
+        sent once, their duplicates get the id of the created object. With a `cache`, objects
+        recorded as already sent to this server are not sent again, and the created objects
+        are recorded.
+
+        With a `tolerance`, the coordinates of copies of the objects are snapped to it before
+        they are hashed (see :func:`speckle.base.geometry.quantize`), so objects which only
+        differ by noise are deduped. Pass the tolerance of the stream the objects belong to.
+
+        Arguments:
+            data {list} -- A list of dictionaries or SpeckleObjects
+
+        Keyword Arguments:
+            max_bytes {int} -- Maximum request body size, defaults to MAX_REQUEST_BYTES (default: {None})
+            max_workers {int} -- Number of batches uploaded at once (default: {4})
+            retries {int} -- How many extra attempts a failing batch gets (default: {2})
+            dedupe {bool} -- Send objects with identical content only once (default: {True})
+            cache {SpeckleCache} -- Cache recording the objects sent to the server, defaults to the resource's cache (default: {None})
+            tolerance {float} -- Snap coordinates to this grid step before hashing (default: {None})
+
+        Returns:
+            list -- The ids of the created objects, in the order of `data`
+        """
+        shards, body, finish = self._prep_batches(data, max_bytes, dedupe, cache or self.cache, tolerance)
+
+        def create_shard(start, stop):
+            return [o.id for o in self.make_request('create', '/', body(start, stop))]
+
+        try:
+            shard_ids = batch.run_shards(create_shard, shards, max_workers, retries)
+        except batch.ShardError as e:
+            finish(e.results)
+            raise
+        return finish(shard_ids)
+
+    def _prep_batches(self, data, max_bytes, dedupe, cache, tolerance=None):
+        """Encode and shard the objects of :meth:`create_batched`
+
+        Returns:
+            tuple -- The shards, a function returning the request body of a shard, and a
+            function taking the ids created by each shard (None for the failed ones), recording
+            them in the cache and returning the ids of all the objects
+        """
+        if tolerance:
+            data = [self.schema.parse_obj(d) if isinstance(d, dict) else d for d in data]
+            snapped, _ = geometry.quantized([d for d in data if isinstance(d, BaseModel)], tolerance)
+            snapped = iter(snapped)
+            data = [next(snapped) if isinstance(d, BaseModel) else d for d in data]
+        items = self._prep_data(data)
+
+        # Position of each item in the list of objects actually sent
+        positions = []
+        unique = []
+        seen = {}
+        for item in items:
+            content_hash = item.get('hash') if dedupe and isinstance(item, dict) else None
+            if content_hash is None:
+                positions.append(len(unique))
+                unique.append(item)
+            elif content_hash in seen:
+                positions.append(seen[content_hash])
+            else:
+                seen[content_hash] = len(unique)
+                positions.append(len(unique))
+                unique.append(item)
+        del seen, items
+
+        hashes = [u.get('hash') if isinstance(u, dict) else None for u in unique]
+        known = {}
+        if cache is not None:
+            known = cache.get_sent_objects(self.basepath, [h for h in hashes if h is not None])
+        missing = [i for i, h in enumerate(hashes) if h not in known]
+
+        encoded = [json_codec.dumps(unique[i]) for i in missing]
+        shards = batch.shard([len(e) for e in encoded], max_bytes=max_bytes or self.MAX_REQUEST_BYTES)
+
+        def body(start, stop):
+            return b'[' + b','.join(encoded[start:stop]) + b']'
+
+        def finish(shard_ids):
+            if cache is not None:
+                cache.write_sent_objects(self.basepath, [
+                    (hashes[missing[start + j]], i)
+                    for (start, _), ids in zip(shards, shard_ids) if ids is not None
+                    for j, i in enumerate(ids) if hashes[missing[start + j]] is not None])
+
+            ids = [known.get(h) for h in hashes]
+            for i, created in zip(missing, (i for shard in shard_ids if shard is not None for i in shard)):
+                ids[i] = created
+            return [ids[p] for p in positions]
+
+        return shards, body, finish
+
     def get(self, id, query=None):
         """Get a specific Speckle object from the SpeckleServer
+
+        With a cache (see `cache`), the object is served from it when possible, and stored in
+        it once downloaded. Requests with a query are never cached. Objects served from the
+        cache's memory tier are shared between calls and should not be modified.
         
         Arguments:
             id {str} -- The ID of the Speckle object to retrieve
@@ -84,7 +431,25 @@ class Resource(ResourceBase):
         Returns:
             SpeckleObject -- The Speckle object
         """
-        return self.make_request('get', '/' + id, params=query)
+        if self.cache is None or query:
+            return self.make_request('get', '/' + id, params=query)
+
+        memory = self.cache.memory
+        if memory is not None:
+            instance = memory.get((self.basepath, id))
+            if instance is not None:
+                return instance
+
+        cached = self.cache.get_objects(self.basepath, [id])
+        if id not in cached:
+            resource = self._request_payload('get', '/' + id)['resource']
+            self.cache.put_objects(self.basepath, [resource])
+            cached[id] = resource
+
+        instance = self._parse_response(cached[id])
+        if memory is not None:
+            memory.put((self.basepath, id), instance)
+        return instance
 
 
     def update(self, id, data):
@@ -97,7 +462,10 @@ class Resource(ResourceBase):
         Returns:
             dict -- a confirmation payload with the updated keys
         """
-        return self.make_request('update', '/' + id, data)
+        try:
+            return self.make_request('update', '/' + id, data)
+        finally:
+            self._invalidate(id)
 
     def delete(self, id):
         """Delete a specific Speckle object
@@ -108,7 +476,14 @@ class Resource(ResourceBase):
         Returns:
             dict -- A confirmation payload
         """
-        return self.make_request('delete', '/' + id)
+        try:
+            return self.make_request('delete', '/' + id)
+        finally:
+            self._invalidate(id)
+
+    def _invalidate(self, id):
+        if self.cache is not None:
+            self.cache.delete_objects(self.basepath, [id])
 
     def comment_get(self, id):
         """Retrieve comments attached to a Speckle object
@@ -133,17 +508,91 @@ class Resource(ResourceBase):
         """
         return self.make_request('comment_create', '/' + id, data, comment=True)
 
-    def get_bulk(self, object_ids, query=None):
+    def get_bulk(self, object_ids, query=None, shard_size=None, max_workers=4, retries=2, stream=False):
         """Retrieve and optionally update a list of Speckle objects
+
+        Large id lists can be downloaded in shards by setting `shard_size`. The shards are
+        fetched concurrently and the objects are returned in the order of `object_ids`.
+        Shards that fail are retried on their own, if some still fail a
+        :class:`~speckle.base.batch.ShardError` is raised holding the shards that succeeded.
         
         Arguments:
             object_ids {list} -- A list of object IDs
             query {dict} -- A dictionary to specifiy which fields to retrieve, filters, limits, etc
+
+        Keyword Arguments:
+            shard_size {int} -- Maximum number of ids per request, None sends a single request (default: {None})
+            max_workers {int} -- Number of shards downloaded at once (default: {4})
+            retries {int} -- How many extra attempts a failing shard gets (default: {2})
+            stream {bool} -- Return a generator parsing objects as they are downloaded, ignored when sharding or caching (default: {False})
         
         Returns:
             list -- A list of SpeckleObjects
         """
-        return self.make_request('get_bulk', '/getbulk', object_ids, params=query)
+        if self.cache is not None and not query:
+            return self._get_bulk_cached(object_ids, shard_size, max_workers, retries)
+
+        if not shard_size:
+            return self.make_request('get_bulk', '/getbulk', object_ids, params=query, stream=stream)
+
+        def get_shard(start, stop):
+            ids = object_ids[start:stop]
+            return _in_order(ids, self.make_request('get_bulk', '/getbulk', ids, params=query))
+
+        shards = self._bulk_shards(object_ids, shard_size)
+        return [o for objects in batch.run_shards(get_shard, shards, max_workers, retries) for o in objects]
+
+    def _bulk_shards(self, object_ids, shard_size):
+        return batch.shard([len(i) + 2 for i in object_ids], max_items=shard_size, max_bytes=self.MAX_REQUEST_BYTES)
+
+    def _get_bulk_cached(self, object_ids, shard_size, max_workers, retries):
+        """Serve get_bulk from the cache, downloading (and caching) only the missing objects"""
+        instances, found, missing = self._get_cached(object_ids)
+        if missing:
+            def get_shard(start, stop):
+                return self._request_payload('get_bulk', '/getbulk', missing[start:stop])['resources']
+
+            # Written from this thread, the connections of the workers would outlive them
+            try:
+                downloaded = batch.run_shards(get_shard, self._bulk_shards(missing, shard_size), max_workers, retries)
+            except batch.ShardError as e:
+                self._put_downloaded(found, e.results)
+                raise
+            self._put_downloaded(found, downloaded)
+        return self._parse_cached(object_ids, instances, found)
+
+    def _get_cached(self, object_ids):
+        """The parsed instances in the cache's memory tier, the cached payloads and the missing ids"""
+        memory = self.cache.memory
+        instances = {}
+        unique = list(dict.fromkeys(object_ids))
+        if memory is not None:
+            for i in unique:
+                instance = memory.get((self.basepath, i))
+                if instance is not None:
+                    instances[i] = instance
+            unique = [i for i in unique if i not in instances]
+
+        found = self.cache.get_objects(self.basepath, unique) if unique else {}
+        return instances, found, [i for i in unique if i not in found]
+
+    def _put_downloaded(self, found, downloaded):
+        for resources in downloaded:
+            if resources is not None:
+                self.cache.put_objects(self.basepath, resources)
+                found.update((r['_id'], r) for r in resources)
+
+    def _parse_cached(self, object_ids, instances, found):
+        memory = self.cache.memory
+        for i, resource in found.items():
+            instances[i] = self._parse_response(resource)
+            if memory is not None:
+                memory.put((self.basepath, i), instances[i])
+
+        return [instances[i] for i in object_ids if i in instances]
 
     def set_properties(self, id, data):
-        return self.make_request('set_properties', '/' + id + '/properties', data)
+        try:
+            return self.make_request('set_properties', '/' + id + '/properties', data)
+        finally:
+            self._invalidate(id)
@@ -1,7 +1,12 @@
 import uuid
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, UUID4, validator, Schema
 from typing import List, Optional
+from speckle.Cache import timestamp
+from speckle.base import geometry
 from speckle.base.resource import ResourceBase, ResourceBaseSchema
+from speckle.resources import objects
 from speckle.resources.objects import SpeckleObject
 from speckle.resources.api_clients import ApiClient
 
@@ -11,6 +16,10 @@ METHODS = ['list', 'create', 'get', 'update',
            'clone', 'diff', 'list_objects', 'list_clients']
 
 
+# QuantizeReport of the last upload of each stream, by streamId, see `Resource.quantize`
+quantize_reports = {}
+
+
 class LayerProperties(BaseModel):
   color: dict = {}
   visible: bool = True
@@ -52,9 +61,53 @@ class Stream(ResourceBaseSchema):
     children: List[str] = []
     baseProperties: Optional[StreamBaseProperties] = StreamBaseProperties()
 
+    def convert_units(self, units):
+        """Convert the objects of the stream to other units, in place
+
+        The geometry of all the objects is scaled in one pass (see
+        :func:`speckle.base.geometry.convert_units`) and `baseProperties.units` and
+        `baseProperties.tolerance` are updated to match. Send the stream to save the change.
+
+        The long coordinate lists of objects parsed as plain SpeckleObjects are stored as
+        float64 arrays first, as in geometry schemas, so they are scaled in place (see
+        :func:`speckle.base.geometry.to_arrays`).
+
+        Arguments:
+            units {str} -- The units to convert to, eg: 'Millimeters', see
+            :data:`speckle.base.geometry.UNITS`
+
+        Raises:
+            ValueError -- If the stream's units or units are unknown
+
+        Returns:
+            int -- The number of values scaled
+        """
+        base_properties = self.baseProperties or StreamBaseProperties()
+        factor = geometry.unit_scale(base_properties.units, units)
+        if factor != 1:
+            geometry.to_arrays(self.objects)
+        count = geometry.convert_units(self.objects, base_properties.units, units)
+        if base_properties.tolerance is not None:
+            base_properties.tolerance = float(Decimal(repr(base_properties.tolerance)) * factor)
+        base_properties.units = units
+        self.baseProperties = base_properties
+        return count
+
+def _inherits_tolerance(data):
+    """Whether stream data sent as an update has objects but no baseProperties of its own"""
+    if isinstance(data, dict):
+        return 'baseProperties' not in data and bool(data.get('objects'))
+    return 'baseProperties' not in data.__fields_set__ and bool(data.objects)
+
+
 class Resource(ResourceBase):
     """API Access class for Streams
 
+    With `quantize` set (see :class:`~speckle.base.client.ClientBase`), the coordinates of the
+    objects sent with a stream are snapped to the stream's `baseProperties.tolerance` before
+    being serialized and hashed (see :func:`speckle.base.geometry.quantize`). Copies of the
+    objects are snapped, those passed in are left unchanged. The size reduction achieved is
+    recorded per stream in `quantize_reports`.
     """
     
     def __init__(self, session, basepath, me):
@@ -94,10 +147,20 @@ class Resource(ResourceBase):
         Returns:
             Stream -- The instance created on the Speckle Server
         """
-        return self.make_request('create', '/', data)
+        if not self.quantize:
+            return self.make_request('create', '/', data)
+
+        data, report = self._quantize(data)
+        stream = self.make_request('create', '/', data)
+        self._record(stream.streamId, report)
+        return stream
 
     def get(self, id, query=None):
         """Get a specific stream from the SpeckleServer
+
+        With a cache (see `cache`), a stored snapshot of the stream is returned as long as
+        the server reports the same `updatedAt`, which only costs a request for that field.
+        Requests with a query are never cached.
         
         Arguments:
             id {str} -- The StreamId of the stream to retrieve
@@ -105,7 +168,18 @@ class Resource(ResourceBase):
         Returns:
             Stream -- The stream
         """
-        return self.make_request('get', '/' + id, params=query)
+        if self.cache is None or query:
+            return self.make_request('get', '/' + id, params=query)
+
+        cached = self.cache.get_stream(self.basepath, id)
+        if cached is not None and cached[0] is not None:
+            head = self._request_payload('get', '/' + id, params={'fields': 'updatedAt'})['resource']
+            if timestamp(head.get('updatedAt')) == cached[0]:
+                return self._parse_response(cached[1])
+
+        resource = self._request_payload('get', '/' + id)['resource']
+        self.cache.put_stream(self.basepath, resource)
+        return self._parse_response(resource)
 
     def update(self, id, data):
         """Update a specific stream
@@ -117,7 +191,16 @@ class Resource(ResourceBase):
         Returns:
             dict -- a confirmation payload with the updated keys
         """
-        return self.make_request('update', '/' + id, data)
+        report = None
+        if self.quantize:
+            tolerance = self._stream_tolerance(id) if _inherits_tolerance(data) else None
+            data, report = self._quantize(data, tolerance)
+        try:
+            result = self.make_request('update', '/' + id, data)
+        finally:
+            self._invalidate(id)
+        self._record(id, report)
+        return result
 
     def delete(self, id):
         """Delete a specific stream
@@ -128,7 +211,41 @@ class Resource(ResourceBase):
         Returns:
             dict -- A confirmation payload
         """
-        return self.make_request('delete', '/' + id)
+        try:
+            return self.make_request('delete', '/' + id)
+        finally:
+            self._invalidate(id)
+
+    def _quantize(self, data, tolerance=None):
+        """Snap the coordinates of copies of the objects of a stream to its tolerance
+
+        The objects of `data` are left unchanged, the stream returned holds snapped copies.
+
+        Keyword Arguments:
+            tolerance {float} -- The tolerance of the existing stream, used when data holds none (default: {None})
+
+        Returns:
+            tuple -- The Stream to send and its QuantizeReport, None if there is no tolerance
+        """
+        stream = Stream.parse_obj(data) if isinstance(data, dict) else data
+        if stream.baseProperties and stream.baseProperties.tolerance is not None:
+            tolerance = stream.baseProperties.tolerance
+        if not tolerance or not stream.objects:
+            return stream, None
+        objects, report = geometry.quantized(stream.objects, tolerance)
+        return stream.copy(update={'objects': objects}), report
+
+    def _stream_tolerance(self, id):
+        head = self._request_payload('get', '/' + id, params={'fields': 'baseProperties'})['resource']
+        return (head.get('baseProperties') or {}).get('tolerance')
+
+    def _record(self, id, report):
+        if report is not None:
+            quantize_reports[id] = report
+
+    def _invalidate(self, id):
+        if self.cache is not None:
+            self.cache.delete_stream(self.basepath, id)
 
     def comment_get(self, id):
         """Retrieve comments attached to a stream
@@ -183,16 +300,77 @@ class Resource(ResourceBase):
         """
         return self.make_request('diff', '/' + id + '/diff/' + other_id)
 
-    def list_objects(self, id, query=None):
+    def list_objects(self, id, query=None, stream=False):
         """Return the list of objects in a stream
         
         Arguments:
             id {str} -- StreamId of the stream to list objects from
+
+        Keyword Arguments:
+            stream {bool} -- Return a generator parsing objects as they are downloaded (default: {False})
         
         Returns:
             list -- A list of Speckle objects
         """
-        return self.make_request('list_objects', '/' + id + '/objects', schema=SpeckleObject, params=query)
+        return self.make_request('list_objects', '/' + id + '/objects', schema=SpeckleObject, params=query, stream=stream)
+
+    def iter_objects(self, id, batch_size=100, query=None, prefetch=True):
+        """Iterate over the objects of a stream without loading them all at once
+
+        Only the object ids of the stream are fetched up front, the objects themselves are
+        downloaded `batch_size` at a time. While the caller processes a batch the next one
+        is already being downloaded, so at most two batches are held in memory.
+
+        Example:
+            .. code-block:: python
+
+                for o in client.streams.iter_objects(stream_id, batch_size=500, query={'omit': 'properties'}):
+                    print(o.type, o.id)
+
+        Arguments:
+            id {str} -- StreamId of the stream to iterate over
+
+        Keyword Arguments:
+            batch_size {int} -- Number of objects downloaded per request (default: {100})
+            query {dict} -- A dictionary to specifiy which fields to retrieve for each object (default: {None})
+            prefetch {bool} -- Download the next batch while the current one is consumed (default: {True})
+
+        Yields:
+            SpeckleObject -- The stream objects, parsed with their schema when one is loaded
+        """
+        stream = self.make_request('get', '/' + id, params={'fields': 'objects'})
+        ids = [o.id for o in stream.objects]
+        del stream
+
+        objects_resource = self._objects_resource()
+        batches = (ids[i:i + batch_size] for i in range(0, len(ids), batch_size))
+
+        def fetch(batch):
+            return objects_resource.get_bulk(batch, query=query) if batch else None
+
+        if not prefetch:
+            for batch in batches:
+                yield from fetch(batch)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            pending = pool.submit(fetch, next(batches, None))
+            while True:
+                current = pending.result()
+                if current is None:
+                    break
+                pending = pool.submit(fetch, next(batches, None))
+                yield from current
+                del current
+        finally:
+            pool.shutdown(wait=False)
+
+    def _objects_resource(self):
+        objects_resource = objects.Resource(self.s, self.basepath, self.me)
+        objects_resource.trusted = self.trusted
+        objects_resource.cache = self.cache
+        return objects_resource
 
     def list_clients(self, id):
         """Return the list of api clients connected to the stream
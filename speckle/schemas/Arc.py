@@ -1,7 +1,7 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
 from speckle.resources.objects import SpeckleObject
 from speckle.schemas import Plane, Interval
@@ -17,3 +17,5 @@ class Schema(SpeckleObject):
     angleRadians: float = 0.0
     domain: Interval.Schema = Interval.Schema()
     plane: Plane.Schema = Plane.Schema()
+
+    length_fields: ClassVar[Tuple[str, ...]] = ('radius',)
@@ -1,8 +1,9 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
+from speckle.base.arrays import FloatArray
 from speckle.resources.objects import SpeckleObject
 from speckle.schemas import Interval, Polyline
 
@@ -16,7 +17,9 @@ class Schema(SpeckleObject):
     degree: int = 0
     rational: bool = True
     periodic: bool = True
-    points: List[float] = []
-    weights: List[float] = []
-    knots: List[float] = []
+    points: FloatArray = []
+    weights: FloatArray = []
+    knots: FloatArray = []
     displayValue: Optional[Polyline.Schema]
+
+    coordinate_fields: ClassVar[Tuple[str, ...]] = ('points',)
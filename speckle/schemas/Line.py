@@ -2,7 +2,7 @@ import json
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
 from speckle.resources.objects import SpeckleObject
 from speckle.schemas import Interval
@@ -15,5 +15,9 @@ class Schema(SpeckleObject):
     Value: List[float] = []
     domain: Optional[Interval] = Interval()
 
+    coordinate_fields: ClassVar[Tuple[str, ...]] = ('Value',)
+    # Lines are parametrized by length
+    length_fields: ClassVar[Tuple[str, ...]] = ('domain.start', 'domain.end')
+
     class Config:
     	case_sensitive = False
@@ -1,8 +1,9 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
+from speckle.base.arrays import FloatArray, IntArray, as_points
 from speckle.resources.objects import SpeckleObject
 
 NAME = 'mesh'
@@ -10,7 +11,14 @@ NAME = 'mesh'
 class Schema(SpeckleObject):
     type: str = "Mesh"
     name: Optional[str] = "SpeckleMesh"
-    vertices: List[float] = []
-    faces: List[int] = []
-    texture_coordinates: Optional[List[float]]
-    colors: Optional[List[int]]
+    vertices: FloatArray = []
+    faces: IntArray = []
+    texture_coordinates: Optional[FloatArray]
+    colors: Optional[IntArray]
+
+    coordinate_fields: ClassVar[Tuple[str, ...]] = ('vertices',)
+
+    @property
+    def vertex_points(self):
+        """The vertices as an (N, 3) view, see :func:`speckle.base.arrays.as_points`"""
+        return as_points(self.vertices)
@@ -1,7 +1,7 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
 from speckle.resources.objects import SpeckleObject
 from speckle.schemas import Point, Vector
@@ -15,3 +15,6 @@ class Schema(SpeckleObject):
     normal: Vector.Schema = Vector.Schema(Value=[0,0,1])
     xdir: Vector.Schema = Vector.Schema(Value=[1,0,0])
     ydir: Vector.Schema = Vector.Schema(Value=[0,1,0])
+
+    normalized_fields: ClassVar[Tuple[str, ...]] = ('xdir', 'ydir')
+    normal_fields: ClassVar[Tuple[str, ...]] = ('normal',)
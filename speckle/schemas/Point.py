@@ -1,7 +1,7 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
 from speckle.resources.objects import SpeckleObject
 
@@ -12,3 +12,5 @@ class Schema(SpeckleObject):
     type: str = "Point"
     name: Optional[str] = "SpecklePoint"
     value: List[float] = [0,0,0]
+
+    coordinate_fields: ClassVar[Tuple[str, ...]] = ('value',)
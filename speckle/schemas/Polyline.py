@@ -1,8 +1,9 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
+from speckle.base.arrays import FloatArray
 from speckle.resources.objects import SpeckleObject
 
 NAME = 'polyline'
@@ -10,7 +11,9 @@ NAME = 'polyline'
 class Schema(SpeckleObject):
     type: str = "Polyline"
     name: Optional[str] = "SpecklePolyline"
-    value: List[float] = []
+    value: FloatArray = []
+
+    coordinate_fields: ClassVar[Tuple[str, ...]] = ('value',)
 
     #class Config:
     #	fields={'Value':'value'}
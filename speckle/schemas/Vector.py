@@ -1,7 +1,7 @@
 import json
 import hashlib
 from pydantic import BaseModel, validator
-from typing import List, Optional
+from typing import ClassVar, List, Optional, Tuple
 from speckle.base.resource import ResourceBaseSchema
 from speckle.resources.objects import SpeckleObject
 
@@ -12,3 +12,5 @@ class Schema(SpeckleObject):
     type: str = "Vector"
     name: Optional[str] = "SpeckleVector"
     value: List[float] = [0,0,1]
+
+    direction_fields: ClassVar[Tuple[str, ...]] = ('value',)
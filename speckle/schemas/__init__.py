@@ -14,5 +14,5 @@ for (_, name, _) in pkgutil.iter_modules([Path(__file__).parent]):
     imported_module = import_module('.' + name, package=__name__)
     
     if hasattr(imported_module, 'Schema'):
-        SCHEMAS[name] = imported_module.Schema
+        SCHEMAS.register(name, imported_module.Schema)
         setattr(sys.modules[__name__], name, imported_module.Schema)
\ No newline at end of file
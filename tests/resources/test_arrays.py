@@ -0,0 +1,203 @@
+import array
+import pytest
+import requests
+import speckle.base.resource
+from speckle import resources
+from speckle.base import arrays, json_codec
+from speckle.base.resource import clean_empty, construct, serialize_json
+from speckle.schemas import Curve, Mesh, Polyline
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request, monkeypatch):
+    if request.param == 'array':
+        monkeypatch.setattr(arrays, 'np', None)
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def mesh():
+    return {
+        '_id': '5d0b8f5bfe4d25001bd7b1a4',
+        'type': 'Mesh',
+        'vertices': [0.1, -2.5e-7, 1e22, 3, 4, 5],
+        'faces': [0, 0, 1, 1],
+        'colors': [-16777216, 255],
+    }
+
+
+def test_fields_are_arrays(backend, mesh):
+    for parsed in (Mesh.parse_obj(mesh), construct(Mesh, mesh)):
+        assert arrays.is_array(parsed.vertices) and arrays.is_array(parsed.faces)
+        assert parsed.vertices.tolist() == [float(v) for v in mesh['vertices']]
+        assert parsed.faces.tolist() == mesh['faces']
+        assert parsed.colors.tolist() == mesh['colors']
+
+    assert arrays.is_array(Polyline(value=[1, 2, 3]).value)
+    assert arrays.is_array(Curve(points=[1, 2, 3], knots=(0, 1)).knots)
+
+
+def test_dict_and_json_unchanged(backend, mesh):
+    parsed = Mesh.parse_obj(mesh)
+    plain = parsed.dict()
+
+    assert type(plain['vertices']) is list and type(plain['faces']) is list
+    for name in json_codec.available_backends():
+        json_codec.use_backend(name)
+        assert serialize_json(parsed) == json_codec.dumps(clean_empty(plain))
+    json_codec.use_backend()
+
+
+def test_hash_unchanged(backend, mesh):
+    parsed = Mesh.parse_obj(mesh)
+    content_hash = parsed.update_hash()
+
+    parsed.__dict__['vertices'] = parsed.vertices.tolist()
+    parsed.__dict__['faces'] = parsed.faces.tolist()
+    parsed.__dict__['colors'] = parsed.colors.tolist()
+    parsed.invalidate_hashes()
+    assert parsed.update_hash() == content_hash
+
+
+def test_vertex_points_view(backend, mesh):
+    parsed = Mesh.parse_obj(mesh)
+    points = parsed.vertex_points
+
+    assert tuple(points.shape) == (2, 3)
+    points[1, 2] = 10.0
+    assert parsed.vertices[5] == 10.0
+
+
+def test_rejects_non_numbers(backend):
+    with pytest.raises(ValueError):
+        Mesh(vertices='not a list')
+    with pytest.raises(ValueError):
+        Mesh(vertices=[1, None, 3])
+
+
+def test_fallback_without_numpy(monkeypatch):
+    monkeypatch.setattr(arrays, 'np', None)
+    parsed = Mesh(vertices=[1, 2, 3], faces=[0, 1, 2])
+
+    assert type(parsed.vertices) is array.array and parsed.vertices.typecode == 'd'
+    assert type(parsed.faces) is array.array and parsed.faces.typecode == 'q'
+    assert isinstance(parsed.vertex_points, memoryview)
+
+
+@pytest.fixture(scope='module')
+def large_mesh():
+    return {
+        '_id': '5d0b8f5bfe4d25001bd7b1a5',
+        'type': 'Mesh',
+        'vertices': [i / 7 for i in range(30)],
+        'faces': [v for i in range(8) for v in (0, i, i + 1, i + 2)],
+        'colors': [2 ** 32 - 1] * 10,
+        'properties': {'values': list(range(10))},
+    }
+
+
+def test_encode_roundtrip(backend):
+    floats = arrays.to_array([i / 7 for i in range(30)], 'float64', 'd')
+    ints = arrays.to_array(range(-20, 20), 'int64', 'q')
+
+    encoded = arrays.encode_array(floats)
+    assert encoded.startswith(arrays.PREFIX)
+    assert arrays.decode_array(encoded).tolist() == floats.tolist()
+    assert arrays.decode_array(arrays.encode_array(ints)).tolist() == ints.tolist()
+
+    single = arrays.decode_array(arrays.encode_array(floats, 'float32')).tolist()
+    assert single != floats.tolist()
+    assert all(abs(a - b) < 1e-6 for a, b in zip(single, floats.tolist()))
+
+
+def test_encode_leaves_unsuitable_arrays(backend):
+    short = arrays.to_array([1.0, 2.0], 'float64', 'd')
+    unsigned = arrays.to_array([2 ** 32 - 1] * 10, 'int64', 'q')
+
+    assert arrays.encode_array(short) is short
+    assert arrays.encode_array(unsigned) is unsigned
+    with pytest.raises(ValueError):
+        arrays.encode_array(short, 'float16')
+
+
+def test_decode_rejects_invalid(backend):
+    encoded = arrays.encode_array([float(i) for i in range(10)])
+
+    with pytest.raises(ValueError):
+        arrays.decode_array(encoded[:-8])
+    with pytest.raises(ValueError):
+        Mesh(vertices=arrays.PREFIX + 'AAAA')
+
+
+@pytest.mark.parametrize('binary_arrays', ['float64', 'float32'])
+@pytest.mark.parametrize('trusted', [False, True])
+def test_resource_roundtrip(backend, large_mesh, binary_arrays, trusted):
+    resource = resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    resource.binary_arrays = binary_arrays
+    resource.trusted = trusted
+
+    sent = json_codec.loads(json_codec.dumps(resource._prep_data(Mesh.parse_obj(large_mesh))))
+    assert sent['vertices'].startswith(arrays.PREFIX)
+    assert sent['faces'].startswith(arrays.PREFIX)
+    assert sent['colors'] == large_mesh['colors']
+    assert sent['properties'] == large_mesh['properties']
+
+    received = resource._parse_response(sent)
+    assert isinstance(received, Mesh)
+    assert received.faces.tolist() == large_mesh['faces']
+    if binary_arrays == 'float64':
+        assert received.vertices.tolist() == large_mesh['vertices']
+        assert received.update_hash() == sent['hash']
+    else:
+        assert all(abs(a - b) < 1e-6 for a, b in zip(received.vertices.tolist(), large_mesh['vertices']))
+
+
+def test_parse_response_without_schema(backend):
+    resource = resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    resource.schema = None
+    values = [float(i) for i in range(10)]
+
+    received = resource._parse_response({'type': 'Custom', 'values': arrays.encode_array(values), 'name': 'kept'})
+    assert received['values'].tolist() == values
+    assert received['name'] == 'kept'
+
+
+def test_parse_response_keeps_prefixed_strings():
+    resource = resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+
+    received = resource._parse_response({'type': 'Custom', 'properties': {'note': arrays.PREFIX + 'AAAA'}})
+    assert received.properties['note'] == arrays.PREFIX + 'AAAA'
+
+
+class _Response(object):
+    """Response of a fake session, streamed 5 bytes at a time"""
+
+    def __init__(self, payload):
+        self.content = json_codec.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        return (self.content[i:i + 5] for i in range(0, len(self.content), 5))
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_make_request_only_decodes_encoded_payloads(monkeypatch, stream):
+    resource = resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    walked = []
+    monkeypatch.setattr(speckle.base.resource, 'decode_arrays', lambda data: walked.append(data) or arrays.decode_arrays(data))
+    values = [float(i) for i in range(10)]
+    payloads = [
+        {'success': True, 'resources': [{'type': 'Polyline', 'value': values}]},
+        {'success': True, 'resources': [{'type': 'Polyline', 'value': arrays.encode_array(values)}]},
+    ]
+
+    for payload in payloads:
+        monkeypatch.setattr(resource.s, 'send', lambda r, stream=False: _Response(payload))
+        received = list(resource.make_request('list', '/', stream=stream))
+        assert list(received[0].value) == values
+        assert len(walked) == (payload is payloads[1])
@@ -0,0 +1,187 @@
+import asyncio
+import pytest
+from speckle import AsyncSpeckleApiClient, SpeckleCache
+from speckle.base import json_codec
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# The async client's transport is an optional extra, CI only installs the base requirements.
+# Tests with the `offline` fixture mock the transport and always run.
+requires_aiohttp = pytest.mark.skipif(aiohttp is None, reason='aiohttp is not installed')
+
+
+@pytest.fixture(scope='module')
+def objects():
+    return [{
+        'type': 'Mesh',
+        'name': 'async mesh {}'.format(i),
+        'vertices': [0, 0, 0, 1, 0, 0, 1, 1, 0],
+        'faces': [0, 0, 1, 2],
+    } for i in range(10)]
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+async def login(host, use_ssl, admin_account):
+    client = AsyncSpeckleApiClient(host=host, use_ssl=use_ssl)
+    await client.login(email=admin_account['email'], password=admin_account['password'])
+    return client
+
+
+@requires_aiohttp
+def test_login(client, host, use_ssl, admin_account):
+    async def scenario():
+        async with await login(host, use_ssl, admin_account) as async_client:
+            return async_client.me
+
+    me = run(scenario())
+
+    assert me['email'] == admin_account['email']
+    assert me['token'] is not None
+
+
+@requires_aiohttp
+def test_concurrent_get_bulk(client, host, use_ssl, admin_account, objects):
+    async def scenario():
+        async with await login(host, use_ssl, admin_account) as async_client:
+            created = await async_client.objects.create(objects)
+            ids = [o.id for o in created]
+            results = await asyncio.gather(*[async_client.objects.get_bulk([i]) for i in ids])
+            return ids, results
+
+    ids, results = run(scenario())
+
+    assert len(results) == len(objects)
+    assert [r[0].id for r in results] == ids
+
+
+@requires_aiohttp
+def test_stream_roundtrip(client, host, use_ssl, admin_account):
+    async def scenario():
+        async with await login(host, use_ssl, admin_account) as async_client:
+            stream = await async_client.streams.create({'name': 'async stream'})
+            fetched = await async_client.streams.get(stream.streamId)
+            clone, parent = await async_client.streams.clone(stream.streamId, 'async clone')
+            return stream, fetched, clone, parent
+
+    stream, fetched, clone, parent = run(scenario())
+
+    assert fetched.streamId == stream.streamId
+    assert clone.name == 'async clone'
+    assert clone.parent == parent.streamId
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Async resources talking to an in-memory server"""
+    from speckle.base.async_client import AsyncSession, async_resource
+
+    session = AsyncSession()
+    server = {'id{}'.format(i): {'_id': 'id{}'.format(i), 'type': 'Null', 'name': str(i)} for i in range(10)}
+    session.requests = []
+    session.bodies = []
+
+    async def send_async(prepared, raw=False):
+        payload = respond(prepared)
+        return json_codec.dumps(payload) if raw else payload
+
+    def respond(prepared):
+        path = prepared.path_url.split('?')[0].split('/api/v1')[-1]
+        body = json_codec.loads(prepared.body) if prepared.body else None
+        session.requests.append((prepared.method, path))
+        session.bodies.append(body)
+        if path == '/objects/getbulk':
+            return {'success': True, 'resources': [dict(server[i]) for i in reversed(body)]}
+        if path == '/objects/':
+            created = [dict(o, _id='new{}'.format(len(server) + i)) for i, o in enumerate(body)]
+            server.update((o['_id'], o) for o in created)
+            return {'success': True, 'resources': created}
+        if path.startswith('/objects/'):
+            if prepared.method == 'GET':
+                return {'success': True, 'resource': dict(server[path.split('/')[2]])}
+            return {'success': True, 'message': 'done'}
+        if path.startswith('/streams/'):
+            return {'success': True, 'resource': {
+                'streamId': 's1', 'updatedAt': '2020-01-01T00:00:00.000Z', 'baseProperties': {'tolerance': 0.01},
+                'objects': [{'_id': i} for i in sorted(server)]}}
+        raise AssertionError(path)
+
+    monkeypatch.setattr(session, 'send_async', send_async)
+    session.resource = lambda name: async_resource(name)(session, 'http://localhost:3000/api/v1', None)
+    return session
+
+
+def test_offline_get_bulk_sharded(offline):
+    ids = ['id{}'.format(i) for i in range(7)]
+    objects = run(offline.resource('objects').get_bulk(ids, shard_size=3))
+
+    assert [o.id for o in objects] == ids
+    assert len(offline.requests) == 3
+
+
+def test_offline_get_bulk_cached(offline, tmp_path):
+    objects_resource = offline.resource('objects')
+    objects_resource.cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True)
+    ids = ['id1', 'id2', 'id3']
+
+    assert [o.id for o in run(objects_resource.get_bulk(ids, shard_size=2))] == ids
+    assert [o.id for o in run(objects_resource.get_bulk(ids, shard_size=2))] == ids
+    assert len(offline.requests) == 2
+    objects_resource.cache.close()
+
+
+
+def test_offline_get_cached(offline, tmp_path):
+    cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True)
+    objects_resource = offline.resource('objects')
+    streams = offline.resource('streams')
+    objects_resource.cache = streams.cache = cache
+
+    assert run(objects_resource.get('id1')).name == '1'
+    assert run(objects_resource.get('id1')).name == '1'
+    assert run(streams.get('s1')).streamId == 's1'
+    assert run(streams.get('s1')).streamId == 's1'
+    assert offline.requests == [('GET', '/objects/id1'), ('GET', '/streams/s1'), ('GET', '/streams/s1')]
+
+    assert run(objects_resource.delete('id1')) == {'success': True, 'message': 'done'}
+    run(streams.delete('s1'))
+    assert cache.get_objects(objects_resource.basepath, ['id1']) == {}
+    assert cache.get_stream(streams.basepath, 's1') is None
+    cache.close()
+
+def test_offline_create_batched(offline):
+    data = [{'type': 'Null', 'name': 'a'}, {'type': 'Null', 'name': 'b'}, {'type': 'Null', 'name': 'a'}]
+    ids = run(offline.resource('objects').create_batched(data, max_bytes=200, max_workers=2))
+
+    assert ids[0] == ids[2] and ids[0] != ids[1]
+    assert None not in ids
+
+
+def test_offline_iter_objects(offline):
+    async def scenario():
+        return [o.id async for o in offline.resource('streams').iter_objects('s1', batch_size=4)]
+
+    assert sorted(run(scenario())) == sorted('id{}'.format(i) for i in range(10))
+
+
+def test_offline_quantize_upload(offline):
+    from speckle.resources.streams import quantize_reports
+
+    streams = offline.resource('streams')
+    streams.quantize = True
+    objects = [{'type': 'Mesh', 'vertices': [0.123456789, 1.0004, 2.0]}]
+
+    stream = run(streams.create({'objects': objects, 'baseProperties': {'tolerance': 0.001}}))
+    assert stream.streamId == 's1'
+    assert offline.bodies[-1]['objects'][0]['vertices'] == [0.123, 1, 2]
+
+    run(streams.update('s1', {'objects': objects}))
+    assert offline.requests[-2:] == [('GET', '/streams/s1'), ('PUT', '/streams/s1')]
+    assert offline.bodies[-1]['objects'][0]['vertices'] == [0.12, 1, 2]
+    assert quantize_reports['s1'].changed == 2
+    assert objects[0]['vertices'] == [0.123456789, 1.0004, 2.0]
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from speckle.base import batch
+
+
+def test_shard_max_items():
+    assert batch.shard([1] * 10, max_items=4) == [(0, 4), (4, 8), (8, 10)]
+
+
+def test_shard_max_bytes():
+    # brackets + 3 items of 10 bytes + 2 commas = 34 bytes
+    assert batch.shard([10] * 7, max_bytes=34) == [(0, 3), (3, 6), (6, 7)]
+
+
+def test_shard_oversized_item():
+    assert batch.shard([5, 100, 5], max_bytes=20) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_shard_empty():
+    assert batch.shard([], max_items=10) == []
+
+
+def test_run_shards_retries_failed_only():
+    calls = []
+
+    def fn(start, stop):
+        calls.append((start, stop))
+        if (start, stop) == (2, 4) and calls.count((2, 4)) == 1:
+            raise ValueError('flaky')
+        return list(range(start, stop))
+
+    shards = batch.shard([1] * 6, max_items=2)
+    results = batch.run_shards(fn, shards, max_workers=2, retries=1)
+
+    assert results == [[0, 1], [2, 3], [4, 5]]
+    assert calls.count((0, 2)) == 1
+    assert calls.count((2, 4)) == 2
+
+
+def test_run_shards_partial_failure():
+    def fn(start, stop):
+        if start == 0:
+            raise ValueError('broken')
+        return start
+
+    shards = batch.shard([1] * 4, max_items=2)
+    with pytest.raises(batch.ShardError) as e:
+        batch.run_shards(fn, shards, retries=2)
+
+    assert e.value.results == [None, 2]
+    assert list(e.value.failures) == [0]
+
+
+def test_run_shards_async_retries_failed_only():
+    calls = []
+
+    async def fn(start, stop):
+        calls.append((start, stop))
+        if (start, stop) == (2, 4) and calls.count((2, 4)) == 1:
+            raise ValueError('flaky')
+        return list(range(start, stop))
+
+    shards = batch.shard([1] * 6, max_items=2)
+    results = asyncio.get_event_loop().run_until_complete(batch.run_shards_async(fn, shards, max_workers=2, retries=1))
+
+    assert results == [[0, 1], [2, 3], [4, 5]]
+    assert calls.count((0, 2)) == 1
+    assert calls.count((2, 4)) == 2
@@ -1,6 +1,11 @@
+import sqlite3
+import threading
+import time
 import uuid
 import pytest
-from speckle.Cache import SpeckleCache
+from speckle.base import blob_codec, json_codec
+from speckle.Cache import SCHEMA_VERSION, BloomFilter, MemoryCache, SpeckleCache, estimate_size, timestamp
+from speckle.schemas import Mesh
 
 def test_create():
     cache = SpeckleCache("test.db")
@@ -11,4 +16,210 @@ def test_create():
     try:
 	    assert conn != None
     except AssertionError as e:
-        raise e
\ No newline at end of file
+        raise e
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SpeckleCache(str(tmp_path / 'cache.db'))
+    cache.create_database()
+    return cache
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000)
+    for i in range(1000):
+        bloom.add(str(i))
+
+    assert all(str(i) in bloom for i in range(1000))
+    assert sum(str(i) in bloom for i in range(1000, 11000)) < 200
+
+
+def test_sent_objects(cache):
+    host = 'http://localhost:3000/api/v1'
+    cache.write_sent_objects(host, [('h{}'.format(i), 'id{}'.format(i)) for i in range(2000)])
+
+    hashes = ['h{}'.format(i) for i in range(0, 4000, 2)]
+    found = cache.get_sent_objects(host, hashes)
+
+    assert found == {'h{}'.format(i): 'id{}'.format(i) for i in range(0, 2000, 2)}
+    assert cache.get_sent_objects('http://other/api/v1', hashes) == {}
+    assert SpeckleCache(cache.db_path).get_sent_objects(host, ['h1', 'x']) == {'h1': 'id1'}
+
+
+def test_persistent_connection(tmp_path):
+    cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True)
+    conn = cache.try_connect()
+
+    assert cache.try_connect() is conn
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(cache.try_connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+    cache.write_account('localhost:3000', 'local', 'test@test.com', 'JWT token')
+    assert cache.account_exists('localhost:3000', 'test@test.com')
+
+    cache.close()
+    assert cache.try_connect() is not conn
+
+
+def test_put_get_objects(cache):
+    host = 'http://localhost:3000/api/v1'
+    objects = [{'_id': 'id{}'.format(i), 'type': 'Point', 'value': [i, 0, 0]} for i in range(1500)]
+    cache.put_objects(host, objects)
+
+    found = cache.get_objects(host, ['id{}'.format(i) for i in range(0, 3000, 3)])
+
+    assert found == {o['_id']: o for o in objects[::3]}
+    assert cache.get_objects('http://other/api/v1', ['id0']) == {}
+
+
+def test_evict_least_recently_used(cache, monkeypatch):
+    host = 'http://localhost:3000/api/v1'
+    now = [1000]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache.codec = 'raw'
+
+    for i in range(10):
+        now[0] += 1
+        cache.put_objects(host, [{'_id': 'id{}'.format(i), 'value': 'x' * 100}])
+    now[0] += 1
+    cache.get_objects(host, ['id0', 'id1'])
+
+    size = len(json_codec.dumps({'_id': 'id0', 'value': 'x' * 100}))
+    cache.max_bytes = 5 * size + 1
+    now[0] += 1
+    cache.put_objects(host, [{'_id': 'id10', 'value': 'x' * 100}])
+
+    remaining = cache.get_objects(host, ['id{}'.format(i) for i in range(11)])
+    assert sorted(remaining) == ['id0', 'id1', 'id10', 'id8', 'id9']
+
+
+def test_objects_old_database(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE CachedObject
+                    ([CombinedHash] varchar NOT NULL PRIMARY KEY,[RestApi] varchar, [DatabaseId] varchar, [Hash] varchar, [AddedOn] bigint, [Bytes] blob)''')
+    conn.close()
+
+    cache = SpeckleCache(path)
+    cache.put_objects('host', [{'_id': 'a'}])
+    assert cache.get_objects('host', ['a']) == {'a': {'_id': 'a'}}
+
+    conn = cache.try_connect()
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+    assert {'SentObjectHash', 'CachedObjectAccess'} <= indexes
+    assert cache.migrate() == SCHEMA_VERSION
+
+
+def test_memory_cache_lru():
+    memory = MemoryCache(max_bytes=3000)
+    for i in range(3):
+        memory.put(i, [0.0] * 20, size=1000)
+    assert memory.get(0) is not None
+
+    memory.put(3, [0.0] * 20, size=1000)
+
+    assert 1 not in memory
+    assert memory.get(1) is None
+    assert memory.size <= 3000
+    assert (memory.hits, memory.misses, memory.evictions) == (1, 1, 1)
+
+
+def test_memory_cache_size_estimate():
+    memory = MemoryCache(max_bytes=10 ** 6)
+    memory.put('mesh', Mesh(vertices=[0.0] * 150000, faces=[0] * 10000))
+
+    assert 10 ** 6 > estimate_size(Mesh(vertices=[0.0] * 3000)) > 3000 * 8
+    assert 'mesh' not in memory
+
+
+def test_memory_tier_invalidation(tmp_path):
+    cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True, memory_bytes=10 ** 6)
+    cache.memory.put(('host', 'a'), 'parsed')
+
+    cache.put_objects('host', [{'_id': 'a'}])
+    assert ('host', 'a') not in cache.memory
+
+    cache.memory.put(('host', 'a'), 'parsed')
+    cache.delete_objects('host', ['a'])
+    assert ('host', 'a') not in cache.memory
+
+
+
+def test_delete_all_objects(tmp_path):
+    cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True, shards=4, memory_bytes=10 ** 6)
+    ids = ['id{}'.format(i) for i in range(20)]
+    cache.put_objects('host', [{'_id': i} for i in ids])
+    cache.memory.put(('host', 'id1'), 'parsed')
+
+    cache.delete_all('CachedObject')
+    assert cache.get_objects('host', ids) == {}
+    assert len(cache.memory) == 0
+    cache.close()
+
+@pytest.mark.parametrize('codec', blob_codec.available_codecs())
+def test_blob_codecs(codec):
+    data = json_codec.dumps({'type': 'Mesh', 'vertices': [0.5] * 3000})
+    blob = blob_codec.compress(data, codec)
+
+    assert blob_codec.decompress(blob) == data
+    if codec != 'raw':
+        assert len(blob) < len(data) / 10
+
+
+def test_objects_mixed_codecs(cache):
+    cache.codec = 'raw'
+    cache.put_objects('host', [{'_id': 'a', 'value': [1, 2, 3]}])
+    cache.codec = 'zlib'
+    cache.put_objects('host', [{'_id': 'b', 'value': [4, 5, 6]}])
+
+    assert cache.get_objects('host', ['a', 'b']) == {'a': {'_id': 'a', 'value': [1, 2, 3]}, 'b': {'_id': 'b', 'value': [4, 5, 6]}}
+
+
+def test_streams(cache):
+    stream = {'streamId': 's1', 'name': 'cached', 'updatedAt': '2020-01-01T00:00:01.500Z'}
+    cache.put_stream('host', stream)
+
+    assert cache.get_stream('host', 's1') == (timestamp('2020-01-01T00:00:01.500Z'), stream)
+    assert timestamp('2020-01-01T00:00:01.500Z') == 1577836801500
+    assert timestamp('2019-06-20T09:41:14.712Z') == 1561023674712
+    assert timestamp('2020-01-01T00:00:01Z') == 1577836801000
+    assert timestamp('yesterday') is None
+    assert timestamp(None) is None
+
+    cache.delete_stream('host', 's1')
+    assert cache.get_stream('host', 's1') is None
+
+
+def bulk_worker(path, shards, worker):
+    cache = SpeckleCache(path, shards=shards, timeout=0)
+    cache.log = lambda msg: None
+    for i in range(20):
+        objects = [{'_id': '{}-{}-{}'.format(worker, i, j), 'value': [worker, i, j]} for j in range(50)]
+        cache.put_objects('host', objects)
+        cache.write_sent_objects('host', [('h' + o['_id'], o['_id']) for o in objects])
+        assert len(cache.get_objects('host', [o['_id'] for o in objects])) == 50
+    cache.close()
+
+
+@pytest.mark.parametrize('shards', [1, 4])
+def test_multiprocess_writes(tmp_path, shards):
+    context = pytest.importorskip('multiprocessing').get_context('fork')
+    path = str(tmp_path / 'cache.db')
+    cache = SpeckleCache(path, create=True, shards=shards)
+
+    workers = [context.Process(target=bulk_worker, args=(path, shards, w)) for w in range(6)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert [w.exitcode for w in workers] == [0] * 6
+    ids = ['{}-{}-{}'.format(w, i, j) for w in range(6) for i in range(20) for j in range(50)]
+    assert len(cache.get_objects('host', ids)) == len(ids)
+    assert len(cache.get_sent_objects('host', ['h' + i for i in ids])) == len(ids)
@@ -0,0 +1,166 @@
+import math
+from decimal import Decimal
+import pytest
+from speckle.base import arrays, geometry, json_codec
+from speckle.resources.objects import SpeckleObject
+from speckle.schemas import Arc, Curve, Line, Mesh, Plane, Point, Vector
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request, monkeypatch):
+    if request.param == 'array':
+        monkeypatch.setattr(arrays, 'np', None)
+    return request.param
+
+
+def test_coordinate_fields():
+    assert geometry.coordinate_fields(Mesh()) == ('vertices',)
+    assert geometry.coordinate_fields(Line()) == ('Value',)
+    assert geometry.coordinate_fields(SpeckleObject.parse_obj({'type': 'Brep/Mesh'})) == ('vertices',)
+    assert geometry.coordinate_fields(SpeckleObject.parse_obj({'type': 'Unknown'})) == ()
+
+
+def test_gather_scatter(backend):
+    mesh = Mesh(vertices=[0, 1, 2, 3, 4, 5])
+    point = Point(value=[6, 7, 8])
+    view = mesh.vertex_points
+    content_hash = mesh.update_hash()
+
+    coordinates, slots = geometry.gather([mesh, point, mesh])
+    assert sorted(coordinates) == [0, 1, 2, 3, 4, 5, 6, 7, 8]
+
+    geometry.scatter(arrays.to_array([v * 2 for v in coordinates], 'float64', 'd'), slots)
+    assert mesh.vertices.tolist() == [0, 2, 4, 6, 8, 10]
+    assert view[1, 2] == 10
+    assert point.value == [12, 14, 16]
+    assert mesh.update_hash() != content_hash
+
+
+def test_gather_nested():
+    arc = Arc.parse_obj({'plane': {'origin': {'value': [6, 7, 8]}}})
+
+    coordinates, slots = geometry.gather([arc])
+    assert any(obj is arc.plane.origin for obj, _, _, _ in slots)
+    assert len(coordinates) == 3 * len(slots)
+
+
+
+def test_to_arrays(backend):
+    vertices = [float(i) for i in range(3000)]
+    mesh = SpeckleObject.parse_obj({'type': 'Mesh', 'vertices': vertices})
+    short = SpeckleObject.parse_obj({'type': 'Mesh', 'vertices': [0, 1, 2]})
+    names = SpeckleObject.parse_obj({'type': 'Mesh', 'vertices': ['a'] * 3000})
+    content_hash = mesh.update_hash()
+
+    converted = geometry.to_arrays([mesh, short, names])
+    assert converted == (1 if backend == 'numpy' else 0)
+    assert list(mesh.vertices) == vertices
+    assert mesh.update_hash() == content_hash
+    assert short.vertices == [0, 1, 2]
+    assert names.vertices == ['a'] * 3000
+
+def test_quantize(backend):
+    mesh = Mesh(vertices=[0.1 + 0.2, -1e-9, 1.2345678, 2, 3, 4.0004])
+    point = Point(value=[1.00049, 2, 3])
+
+    report = geometry.quantize([mesh, point], 0.001)
+
+    assert mesh.vertices.tolist() == [0.3, 0.0, 1.235, 2, 3, 4.0]
+    assert json_codec.dumps(mesh.vertices.tolist()) == json_codec.dumps([0.3, 0.0, 1.235, 2.0, 3.0, 4.0])
+    assert point.value == [1.0, 2, 3]
+    assert (report.objects, report.values, report.changed) == (2, 9, 5)
+    assert report.bytes_after < report.bytes_before
+    assert 0 < report.reduction < 1
+
+
+def test_quantize_dedupes_hashes(backend):
+    first = Mesh(vertices=[1.0, 2.0, 3.0])
+    second = Mesh(vertices=[1.0 + 1e-12, 2.0, 3.0 - 1e-12])
+    assert first.update_hash() != second.update_hash()
+
+    geometry.quantize([first, second], 0.005)
+    assert first.update_hash() == second.update_hash()
+
+
+def test_quantize_invalid_tolerance():
+    with pytest.raises(ValueError):
+        geometry.quantize([Mesh()], 0)
+
+
+def rotate_and_move(x, y, z):
+    # Quarter turn about z, then a move
+    return [[0, -1, 0, x], [1, 0, 0, y], [0, 0, 1, z], [0, 0, 0, 1]]
+
+
+def test_transform(backend):
+    mesh = Mesh(vertices=[1, 0, 0, 0, 2, 0])
+    vector = Vector(value=[1, 0, 0])
+    view = mesh.vertex_points
+
+    assert geometry.transform([mesh, vector, mesh], rotate_and_move(10, 20, 30)) == 9
+    assert mesh.vertices.tolist() == [10, 21, 30, 8, 20, 30]
+    assert view[0, 1] == 21
+    assert vector.value == [0, 1, 0]
+
+
+def test_transform_plane_and_arc(backend):
+    arc = Arc.parse_obj({'radius': 2, 'plane': {
+        'origin': {'value': [1, 1, 1]}, 'normal': {'value': [0, 0, 1]},
+        'xdir': {'value': [1, 0, 0]}, 'ydir': {'value': [0, 1, 0]}}})
+    stretch = [[3, 0, 0, 0], [0, 3, 0, 0], [0, 0, 3, 0], [0, 0, 0, 1]]
+
+    geometry.transform([arc], stretch)
+    assert arc.plane.origin.value == [3, 3, 3]
+    assert arc.plane.normal.value == [0, 0, 1]
+    assert arc.plane.xdir.value == [1, 0, 0]
+    assert arc.radius == 6
+
+    geometry.scale([arc], 0.001)
+    assert arc.plane.origin.value == [0.003, 0.003, 0.003]
+    assert arc.radius == 0.006
+
+
+def test_transform_normal_non_uniform_scale(backend):
+    plane = Plane.parse_obj({'normal': {'value': [0, 1, 1]}, 'xdir': {'value': [1, 0, 0]}, 'ydir': {'value': [0, 1, -1]}})
+    stretch = [[1, 0, 0, 0], [0, 2, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+
+    geometry.transform([plane], stretch)
+    # Normals get the inverse transpose, so they stay perpendicular to the axes
+    assert plane.normal.value == pytest.approx([0, 5 ** -0.5, 2 * 5 ** -0.5])
+    assert plane.ydir.value == pytest.approx([0, 2 * 5 ** -0.5, -(5 ** -0.5)])
+    assert sum(n * y for n, y in zip(plane.normal.value, plane.ydir.value)) == pytest.approx(0)
+
+
+def test_transform_invalid_matrix():
+    with pytest.raises(ValueError):
+        geometry.transform([Point(value=[1, 2, 3])], [[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+
+
+def test_unit_scale():
+    assert geometry.unit_scale('Feet', 'millimeters') == Decimal('304.8')
+    assert geometry.unit_scale('Meters', 'Meters') == 1
+    with pytest.raises(ValueError):
+        geometry.unit_scale('Meters', 'Cubits')
+
+
+def test_convert_units_lengths(backend):
+    line = Line(Value=[0, 0, 0, 1, 1, 1], domain={'start': 0, 'end': 2})
+    curve = Curve(points=[0, 0, 0, 1, 1, 1], knots=[0, 0, 1, 1], weights=[1, 2])
+    content_hash = line.update_hash()
+
+    assert geometry.convert_units([line, curve], 'Feet', 'Inches') == 14
+    assert line.Value == [0, 0, 0, 12, 12, 12]
+    assert (line.domain.start, line.domain.end) == (0, 24)
+    assert line.update_hash() != content_hash
+    assert curve.points.tolist() == [0, 0, 0, 12, 12, 12]
+    assert curve.knots.tolist() == [0, 0, 1, 1]
+    assert curve.weights.tolist() == [1, 2]
+
+
+def test_convert_units_keeps_angles(backend):
+    arc = Arc(radius=1, startAngle=0, endAngle=math.pi, angleRadians=math.pi, domain={'start': 0, 'end': math.pi})
+
+    assert geometry.convert_units([arc], 'Meters', 'Millimeters') == 13
+    assert arc.radius == 1000
+    assert (arc.domain.start, arc.domain.end) == (0, math.pi)
+    assert (arc.startAngle, arc.endAngle) == (0, math.pi)
@@ -0,0 +1,61 @@
+import json
+import hashlib
+import pytest
+from speckle.base import json_codec
+from speckle.resources.objects import SpeckleObject
+
+
+@pytest.fixture(params=json_codec.available_backends())
+def backend(request):
+    json_codec.use_backend(request.param)
+    yield request.param
+    json_codec.use_backend()
+
+
+@pytest.fixture(scope='module')
+def payload():
+    return {
+        'success': True,
+        'resources': [{
+            '_id': '5d0b8f5bfe4d25001bd7b1a4',
+            'type': 'Mesh',
+            'name': 'Ünïcode mesh',
+            'vertices': [0.1, -2.5e-7, 1e22, 3],
+            'faces': [0, 0, 1, 2],
+            'properties': {'nested': {'list': [None, True, False]}},
+        }]
+    }
+
+
+def test_roundtrip(backend, payload):
+    body = json_codec.dumps(payload)
+
+    assert isinstance(body, bytes)
+    assert json_codec.loads(body) == payload
+    assert json.loads(body.decode('utf-8')) == payload
+
+
+def test_loads_bytearray(backend, payload):
+    assert json_codec.loads(bytearray(json_codec.dumps(payload))) == payload
+
+
+def test_default_tolist(backend):
+    class Array(object):
+        def tolist(self):
+            return [1.0, 2.0]
+
+    assert json_codec.loads(json_codec.dumps({'value': Array()})) == {'value': [1.0, 2.0]}
+
+
+def test_unknown_backend():
+    with pytest.raises(KeyError):
+        json_codec.use_backend('pickle')
+
+
+def test_geometry_hash_is_backend_independent(backend):
+    properties = {'b': 1.5, 'a': [1, 2, 3]}
+    obj = SpeckleObject(type='Null', properties=properties)
+
+    obj.dict()
+
+    assert obj.geometryHash == hashlib.md5(json.dumps(properties).encode('utf-8')).hexdigest()
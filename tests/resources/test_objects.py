@@ -0,0 +1,234 @@
+import json
+import hashlib
+import random
+import threading
+import pytest
+import requests
+from speckle import SpeckleCache, resources
+from speckle.base.resource import construct
+from speckle.resources.objects import SpeckleObject, content_hash_stats, geometry_hash_stats
+from speckle.schemas import Arc, Mesh
+
+
+@pytest.fixture(scope='module')
+def created_items(client):
+    return client.objects.create([{
+        'type': 'Mesh',
+        'name': 'mesh {}'.format(i),
+        'vertices': [0, 0, 0, 1, 0, 0, 1, 1, 0],
+        'faces': [0, 0, 1, 2],
+    } for i in range(30)])
+
+
+def test_get_bulk_sharded(client, created_items):
+    ids = [o.id for o in created_items]
+    random.shuffle(ids)
+
+    objects = client.objects.get_bulk(ids, shard_size=7, max_workers=3)
+
+    assert [o.id for o in objects] == ids
+
+
+def test_create_batched(client):
+    objects = [{
+        'type': 'Polyline',
+        'name': 'polyline {}'.format(i),
+        'value': [float(i)] * 300,
+    } for i in range(50)]
+
+    ids = client.objects.create_batched(objects, max_bytes=20000)
+    created = client.objects.get_bulk(ids)
+
+    assert len(ids) == len(objects)
+    assert [o.name for o in created] == [o['name'] for o in objects]
+
+
+def test_create_batched_dedupe(client):
+    objects = [Mesh(name='mesh {}'.format(i % 3), vertices=[0, 0, 0, 1, 0, 0, 1, 1, 0], faces=[0, 0, 1, 2])
+               for i in range(9)]
+
+    ids = client.objects.create_batched(objects)
+
+    assert len(set(ids)) == 3
+    assert ids[:3] * 3 == ids
+
+
+
+def test_create_batched_tolerance(monkeypatch):
+    objects = resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    sent = []
+
+    def make_request(method, path, data=None, **kwargs):
+        sent.extend(json.loads(data))
+        return [SpeckleObject(id='new{}'.format(len(sent) - i)) for i in range(len(json.loads(data)))]
+
+    monkeypatch.setattr(objects, 'make_request', make_request)
+    meshes = [Mesh(vertices=[0.1, 1, 2]), Mesh(vertices=[0.1 + 1e-12, 1, 2]), {'type': 'Mesh', 'vertices': [0.1004, 1, 2]}]
+
+    assert len(set(objects.create_batched(meshes))) == 3
+    sent.clear()
+    ids = objects.create_batched(meshes, tolerance=0.001)
+
+    assert ids[0] == ids[1] and len(sent) == 2
+    assert sent[0]['vertices'] == sent[1]['vertices'] == [0.1, 1, 2]
+    assert list(meshes[1].vertices) == [0.1 + 1e-12, 1, 2]
+    assert meshes[2]['vertices'] == [0.1004, 1, 2]
+
+def geometry_hash(properties):
+    return hashlib.md5(json.dumps(properties).encode('utf-8')).hexdigest()
+
+
+def test_geometry_hash_is_cached():
+    obj = SpeckleObject(type='Null', properties={'a': 1})
+    geometry_hash_stats.reset()
+
+    obj.dict()
+    obj.dict()
+
+    assert obj.geometryHash == geometry_hash({'a': 1})
+    assert geometry_hash_stats.computed == 1
+    assert geometry_hash_stats.reused == 1
+
+
+def test_geometry_hash_tracks_changes():
+    obj = SpeckleObject(type='Null', properties={'a': 1})
+    obj.dict()
+
+    obj.properties['b'] = 2
+    obj.dict()
+    assert obj.geometryHash == geometry_hash({'a': 1, 'b': 2})
+
+    obj.properties = {'c': {'d': 3}}
+    obj.dict()
+    assert obj.geometryHash == geometry_hash({'c': {'d': 3}})
+
+    obj.properties['c']['d'] = 4
+    obj.invalidate_hashes()
+    obj.dict()
+    assert obj.geometryHash == geometry_hash({'c': {'d': 4}})
+
+
+def test_geometry_hash_constructed_object():
+    obj = construct(SpeckleObject, {'type': 'Null', 'properties': {'a': 1}})
+    obj.dict()
+
+    obj.properties['a'] = 2
+    obj.dict()
+
+    assert obj.geometryHash == geometry_hash({'a': 2})
+
+
+def test_content_hash_is_deterministic():
+    a = Mesh(vertices=[0, 0, 0, 1, 1, 1], faces=[0, 0, 1, 2], _id='a', owner='me')
+    b = construct(Mesh, {'type': 'Mesh', 'vertices': [0, 0, 0, 1.0, 1.0, 1.0], 'faces': [0, 0, 1, 2]})
+
+    assert a.update_hash() == b.update_hash()
+    assert a.update_hash() != Mesh(vertices=[0, 0, 0, 1, 1, 2], faces=[0, 0, 1, 2]).update_hash()
+
+
+def test_content_hash_keeps_strings():
+    assert SpeckleObject(type='Foo', name='rev 1.0]').update_hash() != SpeckleObject(type='Foo', name='rev 1]').update_hash()
+    assert SpeckleObject(type='Foo', properties={'a': 2.0}).update_hash() == SpeckleObject(type='Foo', properties={'a': 2}).update_hash()
+
+
+def test_content_hash_nested_objects():
+    arc = Arc(radius=2, plane={'origin': {'value': [0, 0, 0]}})
+    arc_hash = arc.update_hash()
+
+    assert arc.plane.hash is not None
+    assert arc.plane.origin.hash is not None
+
+    content_hash_stats.reset()
+    assert arc.update_hash() == arc_hash
+    assert content_hash_stats.computed == 0
+
+    arc.plane.origin.value = [1, 0, 0]
+    assert arc.update_hash() != arc_hash
+    assert arc.dict()['plane']['hash'] == arc.plane.hash
+
+    arc_hash = arc.update_hash()
+    arc.domain.start = 5.0
+    assert arc.update_hash() != arc_hash
+
+
+def test_content_hash_tracks_changes():
+    mesh = Mesh(vertices=[0, 0, 0])
+    first = mesh.update_hash()
+
+    mesh.name = 'renamed'
+    second = mesh.update_hash()
+    assert second != first
+
+    mesh.vertices[0] = 1
+    assert mesh.update_hash() == second
+    mesh.invalidate_hashes()
+    assert mesh.update_hash() != second
+
+
+@pytest.fixture
+def cached_objects(tmp_path, monkeypatch):
+    objects = resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    objects.cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True, memory_bytes=10 ** 6)
+
+    server = {'id{}'.format(i): {'_id': 'id{}'.format(i), 'type': 'Null', 'name': str(i)} for i in range(10)}
+    objects.requested = []
+
+    def request_payload(method, path, data=None, comment=False, params=None):
+        if method == 'get_bulk':
+            objects.requested.extend(data)
+            return {'success': True, 'resources': [dict(server[i]) for i in data]}
+        objects.requested.append(path[1:])
+        return {'success': True, 'resource': dict(server[path[1:]])}
+
+    monkeypatch.setattr(objects, '_request_payload', request_payload)
+    monkeypatch.setattr(objects, 'make_request', lambda *args, **kwargs: {'success': True})
+    return objects
+
+
+def test_get_bulk_read_through(cached_objects):
+    first = cached_objects.get_bulk(['id1', 'id2', 'id3'])
+    assert cached_objects.requested == ['id1', 'id2', 'id3']
+
+    second = cached_objects.get_bulk(['id4', 'id3', 'id2', 'id1', 'id4'], shard_size=1)
+    assert cached_objects.requested == ['id1', 'id2', 'id3', 'id4']
+    assert [o.name for o in first] == ['1', '2', '3']
+    assert [o.name for o in second] == ['4', '3', '2', '1', '4']
+
+    assert cached_objects.get('id2').name == '2'
+    assert cached_objects.get('id5').name == '5'
+    assert cached_objects.requested == ['id1', 'id2', 'id3', 'id4', 'id5']
+
+
+def test_cache_connections_of_finished_threads(cached_objects):
+    cache = cached_objects.cache
+    cached_objects.get_bulk(['id{}'.format(i) for i in range(10)], shard_size=2)
+    # The shards are written to the cache from the calling thread
+    assert len(cache._connections) == 1
+
+    for _ in range(3):
+        thread = threading.Thread(target=cache.get_objects, args=(cached_objects.basepath, ['id1']))
+        thread.start()
+        thread.join()
+    assert len(cache._connections) == 2
+
+
+def test_get_bulk_memory_tier(cached_objects):
+    memory = cached_objects.cache.memory
+    first = cached_objects.get_bulk(['id1', 'id2'])
+    memory.reset_stats()
+
+    second = cached_objects.get_bulk(['id2', 'id1', 'id3'])
+
+    assert second[0] is first[1] and second[1] is first[0]
+    assert (memory.hits, memory.misses) == (2, 1)
+    assert cached_objects.get('id3') is second[2]
+
+
+def test_writes_invalidate_cache(cached_objects):
+    cached_objects.get_bulk(['id1', 'id2', 'id3'])
+
+    cached_objects.update('id1', {'name': 'changed'})
+    cached_objects.set_properties('id2', {'a': 1})
+    cached_objects.delete('id3')
+
+    assert cached_objects.cache.get_objects(cached_objects.basepath, ['id1', 'id2', 'id3']) == {}
@@ -0,0 +1,98 @@
+import pytest
+import requests
+from pydantic import ValidationError
+from speckle import resources
+from speckle.base import json_codec
+from speckle.base.resource import SCHEMAS, Comment, SchemaRegistry, clean_empty, construct, serialize_json, validate
+from speckle.resources.streams import Stream
+from speckle.schemas import Arc, Brep, Mesh, Plane, Point
+
+
+@pytest.fixture
+def objects_resource():
+    return resources.objects.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+
+
+@pytest.fixture(scope='module')
+def mesh():
+    return {
+        '_id': '5d0b8f5bfe4d25001bd7b1a4',
+        'type': 'Mesh',
+        'vertices': [0, 0, 0, 1, 0, 0, 1, 1, 0],
+        'faces': [0, 0, 1, 2],
+        'properties': {'material': 'concrete'},
+        'customField': 'kept as extra',
+    }
+
+
+@pytest.mark.parametrize('schema, data', [
+    (Mesh, {'type': 'Mesh', 'vertices': [0.5, 1, 2], '_id': 'a', 'extra': [1]}),
+    (Arc, {'type': 'Arc', 'radius': 2, 'plane': {'origin': {'value': [1, 2, 3]}}, 'domain': {'start': 0, 'end': 1}}),
+    (Stream, {'streamId': 's', 'objects': [{'_id': 'o', 'type': 'Mesh'}], 'layers': [{'guid': 'g'}], 'ignored': 1}),
+])
+def test_construct_matches_parse_obj(schema, data):
+    constructed = construct(schema, data)
+    parsed = schema.parse_obj(data)
+
+    assert constructed.dict() == parsed.dict()
+    assert constructed.__fields_set__ == parsed.__fields_set__
+
+
+def test_construct_does_not_validate():
+    mesh = construct(Mesh, {'vertices': 'not a list'})
+
+    assert mesh.vertices == 'not a list'
+    with pytest.raises(ValidationError):
+        validate(mesh)
+
+
+def test_trusted_parse_response(objects_resource, mesh):
+    objects_resource.trusted = True
+    trusted = objects_resource._parse_response(mesh)
+    validated = objects_resource._parse_response(mesh, trusted=False)
+
+    assert trusted.id == validated.id == mesh['_id']
+    assert trusted.vertices.tolist() == mesh['vertices']
+    assert all(isinstance(v, float) for v in validated.vertices)
+    assert trusted.customField == mesh['customField']
+
+
+def test_schema_registry_resolve():
+    registry = SchemaRegistry(Mesh=Mesh)
+
+    assert registry.resolve('Brep/Mesh') is Mesh
+    assert registry.resolve('Brep/Mesh') is Mesh
+    assert registry.resolve('Brep') is None
+    assert registry.unknown_types == {'Brep': 1}
+
+    registry.register('Brep', Arc)
+    assert registry.resolve('Brep') is Arc
+
+    del registry['Mesh']
+    assert registry.resolve('Brep/Mesh') is Arc
+
+
+def test_parse_response_unknown_type(objects_resource):
+    SCHEMAS.unknown_types.clear()
+
+    objects_resource._parse_response({'type': 'NotASchema/Mesh'})
+    objects_resource._parse_response({'type': 'NotASchema'})
+
+    assert SCHEMAS.unknown_types == {'NotASchema': 1}
+
+
+@pytest.mark.parametrize('instance', [
+    Mesh(vertices=[1, 2, 3.5], faces=[0, 1], properties={'a': None, 'b': [1, None, {'c': None}], 't': (1, None)}, extra={'x': None}),
+    Arc(radius=3, plane=Plane(origin=Point(value=[1, 2, 3]))),
+    Brep(displayValue=Mesh(vertices=[1, 2, 3]), properties={'nested': Point(value=[1, 2, 3])}),
+    Stream(name='stream', objects=[{'_id': 'a', 'type': 'Placeholder'}], layers=[{'guid': 'g'}]),
+    Comment(text='comment', resource={'resourceType': 'stream', 'resourceId': 'a'}),
+])
+@pytest.mark.parametrize('backend', json_codec.available_backends())
+def test_serialize_json_matches_dict(instance, backend):
+    json_codec.use_backend(backend)
+    try:
+        expected = json_codec.dumps(clean_empty(instance.dict(by_alias=True)))
+        assert serialize_json(instance) == expected
+    finally:
+        json_codec.use_backend()
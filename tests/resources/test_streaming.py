@@ -0,0 +1,62 @@
+import json
+import pytest
+from speckle.base.streaming import iter_resources
+
+
+@pytest.fixture(scope='module')
+def payload():
+    return {
+        'success': True,
+        'message': 'a "tricky" message with brackets ]} and \\ escapes',
+        'resources': [
+            {'_id': 'a', 'type': 'Mesh', 'vertices': [0.5, -1e-3, 2], 'faces': [0, 0, 1, 2]},
+            {'_id': 'b', 'type': 'String', 'value': 'quote \" and [{ unicode ü'},
+            {'_id': 'c', 'properties': {}, 'children': [[]]},
+            None,
+            42,
+        ]
+    }
+
+
+def chunked(raw, size):
+    return (raw[i:i + size] for i in range(0, len(raw), size))
+
+
+@pytest.mark.parametrize('size', [1, 3, 16, 1024 * 1024])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_iter_resources(payload, size, indent):
+    raw = json.dumps(payload, indent=indent, ensure_ascii=False).encode('utf-8')
+    meta = {}
+
+    resources = list(iter_resources(chunked(raw, size), meta=meta))
+
+    assert resources == payload['resources']
+    assert meta == {'success': True, 'message': payload['message']}
+
+
+def test_iter_resources_is_incremental(payload):
+    raw = json.dumps(payload).encode('utf-8')
+    consumed = []
+
+    def chunks():
+        for chunk in chunked(raw, 8):
+            consumed.append(len(chunk))
+            yield chunk
+
+    first = next(iter_resources(chunks()))
+
+    assert first == payload['resources'][0]
+    assert sum(consumed) < len(raw)
+
+
+def test_iter_resources_single_resource():
+    meta = {}
+
+    assert list(iter_resources([b'{"success": true, "resource": {"_id": "a"}}'], meta=meta)) == []
+    assert meta['resource'] == {'_id': 'a'}
+
+
+@pytest.mark.parametrize('raw', [b'{"resources": [1, 2', b'[1, 2]', b'{"success" true}'])
+def test_iter_resources_malformed(raw):
+    with pytest.raises(ValueError):
+        list(iter_resources([raw]))
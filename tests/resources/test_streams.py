@@ -1,5 +1,8 @@
 import uuid
 import pytest
+import requests
+from speckle import SpeckleCache, resources
+from speckle.schemas import Mesh
 
 
 @pytest.fixture(scope='module')
@@ -113,6 +116,16 @@ def test_list_objects(client):
     pass
 
 
+@pytest.mark.dependency(depends=['test_create'])
+def test_iter_objects(client, resource):
+    ids = [o.id for o in client.objects.create([{'type': 'Point', 'value': [i, 0, 0]} for i in range(25)])]
+    stream = client.streams.create(dict(resource, objects=[{'_id': i, 'type': 'Placeholder'} for i in ids]))
+
+    objects = list(client.streams.iter_objects(stream.streamId, batch_size=10))
+
+    assert [o.id for o in objects] == ids
+
+
 def test_diff(client):
     # TODO(): add diff streams
     pass
@@ -133,3 +146,110 @@ def test_comments(client, created_item, comment):
 #     assert data != []
 #     for stream in data:
 #         client.streams.delete(id=stream.streamId)
+
+
+def test_get_cached(tmp_path, monkeypatch):
+    streams = resources.streams.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    streams.cache = SpeckleCache(str(tmp_path / 'cache.db'), create=True)
+
+    server = {'streamId': 's1', 'name': 'cached', 'updatedAt': '2020-01-01T00:00:00.000Z', 'objects': [{'_id': 'o1'}]}
+    requested = []
+
+    def request_payload(method, path, data=None, comment=False, params=None):
+        requested.append(params)
+        if params:
+            return {'success': True, 'resource': {k: server[k] for k in params['fields'].split(',')}}
+        return {'success': True, 'resource': dict(server)}
+
+    monkeypatch.setattr(streams, '_request_payload', request_payload)
+
+    assert streams.get('s1').name == 'cached'
+    assert streams.get('s1').objects[0].id == 'o1'
+    assert requested == [None, {'fields': 'updatedAt'}]
+
+    server.update(name='changed', updatedAt='2020-01-02T00:00:00.000Z')
+    assert streams.get('s1').name == 'changed'
+    assert streams.get('s1').name == 'changed'
+    assert requested[2:] == [{'fields': 'updatedAt'}, None, {'fields': 'updatedAt'}]
+
+
+def test_quantize_upload(monkeypatch):
+    streams = resources.streams.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    streams.quantize = True
+    sent = []
+
+    def make_request(method, path, data=None, **kwargs):
+        sent.append(streams._prep_data(data))
+        return resources.streams.Stream(streamId='s1')
+
+    def request_payload(method, path, data=None, comment=False, params=None):
+        assert params == {'fields': 'baseProperties'}
+        return {'success': True, 'resource': {'baseProperties': {'tolerance': 0.01}}}
+
+    monkeypatch.setattr(streams, 'make_request', make_request)
+    monkeypatch.setattr(streams, '_request_payload', request_payload)
+    objects = [{'type': 'Mesh', 'vertices': [0.123456789, 1, 2]}, {'type': 'Point', 'value': [1e-9, 2, 3]}]
+
+    streams.create({'name': 'quantized', 'objects': objects, 'baseProperties': {'tolerance': 0.001}})
+    assert sent[0]['objects'][0]['vertices'] == [0.123, 1, 2]
+    assert sent[0]['objects'][1]['value'] == [0, 2, 3]
+    assert resources.streams.quantize_reports['s1'].values == 6
+    assert resources.streams.quantize_reports['s1'].reduction > 0
+
+    streams.update('s1', {'objects': objects})
+    assert sent[1]['objects'][0]['vertices'] == [0.12, 1, 2]
+    assert resources.streams.quantize_reports['s1'].changed == 2
+
+    streams.quantize = False
+    streams.create({'name': 'exact', 'objects': objects, 'baseProperties': {'tolerance': 0.001}})
+    assert sent[2]['objects'][0]['vertices'] == objects[0]['vertices']
+
+
+def test_quantize_upload_keeps_objects(monkeypatch):
+    streams = resources.streams.Resource(requests.Session(), 'http://localhost:3000/api/v1', None)
+    streams.quantize = True
+    sent = []
+
+    def make_request(method, path, data=None, **kwargs):
+        sent.append(streams._prep_data(data))
+        return resources.streams.Stream(streamId='s1')
+
+    monkeypatch.setattr(streams, 'make_request', make_request)
+    mesh = Mesh(vertices=[0.123456789, 1.0004, 2.0])
+    stream = resources.streams.Stream(objects=[mesh], baseProperties={'tolerance': 0.01})
+
+    streams.create({'objects': [mesh], 'baseProperties': {'tolerance': 0.01}})
+    streams.update('s1', stream)
+    assert list(sent[0]['objects'][0]['vertices']) == [0.12, 1, 2]
+    assert list(sent[1]['objects'][0]['vertices']) == [0.12, 1, 2]
+    assert list(mesh.vertices) == [0.123456789, 1.0004, 2.0]
+    assert list(stream.objects[0].vertices) == [0.123456789, 1.0004, 2.0]
+
+
+def test_convert_units():
+    stream = resources.streams.Stream.parse_obj({
+        'baseProperties': {'units': 'Meters', 'tolerance': 0.001},
+        'objects': [
+            {'type': 'Mesh', 'vertices': [0.5, 1, 2]},
+            {'type': 'Arc', 'radius': 2, 'domain': {'start': 0, 'end': 3.5},
+             'plane': {'type': 'Plane', 'origin': {'type': 'Point', 'value': [1, 1, 1]}, 'normal': {'type': 'Vector', 'value': [0, 0, 1]}}},
+            {'type': 'Polycurve', 'segments': [{'type': 'Line', 'Value': [0, 0, 0, 2, 0, 0]}]},
+        ],
+    })
+    mesh, arc, polycurve = stream.objects
+    content_hash = mesh.update_hash()
+
+    assert stream.convert_units('Millimeters') == 16
+    assert stream.baseProperties.units == 'Millimeters'
+    assert stream.baseProperties.tolerance == 1
+    assert mesh.vertices == [500, 1000, 2000]
+    assert mesh.update_hash() != content_hash
+    assert arc.radius == 2000
+    assert arc.domain == {'start': 0, 'end': 3.5}
+    assert arc.plane['origin']['value'] == [1000, 1000, 1000]
+    assert arc.plane['normal']['value'] == [0, 0, 1]
+    assert polycurve.segments[0]['Value'] == [0, 0, 0, 2000, 0, 0]
+
+    with pytest.raises(ValueError):
+        stream.convert_units('Cubits')
+    assert stream.baseProperties.units == 'Millimeters'